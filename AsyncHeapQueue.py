@@ -0,0 +1,174 @@
+# George Dunnery - CS 5800
+from BinomialHeap import *
+import asyncio
+import collections
+
+
+# Class to represent an asyncio priority queue backed by a binomial heap
+# Follows the asyncio.Queue interface, and put returns the Node handle so
+# entries can be reprioritized or removed while they wait in the queue
+class HeapQueue:
+
+    # Constructs an empty queue
+    #  maxsize: int, the most entries the queue holds (0 or less is unbounded)
+    #  key, reverse: ordering options, as for BinomialHeap
+    def __init__(self, maxsize: int = 0, key=None, reverse: bool = False):
+        self.maxsize = maxsize
+        self.heap = BinomialHeap(key=key, reverse=reverse)
+        self.size = 0
+        # Handles of the entries still in the queue, so reprioritize and
+        # remove can reject a handle that get already returned
+        self.queued = set()
+        # Futures of coroutines blocked in get and put, oldest first
+        self.getters = collections.deque()
+        self.putters = collections.deque()
+        # Entries taken by get but not yet marked done with task_done
+        self.unfinished = 0
+        self.finished = asyncio.Event()
+        self.finished.set()
+
+    # Function to get the number of entries in the queue
+    # Returns int, the number of entries
+    def qsize(self) -> int:
+        return self.size
+
+    # Function to check whether the queue has no entries
+    # Returns bool, True when empty
+    def empty(self) -> bool:
+        return self.size == 0
+
+    # Function to check whether the queue has reached maxsize
+    # Returns bool, True when a put would have to wait
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self.size
+
+    # Auxiliary function to wake the oldest waiter that is still pending
+    #  waiters: deque of futures, the getters or the putters
+    # Returns nothing
+    def wakeup_next(self, waiters: collections.deque) -> None:
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    # Auxiliary function to get and put, please use those instead!
+    # Function to wait on a new future until woken by the other side
+    # A cancelled waiter passes its wakeup on, so no entry or slot is lost
+    #  waiters: deque of futures, the queue of waiters to join
+    #  ready: function of no arguments, whether the other side can proceed
+    # Returns nothing
+    async def wait(self, waiters: collections.deque, ready) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            waiter.cancel()
+            try:
+                waiters.remove(waiter)
+            except ValueError:
+                pass
+            # The wakeup meant for this waiter goes to the next one
+            if ready() and not waiter.cancelled():
+                self.wakeup_next(waiters)
+            raise
+
+    # Function to add an entry, waiting while the queue is full
+    #  key: any, the priority of the entry
+    #  value: any, optional payload
+    # Returns Node, the handle of the entry
+    async def put(self, key, value=None) -> 'Node':
+        while self.full():
+            await self.wait(self.putters, lambda: not self.full())
+        return self.put_nowait(key, value)
+
+    # Function to add an entry without waiting
+    #  key: any, the priority of the entry
+    #  value: any, optional payload
+    # Returns Node, the handle of the entry
+    # Raises asyncio.QueueFull when the queue is full
+    def put_nowait(self, key, value=None) -> 'Node':
+        if self.full():
+            raise asyncio.QueueFull
+        node = Node(key, value)
+        self.heap.insert(node)
+        self.queued.add(node)
+        self.size += 1
+        self.unfinished += 1
+        self.finished.clear()
+        self.wakeup_next(self.getters)
+        return node
+
+    # Function to remove and return the entry with the minimum key,
+    # waiting while the queue is empty
+    # Returns Node, the handle of the entry
+    async def get(self) -> 'Node':
+        while self.empty():
+            await self.wait(self.getters, lambda: not self.empty())
+        return self.get_nowait()
+
+    # Function to remove and return the entry with the minimum key without waiting
+    # Returns Node, the handle of the entry
+    # Raises asyncio.QueueEmpty when the queue is empty
+    def get_nowait(self) -> 'Node':
+        if self.empty():
+            raise asyncio.QueueEmpty
+        node = self.heap.extract_min()
+        self.queued.discard(node)
+        self.size -= 1
+        self.wakeup_next(self.putters)
+        return node
+
+    # Function to change the priority of an entry still in the queue
+    # Moving it forward is a decrease_key, moving it back removes and
+    # reinserts the same node, so the handle stays valid either way
+    #  handle: Node, a handle returned by put that has not been taken yet
+    #  key: any, the new priority
+    # Returns nothing
+    # Raises ValueError when the entry is no longer queued
+    def reprioritize(self, handle: 'Node', key) -> None:
+        self.check_queued(handle)
+        if not handle.rank < self.heap.rank(key):
+            self.heap.decrease_key(handle, key)
+        else:
+            self.heap.delete(handle)
+            handle.key = key
+            self.heap.insert(handle)
+
+    # Function to remove an entry that is still in the queue
+    # The entry counts as done, so join does not wait for it
+    #  handle: Node, a handle returned by put that has not been taken yet
+    # Returns nothing
+    # Raises ValueError when the entry is no longer queued
+    def remove(self, handle: 'Node') -> None:
+        self.check_queued(handle)
+        self.heap.delete(handle)
+        self.queued.discard(handle)
+        self.size -= 1
+        self.task_done()
+        self.wakeup_next(self.putters)
+
+    # Auxiliary function to reprioritize and remove, please use those instead!
+    # Function to reject a handle that another task may already have taken
+    #  handle: Node, a handle returned by put
+    # Returns nothing
+    # Raises ValueError when the entry was taken, removed or never put here
+    def check_queued(self, handle: 'Node') -> None:
+        if handle not in self.queued:
+            raise ValueError("The entry is no longer queued.")
+
+    # Function to mark an entry taken by get as processed
+    # Returns nothing
+    def task_done(self) -> None:
+        if self.unfinished <= 0:
+            raise ValueError("task_done() called too many times.")
+        self.unfinished -= 1
+        if self.unfinished == 0:
+            self.finished.set()
+
+    # Function to wait until every entry put has been marked done
+    # Returns nothing
+    async def join(self) -> None:
+        if self.unfinished > 0:
+            await self.finished.wait()
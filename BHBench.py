@@ -0,0 +1,925 @@
+# George Dunnery - CS 5800
+from BinomialHeap import *
+from CompactBinomialHeap import *
+from AsyncHeapQueue import *
+from ShardedHeap import *
+from HeapFactory import *
+from Graphs import *
+from Scheduler import *
+from array import array
+from math import inf
+import argparse
+import asyncio
+import bisect
+import copy
+import heapq
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Optional baseline, the suite falls back to a bisect list without it
+try:
+    from sortedcontainers import SortedList
+except ImportError:
+    SortedList = None
+
+
+# Node with the original layout (attributes in a per-instance __dict__)
+# Kept only so memory measurements have a baseline to compare against
+class DictNode:
+
+    def __init__(self, key):
+        self.key = key
+        self.degree = 0
+        self.parent = None
+        self.child = None
+        self.sibling = None
+
+
+# Function to measure the bytes allocated while building a structure
+#  build: function of no arguments that returns the structure to measure
+# Returns int, the bytes still allocated once the structure is built
+def measure_bytes(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+# Function to compare memory per element for each node layout
+#  n: int, the number of elements to store
+# Returns dict, bytes per element keyed by layout name
+def memory_per_element(n: int) -> dict:
+    keys = [random.random() for _ in range(n)]
+
+    def dict_nodes():
+        return [DictNode(key) for key in keys]
+
+    def node_heap():
+        heap = BinomialHeap()
+        for key in keys:
+            heap.insert(Node(key))
+        return heap
+
+    def linked_heap():
+        heap = FibonacciHeap()
+        for key in keys:
+            heap.insert(LinkedNode(key))
+        return heap
+
+    def compact_heap():
+        heap = CompactBinomialHeap()
+        for key in keys:
+            heap.insert(key)
+        return heap
+
+    # The list holding dict nodes costs 8 bytes per element, subtract it
+    return {
+        'dict Node': measure_bytes(dict_nodes) / n - 8,
+        'slots Node': measure_bytes(node_heap) / n,
+        'slots LinkedNode': measure_bytes(linked_heap) / n,
+        'compact': measure_bytes(compact_heap) / n,
+    }
+
+
+# Function to time n inserts followed by a number of extract_min calls
+#  n: int, the number of keys to insert
+#  pops: int, the number of extract_min calls after loading
+#  lazy: bool, whether the heap defers linking
+# Returns float, elapsed seconds
+def time_load_then_pop(n: int, pops: int, lazy: bool) -> float:
+    rng = random.Random(n)
+    nodes = [Node(rng.random()) for _ in range(n)]
+    heap = BinomialHeap(lazy=lazy)
+    start = time.perf_counter()
+    for node in nodes:
+        heap.insert(node)
+    for _ in range(pops):
+        heap.extract_min()
+    return time.perf_counter() - start
+
+
+# Function to time a steady state queue that pops after every few inserts
+#  n: int, the number of keys preloaded and then cycled through the heap
+#  inserts_per_pop: int, the number of inserts between extract_min calls
+#  lazy: bool, whether the heap defers linking
+# Returns float, elapsed seconds
+def time_steady_state(n: int, inserts_per_pop: int, lazy: bool) -> float:
+    rng = random.Random(n)
+    heap = BinomialHeap(lazy=lazy)
+    for _ in range(n):
+        heap.insert(Node(rng.random()))
+    nodes = [Node(rng.random()) for _ in range(n)]
+    start = time.perf_counter()
+    for i, node in enumerate(nodes):
+        heap.insert(node)
+        if i % inserts_per_pop == 0:
+            heap.extract_min()
+    return time.perf_counter() - start
+
+
+# Function to compare eager and lazy mode as the share of pops grows
+#  n: int, the number of keys to insert
+# Returns list of tuples (pop fraction, eager seconds, lazy seconds)
+def lazy_crossover(n: int) -> list:
+    rows = []
+    for fraction in (0.0, 0.01, 0.1, 0.5, 1.0):
+        pops = int(n * fraction)
+        rows.append((fraction, time_load_then_pop(n, pops, False),
+                     time_load_then_pop(n, pops, True)))
+    for inserts_per_pop in (1, 4, 16):
+        rows.append(('1/' + str(inserts_per_pop), time_steady_state(n, inserts_per_pop, False),
+                     time_steady_state(n, inserts_per_pop, True)))
+    return rows
+
+
+# Function to time decrease_key calls that bubble up to a long root list
+# A consolidated heap of old trees receives n lazy inserts, then the children
+# of the old trees are decreased past their roots
+#  n: int, the number of keys inserted after the old trees are built
+#  lazy: bool, whether the heap defers linking
+# Returns float, elapsed seconds of the decrease_key calls
+def time_decrease_to_roots(n: int, lazy: bool) -> float:
+    rng = random.Random(n)
+    heap = BinomialHeap(lazy=lazy)
+    old = [Node(rng.random()) for _ in range(4096)]
+    for node in old:
+        heap.insert(node)
+    heap.extract_min()
+    for _ in range(n):
+        heap.insert(Node(rng.random() + 1))
+    targets = [node for node in old if node.parent is not None][:2000]
+    start = time.perf_counter()
+    for i, node in enumerate(targets):
+        heap.decrease_key(node, -1 - i)
+    return time.perf_counter() - start
+
+
+# Function to compare rebuilding a heap by inserts against loading a snapshot
+#  n: int, the number of keys in the heap
+# Returns dict, elapsed seconds keyed by method
+def snapshot_timing(n: int) -> dict:
+    rng = random.Random(n)
+    keys = [rng.random() for _ in range(n)]
+    start = time.perf_counter()
+    heap = BinomialHeap()
+    for key in keys:
+        heap.insert(Node(key))
+    insert_time = time.perf_counter() - start
+    out = io.BytesIO()
+    start = time.perf_counter()
+    heap.save(out)
+    save_time = time.perf_counter() - start
+    data = io.BytesIO(out.getvalue())
+    start = time.perf_counter()
+    BinomialHeap.load(data)
+    load_time = time.perf_counter() - start
+    return {'insert': insert_time, 'save': save_time, 'load': load_time,
+            'bytes': len(out.getvalue())}
+
+
+# Function to compare a copy-on-write view against copying the whole heap
+# Also times a mixed write workload with and without a view left open
+#  n: int, the number of keys in the heap
+# Returns dict, elapsed seconds (or node counts) keyed by measurement
+def view_timing(n: int) -> dict:
+    rng = random.Random(n)
+    heap, nodes = BinomialHeap.from_iterable(rng.random() for _ in range(n))
+    results = {}
+    start = time.perf_counter()
+    view = heap.snapshot()
+    results['snapshot'] = time.perf_counter() - start
+    start = time.perf_counter()
+    copy.deepcopy(heap)
+    results['deepcopy'] = time.perf_counter() - start
+    # The same writes (a tenth of n decrease_key, extract_min and insert
+    # calls) first with the view open, then again with no view
+    for label in ('writes, view open', 'writes, no view'):
+        ops = random.Random(1)
+        start = time.perf_counter()
+        for _ in range(n // 10):
+            node = nodes[ops.randrange(n)]
+            if node.parent is not None:
+                heap.decrease_key(node, node.key - 1)
+            nodes.append(Node(ops.random()))
+            heap.insert(nodes[-1])
+            heap.extract_min()
+        results[label] = time.perf_counter() - start
+        if view is not None:
+            results['nodes copied'] = len(view.saved)
+            view.close()
+            view = None
+    return results
+
+
+# Function to time producers and consumers passing n entries through a queue
+#  queue: HeapQueue or asyncio.PriorityQueue, the queue to measure
+#  n: int, the number of entries
+#  workers: int, the number of producer and of consumer tasks
+# Returns float, elapsed seconds
+async def queue_throughput(queue, n: int, workers: int) -> float:
+    rng = random.Random(n)
+    keys = [rng.random() for _ in range(n)]
+    heap_queue = isinstance(queue, HeapQueue)
+
+    async def produce(part):
+        for key in part:
+            if heap_queue:
+                await queue.put(key)
+            else:
+                await queue.put((key, None))
+
+    async def consume(count):
+        for _ in range(count):
+            await queue.get()
+
+    start = time.perf_counter()
+    share = n // workers
+    await asyncio.gather(*[produce(keys[i * share:(i + 1) * share]) for i in range(workers)],
+                         *[consume(share) for _ in range(workers)])
+    return time.perf_counter() - start
+
+
+# Function to compare HeapQueue with asyncio.PriorityQueue
+#  n: int, the number of entries
+# Returns list of tuples (maxsize, HeapQueue seconds, PriorityQueue seconds)
+def asyncio_timing(n: int) -> list:
+    rows = []
+    for maxsize in (0, 1000):
+        rows.append((maxsize,
+                     asyncio.run(queue_throughput(HeapQueue(maxsize), n, 4)),
+                     asyncio.run(queue_throughput(asyncio.PriorityQueue(maxsize), n, 4))))
+    return rows
+
+
+# Function to time loading and draining n keys with 1 to max_shards processes
+#  n: int, the number of keys
+#  max_shards: int, the largest number of shards to try
+# Returns list of tuples (shards, seconds), shards 0 is a single BinomialHeap
+def sharded_scaling(n: int, max_shards: int) -> list:
+    rng = random.Random(n)
+    keys = [rng.random() for _ in range(n)]
+    start = time.perf_counter()
+    heap = BinomialHeap(lazy=True)
+    for key in keys:
+        heap.insert(Node(key))
+    heap.extract_many(n)
+    rows = [(0, time.perf_counter() - start)]
+    for shards in range(1, max_shards + 1):
+        with ShardedHeap(shards, batch=4096) as sharded:
+            start = time.perf_counter()
+            for key in keys:
+                sharded.insert(key)
+            sharded.extract_many(n)
+            rows.append((shards, time.perf_counter() - start))
+    return rows
+
+
+# Function to generate benchmark keys
+#  distribution: str, one of random, sorted, reverse or duplicates
+#  n: int, the number of keys
+#  rng: Random, the seeded generator to draw from
+# Returns list of numbers, the keys
+def make_keys(distribution: str, n: int, rng: random.Random) -> list:
+    if distribution == 'random':
+        return [rng.random() for _ in range(n)]
+    if distribution == 'sorted':
+        return list(range(n))
+    if distribution == 'reverse':
+        return list(range(n, 0, -1))
+    if distribution == 'duplicates':
+        return [rng.randint(0, 15) for _ in range(n)]
+    raise ValueError("Unknown key distribution " + distribution + ".")
+
+
+# Class to time consecutive phases of one benchmark run
+class Timer:
+
+    # Constructs an empty timer
+    def __init__(self):
+        self.results = {}
+        self.start = 0.0
+
+    # Function to start timing a phase
+    # Returns nothing
+    def begin(self) -> None:
+        self.start = time.perf_counter()
+
+    # Function to record the phase started by begin
+    #  op: str, the name of the phase
+    #  count: int, the number of operations the phase performed
+    # Returns nothing
+    def end(self, op: str, count: int) -> None:
+        self.results[op] = (time.perf_counter() - self.start, count)
+
+
+# Function to time every heap operation on one key sequence
+# Phases run in order on the same heap: insert, decrease_key and delete on a
+# tenth of the nodes each, then extract_min until empty. Bulk construction
+# and melding 64 node heaps are timed on their own heaps
+#  keys: list, the keys to load
+#  rng: Random, the seeded generator that picks nodes
+#  engine: str, the heap engine name from ENGINES
+# Returns dict, (seconds, operation count) keyed by operation
+def bench_engine(keys: list, rng: random.Random, engine: str = 'binomial') -> dict:
+    cls = ENGINES[engine]
+    timer = Timer()
+    n = len(keys)
+    nodes = [cls.node_type(key) for key in keys]
+    heap = cls()
+    timer.begin()
+    for node in nodes:
+        heap.insert(node)
+    timer.end('insert', n)
+    chosen = rng.sample(nodes, n // 5)
+    timer.begin()
+    for node in chosen[:n // 10]:
+        heap.decrease_key(node, node.key - 1)
+    timer.end('decrease_key', n // 10)
+    timer.begin()
+    for node in chosen[n // 10:]:
+        heap.delete(node)
+    timer.end('delete', len(chosen) - n // 10)
+    remaining = n - len(chosen) + n // 10
+    timer.begin()
+    for _ in range(remaining):
+        heap.extract_min()
+    timer.end('extract_min', remaining)
+    timer.begin()
+    cls.from_iterable(keys)
+    timer.end('from_iterable', n)
+    parts = [cls.from_iterable(keys[i:i + 64])[0] for i in range(0, n, 64)]
+    target = cls()
+    timer.begin()
+    for part in parts:
+        target.meld(part)
+    timer.end('meld', len(parts))
+    return timer.results
+
+
+# Function to time the same phases on heapq with lazy deletion
+# A decreased or deleted entry is marked dead and skipped when popped
+#  keys: list, the keys to load
+#  rng: Random, the seeded generator that picks entries
+# Returns dict, (seconds, operation count) keyed by operation
+def bench_heapq(keys: list, rng: random.Random) -> dict:
+    timer = Timer()
+    n = len(keys)
+    # Entries are [key, sequence, alive] so equal keys never compare the flag
+    entries = [[key, i, True] for i, key in enumerate(keys)]
+    heap = []
+    timer.begin()
+    for entry in entries:
+        heapq.heappush(heap, entry)
+    timer.end('insert', n)
+    chosen = rng.sample(entries, n // 5)
+    timer.begin()
+    for i, entry in enumerate(chosen[:n // 10]):
+        entry[2] = False
+        heapq.heappush(heap, [entry[0] - 1, n + i, True])
+    timer.end('decrease_key', n // 10)
+    timer.begin()
+    for entry in chosen[n // 10:]:
+        entry[2] = False
+    timer.end('delete', len(chosen) - n // 10)
+    remaining = n - len(chosen) + n // 10
+    timer.begin()
+    popped = 0
+    while popped < remaining:
+        if heapq.heappop(heap)[2]:
+            popped += 1
+    timer.end('extract_min', remaining)
+    pairs = [(key, i) for i, key in enumerate(keys)]
+    timer.begin()
+    heapq.heapify(pairs)
+    timer.end('from_iterable', n)
+    return timer.results
+
+
+# Function to time the same phases on a sorted list
+# Uses sortedcontainers.SortedList when installed, otherwise a bisect list
+#  keys: list, the keys to load
+#  rng: Random, the seeded generator that picks entries
+# Returns dict, (seconds, operation count) keyed by operation
+def bench_sorted(keys: list, rng: random.Random) -> dict:
+    timer = Timer()
+    n = len(keys)
+    items = [(key, i) for i, key in enumerate(keys)]
+    if SortedList is not None:
+        ordered = SortedList()
+        add = ordered.add
+        remove = ordered.remove
+    else:
+        ordered = []
+
+        def add(item):
+            bisect.insort(ordered, item)
+
+        def remove(item):
+            del ordered[bisect.bisect_left(ordered, item)]
+    timer.begin()
+    for item in items:
+        add(item)
+    timer.end('insert', n)
+    chosen = rng.sample(items, n // 5)
+    timer.begin()
+    for item in chosen[:n // 10]:
+        remove(item)
+        add((item[0] - 1, item[1]))
+    timer.end('decrease_key', n // 10)
+    timer.begin()
+    for item in chosen[n // 10:]:
+        remove(item)
+    timer.end('delete', len(chosen) - n // 10)
+    remaining = len(ordered)
+    timer.begin()
+    for _ in range(remaining):
+        ordered.pop(0)
+    timer.end('extract_min', remaining)
+    timer.begin()
+    SortedList(items) if SortedList is not None else sorted(items)
+    timer.end('from_iterable', n)
+    return timer.results
+
+
+# Function to build a random directed graph as adjacency lists
+#  n: int, the number of vertices
+#  degree: int, the number of outgoing edges per vertex
+#  rng: Random, the seeded generator
+# Returns list of lists of (vertex, weight) tuples
+def random_graph(n: int, degree: int, rng: random.Random) -> list:
+    return [[(rng.randrange(n), rng.random()) for _ in range(degree)] for _ in range(n)]
+
+
+# Function to time Dijkstra from vertex 0 with decrease_key on a heap engine
+#  graph: list of lists of (vertex, weight) tuples
+#  engine: str, the heap engine name from ENGINES
+# Returns tuple (seconds, heap operations)
+def dijkstra_engine(graph: list, engine: str = 'binomial') -> tuple:
+    start = time.perf_counter()
+    heap = make_heap(engine)
+    nodes = [None] * len(graph)
+    done = [False] * len(graph)
+    nodes[0] = heap.node_type(0.0, 0)
+    heap.insert(nodes[0])
+    ops = 1
+    while heap.head is not None:
+        node = heap.extract_min()
+        ops += 1
+        u = node.value
+        done[u] = True
+        for v, weight in graph[u]:
+            if done[v]:
+                continue
+            distance = node.key + weight
+            if nodes[v] is None:
+                nodes[v] = heap.node_type(distance, v)
+                heap.insert(nodes[v])
+                ops += 1
+            elif distance < nodes[v].key:
+                heap.decrease_key(nodes[v], distance)
+                ops += 1
+    return time.perf_counter() - start, ops
+
+
+# Function to time Dijkstra from vertex 0 on heapq with lazy deletion
+#  graph: list of lists of (vertex, weight) tuples
+# Returns tuple (seconds, heap operations)
+def dijkstra_heapq(graph: list) -> tuple:
+    start = time.perf_counter()
+    best = [None] * len(graph)
+    best[0] = 0.0
+    heap = [(0.0, 0)]
+    ops = 1
+    while heap:
+        distance, u = heapq.heappop(heap)
+        ops += 1
+        if distance > best[u]:
+            continue
+        for v, weight in graph[u]:
+            candidate = distance + weight
+            if best[v] is None or candidate < best[v]:
+                best[v] = candidate
+                heapq.heappush(heap, (candidate, v))
+                ops += 1
+    return time.perf_counter() - start, ops
+
+
+# Function to time a discrete event simulation (the hold model)
+# Each step pops the earliest event and schedules a new one after it
+#  n: int, the number of pending events and of steps
+#  rng: Random, the seeded generator
+#  binomial: bool, use BinomialHeap (reusing nodes) instead of heapq
+# Returns tuple (seconds, heap operations)
+def event_simulation(n: int, rng: random.Random, binomial: bool) -> tuple:
+    times = [rng.expovariate(1.0) for _ in range(n)]
+    delays = [rng.expovariate(1.0) for _ in range(n)]
+    start = time.perf_counter()
+    if binomial:
+        heap = BinomialHeap.from_iterable(times)[0]
+        for delay in delays:
+            node = heap.extract_min()
+            node.key += delay
+            heap.insert(node)
+    else:
+        heap = list(times)
+        heapq.heapify(heap)
+        for delay in delays:
+            heapq.heappush(heap, heapq.heappop(heap) + delay)
+    return time.perf_counter() - start, 2 * n
+
+
+# Function to compare the heap engines on a decrease_key heavy workload
+# Dijkstra on random graphs of growing degree, so the share of decrease_key
+# calls per extract_min grows
+#  n: int, the number of vertices
+# Returns list of tuples (degree, {engine: seconds}), plus heapq as a baseline
+def engine_timing(n: int) -> list:
+    results = []
+    for degree in (2, 8, 32):
+        graph = random_graph(n, degree, random.Random(degree))
+        times = {engine: dijkstra_engine(graph, engine)[0] for engine in ENGINES}
+        times['heapq'] = dijkstra_heapq(graph)[0]
+        results.append((degree, times))
+    return results
+
+
+# Function to compare ways of consuming a whole heap in order
+#  n: int, the number of random float keys
+# Returns dict, seconds keyed by method
+def heapsort_timing(n: int) -> dict:
+    rng = random.Random(n)
+    keys = [rng.random() for _ in range(n)]
+    results = {}
+    start = time.perf_counter()
+    sorted(keys)
+    results['sorted'] = time.perf_counter() - start
+    start = time.perf_counter()
+    heapsort(keys)
+    results['heapsort'] = time.perf_counter() - start
+    heap = list(keys)
+    start = time.perf_counter()
+    heapq.heapify(heap)
+    [heapq.heappop(heap) for _ in range(n)]
+    results['heapq'] = time.perf_counter() - start
+    # The remaining rows exclude building the heap
+    heap = BinomialHeap.from_iterable(keys)[0]
+    start = time.perf_counter()
+    while heap.head is not None:
+        heap.extract_min()
+    results['extract_min loop'] = time.perf_counter() - start
+    heap = BinomialHeap.from_iterable(keys)[0]
+    start = time.perf_counter()
+    for node in heap.drain():
+        pass
+    results['drain'] = time.perf_counter() - start
+    heap = BinomialHeap.from_iterable(keys)[0]
+    start = time.perf_counter()
+    for node in heap.sorted_view():
+        pass
+    results['sorted_view'] = time.perf_counter() - start
+    return results
+
+
+# Function to compare keeping the k largest keys of a stream
+#  n: int, the number of random float keys in the stream
+# Returns list of (k, dict of seconds keyed by method) tuples
+def topk_timing(n: int) -> list:
+    rng = random.Random(n)
+    keys = [rng.random() for _ in range(n)]
+    results = []
+    for k in (10, 1000, max(n // 10, 1)):
+        times = {}
+        start = time.perf_counter()
+        topk(keys, k)
+        times['topk'] = time.perf_counter() - start
+        start = time.perf_counter()
+        heapq.nlargest(k, keys)
+        times['heapq.nlargest'] = time.perf_counter() - start
+        # The unbounded way: one node per key, then extract the largest
+        start = time.perf_counter()
+        heap = BinomialHeap.from_iterable(keys, reverse=True)[0]
+        heap.extract_many(k)
+        times['unbounded'] = time.perf_counter() - start
+        results.append((k, times))
+    return results
+
+
+# Function to build a random undirected graph directly as CSR arrays
+#  edges: int, the number of directed edge entries (each undirected edge is two)
+#  degree: int, the average number of entries per vertex
+#  rng: Random, the seeded generator
+# Returns tuple (offsets, targets, weights) of arrays
+def random_csr(edges: int, degree: int, rng: random.Random) -> tuple:
+    n = max(2, edges // degree)
+    # Chain every vertex to the previous one so the graph is connected
+    sources = array('q', range(1, n))
+    ends = array('q', range(n - 1))
+    for _ in range(edges // 2 - (n - 1)):
+        sources.append(rng.randrange(n))
+        ends.append(rng.randrange(n))
+    weights = array('d', [rng.random() for _ in range(len(sources))])
+    # Counting sort of both directions by source vertex
+    counts = array('q', bytes(8 * (n + 1)))
+    for u in sources:
+        counts[u + 1] += 1
+    for v in ends:
+        counts[v + 1] += 1
+    for u in range(n):
+        counts[u + 1] += counts[u]
+    offsets = array('q', counts)
+    fill = array('q', counts)
+    targets = array('q', bytes(8 * counts[n]))
+    packed = array('d', bytes(8 * counts[n]))
+    for u, v, weight in zip(sources, ends, weights):
+        targets[fill[u]] = v
+        packed[fill[u]] = weight
+        fill[u] += 1
+        targets[fill[v]] = u
+        packed[fill[v]] = weight
+        fill[v] += 1
+    return offsets, targets, packed
+
+
+# Function to run Dijkstra from vertex 0 on heapq with lazy deletion
+#  graph: adjacency lists or CSR arrays, see Graphs.adjacency
+# Returns dict, the distance of every reached vertex
+def dijkstra_lazy(graph) -> dict:
+    edges = adjacency(graph)
+    best = {0: 0.0}
+    heap = [(0.0, 0)]
+    heappop = heapq.heappop
+    heappush = heapq.heappush
+    while heap:
+        distance, u = heappop(heap)
+        if distance > best[u]:
+            continue
+        for v, weight in edges(u):
+            candidate = distance + weight
+            if candidate < best.get(v, inf):
+                best[v] = candidate
+                heappush(heap, (candidate, v))
+    return best
+
+
+# Function to run Prim from vertex 0 on heapq with lazy deletion
+#  graph: adjacency lists or CSR arrays of an undirected graph
+# Returns float, the total weight of the spanning tree
+def prim_lazy(graph) -> float:
+    edges = adjacency(graph)
+    in_tree = set()
+    total = 0.0
+    heap = [(0.0, 0)]
+    heappop = heapq.heappop
+    heappush = heapq.heappush
+    while heap:
+        weight, u = heappop(heap)
+        if u in in_tree:
+            continue
+        in_tree.add(u)
+        total += weight
+        for v, weight in edges(u):
+            if v not in in_tree:
+                heappush(heap, (weight, v))
+    return total
+
+
+# Function to time the graph routines against the heapq baselines
+#  edges: int, the number of directed edge entries in the random graph
+#  engines: list of str, the heap engines to time
+# Returns list of tuples (algorithm, implementation, seconds)
+def graph_timing(edges: int, engines: list) -> list:
+    graph = random_csr(edges, 8, random.Random(edges))
+    results = []
+    for algorithm, routine, baseline in (('dijkstra', dijkstra, dijkstra_lazy),
+                                         ('prim', prim, prim_lazy)):
+        for engine in engines:
+            start = time.perf_counter()
+            routine(graph, 0, engine=engine)
+            results.append((algorithm, engine, time.perf_counter() - start))
+        start = time.perf_counter()
+        baseline(graph)
+        results.append((algorithm, 'heapq (lazy)', time.perf_counter() - start))
+    return results
+
+
+# Function to time a churn heavy deadline queue
+# Schedules n jobs, cancels half of them, postpones a quarter and pops
+# everything in 100 time steps, once through Scheduler (tombstones) and once
+# with direct delete, increase_key and extract_min calls
+#  n: int, the number of jobs
+# Returns dict, seconds keyed by method
+def scheduler_timing(n: int) -> dict:
+    rng = random.Random(n)
+    deadlines = [rng.random() * n for _ in range(n)]
+    cancelled = rng.sample(range(n), n // 2)
+    postponed = rng.sample(range(n), n // 4)
+    steps = [n * (i + 1) / 50 for i in range(100)]
+    results = {}
+    for lazy in (False, True):
+        start = time.perf_counter()
+        scheduler = Scheduler(lazy=lazy)
+        handles = [scheduler.schedule(at, i) for i, at in enumerate(deadlines)]
+        for i in cancelled:
+            scheduler.cancel(handles[i])
+        for i in postponed:
+            if handles[i].node is not None:
+                scheduler.reschedule(handles[i], handles[i].at + n / 2)
+        for now in steps:
+            scheduler.pop_due(now)
+        results['Scheduler' + (' (lazy)' if lazy else ' (eager)')] = time.perf_counter() - start
+    start = time.perf_counter()
+    heap = BinomialHeap()
+    nodes = [Node(at, i) for i, at in enumerate(deadlines)]
+    for node in nodes:
+        heap.insert(node)
+    live = [True] * n
+    for i in cancelled:
+        heap.delete(nodes[i])
+        live[i] = False
+    for i in postponed:
+        if live[i]:
+            heap.increase_key(nodes[i], nodes[i].key + n / 2)
+    for now in steps:
+        while heap.head is not None and heap.min().key <= now:
+            heap.extract_min()
+    results['direct'] = time.perf_counter() - start
+    return results
+
+
+# Function to describe the environment a benchmark ran in
+# Returns dict, version and platform metadata for every record
+def environment() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(),
+            'implementation': platform.python_implementation(), 'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+# Function to run the full benchmark suite
+# Every result is one JSON object per line so runs can be compared later
+#  sizes: list of int, the heap sizes to run
+#  distributions: list of str, the key distributions to run
+#  seed: int, the seed for every random generator
+#  out: text file object, where the JSON lines are written
+# Returns nothing
+def run_suite(sizes: list, distributions: list, seed: int, out) -> None:
+    meta = environment()
+
+    def emit(unit='seconds', **record):
+        record.update(meta)
+        total, count = record.pop('result')
+        record[unit] = total
+        record['count'] = count
+        if unit == 'seconds':
+            record['ns_per_op'] = total / count * 1e9 if count else None
+        else:
+            record[unit + '_per_op'] = total / count if count else None
+        out.write(json.dumps(record) + '\n')
+        out.flush()
+
+    sorted_name = 'sortedcontainers' if SortedList is not None else 'bisect'
+    for n in sizes:
+        for distribution in distributions:
+            keys = make_keys(distribution, n, random.Random(seed))
+            for engine in ENGINES:
+                for op, result in bench_engine(keys, random.Random(seed), engine).items():
+                    emit(suite='operations', impl=engine, op=op, n=n,
+                         distribution=distribution, result=result)
+            baselines = [('heapq', bench_heapq)]
+            # The bisect fallback is quadratic, skip it for large heaps
+            if SortedList is not None or n <= 100000:
+                baselines.append((sorted_name, bench_sorted))
+            for impl, bench in baselines:
+                for op, result in bench(keys, random.Random(seed)).items():
+                    emit(suite='operations', impl=impl, op=op, n=n,
+                         distribution=distribution, result=result)
+        graph = random_graph(n, 4, random.Random(seed))
+        for engine in ENGINES:
+            emit(suite='mix', impl=engine, op='dijkstra', n=n, distribution='random',
+                 result=dijkstra_engine(graph, engine))
+        emit(suite='mix', impl='heapq', op='dijkstra', n=n, distribution='random',
+             result=dijkstra_heapq(graph))
+        for impl, binomial in (('binomial', True), ('heapq', False)):
+            emit(suite='mix', impl=impl, op='event_simulation', n=n, distribution='random',
+                 result=event_simulation(n, random.Random(seed), binomial))
+        if n <= 1000000:
+            for layout, size in memory_per_element(n).items():
+                emit(unit='bytes', suite='memory', impl=layout, op='per_node', n=n,
+                     distribution='random', result=(size * n, n))
+
+
+# Function to compare two suite result files
+# Prints the ratio new / old of the time (or bytes) for each shared record
+#  old_path: str, the baseline JSON lines file
+#  new_path: str, the candidate JSON lines file
+# Returns nothing
+def compare(old_path: str, new_path: str) -> None:
+    def load(path):
+        with open(path) as handle:
+            records = [json.loads(line) for line in handle if line.strip()]
+        return {(r['suite'], r['impl'], r['op'], r['n'], r['distribution']): r for r in records}
+
+    old = load(old_path)
+    new = load(new_path)
+    for name in sorted(set(old) & set(new), key=str):
+        unit = 'seconds' if 'seconds' in old[name] else 'bytes'
+        before = old[name][unit]
+        after = new[name].get(unit, 0)
+        ratio = after / before if before else float('nan')
+        flag = '  REGRESSION' if ratio > 1.10 else ''
+        print('%-10s %-18s %-16s %-9d %-10s %7.2fx%s' % (name + (ratio, flag)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binomial heap benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name in ('memory', 'lazy', 'asyncio', 'sharded', 'snapshot', 'engines', 'heapsort',
+                 'scheduler', 'topk', 'views'):
+        command = commands.add_parser(name)
+        command.add_argument('n', type=int, nargs='?', default=100000)
+    command = commands.add_parser('graphs', help="time Dijkstra and Prim against heapq")
+    command.add_argument('edges', type=int, nargs='?', default=1000000)
+    command.add_argument('--engines', default=','.join(ENGINES))
+    suite = commands.add_parser('suite', help="run every operation and write JSON lines")
+    suite.add_argument('--sizes', default='1000,10000,100000',
+                       help="comma separated heap sizes, up to 10000000")
+    suite.add_argument('--distributions', default='random,sorted,reverse,duplicates')
+    suite.add_argument('--seed', type=int, default=5800)
+    suite.add_argument('--output', help="JSON lines file (default: standard output)")
+    command = commands.add_parser('compare', help="compare two suite result files")
+    command.add_argument('old')
+    command.add_argument('new')
+    args = parser.parse_args()
+    n = getattr(args, 'n', None)
+    if args.command == 'memory':
+        for layout, size in memory_per_element(n).items():
+            print('%-16s %8.1f bytes/element' % (layout, size))
+    elif args.command == 'lazy':
+        print('pops/inserts   eager (s)   lazy (s)')
+        for fraction, eager, lazy in lazy_crossover(n):
+            print('%12s %11.3f %10.3f' % (fraction, eager, lazy))
+        print('decrease_key to roots (2000 calls) %.3f %.3f'
+              % (time_decrease_to_roots(n, False), time_decrease_to_roots(n, True)))
+    elif args.command == 'asyncio':
+        print('maxsize   HeapQueue (s)   PriorityQueue (s)')
+        for maxsize, heap_time, priority_time in asyncio_timing(n):
+            print('%7d %15.3f %19.3f' % (maxsize, heap_time, priority_time))
+    elif args.command == 'sharded':
+        for shards, seconds in sharded_scaling(n, multiprocessing.cpu_count()):
+            print('%-16s %8.3f s' % (str(shards) + ' shards' if shards else 'single process',
+                                      seconds))
+    elif args.command == 'snapshot':
+        for name, value in snapshot_timing(n).items():
+            print('%-8s %s' % (name, value))
+    elif args.command == 'engines':
+        names = list(ENGINES) + ['heapq']
+        print('degree ' + ''.join('%12s' % name for name in names))
+        for degree, times in engine_timing(n):
+            print('%6d ' % degree + ''.join('%12.3f' % times[name] for name in names))
+    elif args.command == 'heapsort':
+        for method, seconds in heapsort_timing(n).items():
+            print('%-18s %8.3f s' % (method, seconds))
+    elif args.command == 'scheduler':
+        for method, seconds in scheduler_timing(n).items():
+            print('%-18s %8.3f s' % (method, seconds))
+    elif args.command == 'views':
+        for name, value in view_timing(n).items():
+            print('%-18s %s' % (name, value))
+    elif args.command == 'topk':
+        names = ('topk', 'heapq.nlargest', 'unbounded')
+        print('%9s ' % 'k' + ''.join('%16s' % name for name in names))
+        for k, times in topk_timing(n):
+            print('%9d ' % k + ''.join('%16.3f' % times[name] for name in names))
+    elif args.command == 'graphs':
+        for algorithm, impl, seconds in graph_timing(args.edges, args.engines.split(',')):
+            print('%-9s %-13s %8.3f s' % (algorithm, impl, seconds))
+    elif args.command == 'suite':
+        sizes = [int(float(size)) for size in args.sizes.split(',')]
+        distributions = args.distributions.split(',')
+        if args.output:
+            with open(args.output, 'w') as out:
+                run_suite(sizes, distributions, args.seed, out)
+        else:
+            run_suite(sizes, distributions, args.seed, sys.stdout)
+    elif args.command == 'compare':
+        compare(args.old, args.new)
+
+
+if __name__ == '__main__':
+    main()
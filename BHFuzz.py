@@ -0,0 +1,355 @@
+# George Dunnery - CS 5800
+from HeapFactory import *
+import argparse
+import heapq
+import random
+import sys
+import time
+
+# Operations the fuzzer picks from, with their relative weights
+# Engines without an operation (split and set_lazy are BinomialHeap only)
+# simply skip it
+OPERATIONS = {
+    'insert': 30,
+    'extract_min': 12,
+    'decrease_key': 15,
+    'delete': 6,
+    'meld': 3,
+    'extract_many': 2,
+    'delete_many': 2,
+    'decrease_keys': 2,
+    'drain': 1,
+    'split': 1,
+    'toggle_lazy': 1,
+    'snapshot': 1,
+}
+
+# Most snapshots kept open at once, the oldest is checked and closed first
+OPEN_VIEWS = 3
+
+
+# Class to represent the expected contents of a heap under test
+# Live nodes are kept in a list for O(1) random picks. The minimum is found
+# with a heapq of (signed key, sequence, node) entries, where entries for
+# nodes removed or re-keyed since are skipped lazily
+class HeapModel:
+
+    # Constructs an empty model
+    #  reverse: bool, whether the heap under test is in max-heap mode
+    def __init__(self, reverse: bool = False):
+        self.sign = -1 if reverse else 1
+        # Expected key of every live node
+        self.keys = {}
+        self.live = []
+        # Position of every live node in the live list
+        self.where = {}
+        self.entries = []
+        self.sequence = 0
+
+    # Defines the number of live nodes
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    # Function to record a node added to the heap
+    #  node: Node, the node
+    #  key: int, its key
+    # Returns nothing
+    def add(self, node: 'Node', key: int) -> None:
+        self.where[node] = len(self.live)
+        self.live.append(node)
+        self.rekey(node, key)
+
+    # Function to record a new key for a live node
+    #  node: Node, the node
+    #  key: int, its new key
+    # Returns nothing
+    def rekey(self, node: 'Node', key: int) -> None:
+        self.keys[node] = key
+        heapq.heappush(self.entries, (self.sign * key, self.sequence, node))
+        self.sequence += 1
+
+    # Function to record a node removed from the heap
+    #  node: Node, the node
+    # Returns nothing
+    def discard(self, node: 'Node') -> None:
+        del self.keys[node]
+        # Move the last live node into the hole
+        position = self.where.pop(node)
+        last = self.live.pop()
+        if last is not node:
+            self.live[position] = last
+            self.where[last] = position
+
+    # Function to pick random live nodes
+    #  rng: Random, the seeded generator
+    #  k: int, the number of distinct nodes
+    # Returns list of Node, at most k nodes
+    def pick(self, rng: random.Random, k: int = 1) -> list:
+        return rng.sample(self.live, min(k, len(self.live)))
+
+    # Function to get the signed key of the minimum
+    # Returns int, the smallest signed key, or None when empty
+    def min_rank(self):
+        entries = self.entries
+        while entries:
+            rank, sequence, node = entries[0]
+            if node in self.keys and self.sign * self.keys[node] == rank:
+                return rank
+            heapq.heappop(entries)
+        return None
+
+    # Function to get the keys of the model in heap order
+    # Returns list, every live key in ascending key order
+    def sorted_keys(self) -> list:
+        return sorted(self.keys.values(), reverse=self.sign < 0)
+
+    # Function to remove a node the heap reported as its minimum
+    #  node: Node, the node returned by the heap
+    # Raises AssertionError when the node was not the expected minimum
+    # Returns nothing
+    def take_min(self, node: 'Node') -> None:
+        if node not in self.keys:
+            raise AssertionError("Extracted a node that is not in the heap.")
+        if node.key != self.keys[node]:
+            raise AssertionError("Extracted node has key %r, expected %r." % (node.key, self.keys[node]))
+        if self.sign * node.key != self.min_rank():
+            raise AssertionError("Extracted key %r is not the minimum." % (node.key,))
+        self.discard(node)
+
+
+# Class to drive one heap through a seeded random sequence of operations
+# Every result is checked against a HeapModel as it goes
+class HeapFuzzer:
+
+    # Constructs a fuzzer for a new, empty heap
+    #  engine: str, the heap engine name for make_heap
+    #  seed: int, the seed of the random generator
+    #  reverse: bool, whether the heap is in max-heap mode
+    #  key_range: int, keys are drawn from 0 to key_range (small ranges give many ties)
+    def __init__(self, engine: str = 'binomial', seed: int = 0, reverse: bool = False,
+                 key_range: int = 1000):
+        self.engine = engine
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.reverse = reverse
+        self.key_range = key_range
+        self.heap = make_heap(engine, reverse=reverse)
+        self.model = HeapModel(reverse)
+        self.counts = dict.fromkeys(OPERATIONS, 0)
+        # (HeapView, keys in heap order when it was taken) of the open snapshots
+        self.views = []
+
+    # Function to draw a random key
+    # Returns int, the key
+    def new_key(self) -> int:
+        return self.rng.randint(0, self.key_range)
+
+    # Function to draw a key that comes before the current key of a node
+    #  node: Node, a live node
+    # Returns int, the new key
+    def smaller_key(self, node: 'Node') -> int:
+        step = self.rng.randint(0, self.key_range // 4)
+        return node.key + step if self.reverse else node.key - step
+
+    # Function to check the size and the minimum against the model
+    # Raises AssertionError on a mismatch
+    # Returns nothing
+    def check(self) -> None:
+        if len(self.heap) != len(self.model):
+            raise AssertionError("Heap size %d, expected %d." % (len(self.heap), len(self.model)))
+        node = self.heap.min()
+        expected = self.model.min_rank()
+        if (node is None) != (expected is None) or node is not None and \
+                self.model.sign * node.key != expected:
+            raise AssertionError("Heap minimum does not match the model.")
+
+    # Function to apply operations and check the heap after each one
+    #  operations: int, the number of operations
+    #  check_every: int, how many operations pass between full validate calls
+    # Raises RuntimeError naming the engine, seed and operation on any failure
+    # Returns dict, the number of times each operation ran
+    def run(self, operations: int, check_every: int = 100) -> dict:
+        names = list(OPERATIONS)
+        weights = list(OPERATIONS.values())
+        for step in range(operations):
+            op = self.rng.choices(names, weights)[0]
+            try:
+                getattr(self, 'do_' + op)()
+                self.check()
+                if check_every and step % check_every == 0:
+                    self.heap.validate()
+            except Exception as error:
+                raise RuntimeError("Fuzzing %s with seed %d failed at operation %d (%s): %s"
+                                   % (self.engine, self.seed, step, op, error)) from error
+            self.counts[op] += 1
+        try:
+            self.heap.validate()
+            for node in self.heap.drain():
+                self.model.take_min(node)
+            if len(self.model):
+                raise AssertionError("Drain missed %d nodes." % len(self.model))
+            # Snapshots still show the heap as it was after emptying it
+            while self.views:
+                self.check_view()
+        except Exception as error:
+            raise RuntimeError("Fuzzing %s with seed %d failed at the final drain: %s"
+                               % (self.engine, self.seed, error)) from error
+        return self.counts
+
+    # Function to insert a node with a random key
+    # Returns nothing
+    def do_insert(self) -> None:
+        key = self.new_key()
+        node = self.heap.node_type(key)
+        self.heap.insert(node)
+        self.model.add(node, key)
+
+    # Function to extract the minimum
+    # Returns nothing
+    def do_extract_min(self) -> None:
+        if self.heap:
+            self.model.take_min(self.heap.extract_min())
+
+    # Function to decrease the key of a random node
+    # Returns nothing
+    def do_decrease_key(self) -> None:
+        for node in self.model.pick(self.rng):
+            key = self.smaller_key(node)
+            self.heap.decrease_key(node, key)
+            self.model.rekey(node, key)
+
+    # Function to delete a random node
+    # Returns nothing
+    def do_delete(self) -> None:
+        for node in self.model.pick(self.rng):
+            self.heap.delete(node)
+            self.model.discard(node)
+
+    # Function to meld a small new heap into the heap
+    # Returns nothing
+    def do_meld(self) -> None:
+        other = make_heap(self.engine, reverse=self.reverse)
+        for _ in range(self.rng.randint(0, 20)):
+            key = self.new_key()
+            node = other.node_type(key)
+            other.insert(node)
+            self.model.add(node, key)
+        self.heap.meld(other)
+        if len(other) or other.min() is not None:
+            raise AssertionError("Meld left nodes in the other heap.")
+
+    # Function to extract a small batch in order
+    # Returns nothing
+    def do_extract_many(self) -> None:
+        k = self.rng.randint(0, 10)
+        taken = self.heap.extract_many(k)
+        if len(taken) != min(k, len(self.model)):
+            raise AssertionError("extract_many returned %d nodes." % len(taken))
+        for node in taken:
+            self.model.take_min(node)
+
+    # Function to delete a random batch of nodes
+    # Returns nothing
+    def do_delete_many(self) -> None:
+        nodes = self.model.pick(self.rng, self.rng.randint(0, 8))
+        self.heap.delete_many(nodes)
+        for node in nodes:
+            self.model.discard(node)
+
+    # Function to decrease the keys of a random batch of nodes
+    # Returns nothing
+    def do_decrease_keys(self) -> None:
+        pairs = [(node, self.smaller_key(node)) for node in self.model.pick(self.rng, self.rng.randint(0, 8))]
+        self.heap.decrease_keys(pairs)
+        for node, key in pairs:
+            self.model.rekey(node, key)
+
+    # Function to drain a few nodes and close the generator early
+    # Returns nothing
+    def do_drain(self) -> None:
+        drained = self.heap.drain()
+        for _ in range(self.rng.randint(0, 10)):
+            node = next(drained, None)
+            if node is None:
+                break
+            self.model.take_min(node)
+        drained.close()
+
+    # Function to split off whole trees and meld them back
+    # Returns nothing
+    def do_split(self) -> None:
+        if hasattr(self.heap, 'split'):
+            part = self.heap.split(self.rng.randint(0, len(self.heap)))
+            if len(part) + len(self.heap) != len(self.model):
+                raise AssertionError("split lost nodes.")
+            part.validate()
+            self.heap.meld(part)
+
+    # Function to take a snapshot, checking and closing the oldest one when
+    # too many are open
+    # Returns nothing
+    def do_snapshot(self) -> None:
+        if hasattr(self.heap, 'snapshot'):
+            self.views.append((self.heap.snapshot(), self.model.sorted_keys()))
+            if len(self.views) > OPEN_VIEWS:
+                self.check_view()
+
+    # Auxiliary function to do_snapshot and run
+    # Function to compare the oldest open snapshot with the keys recorded when
+    # it was taken, then close it
+    # Raises AssertionError on a mismatch
+    # Returns nothing
+    def check_view(self) -> None:
+        view, keys = self.views.pop(0)
+        if len(view) != len(keys) or [key for key, value in view.sorted_view()] != keys:
+            raise AssertionError("Snapshot no longer matches the heap it was taken from.")
+        if (view.min() is None) != (not keys) or keys and view.min()[0] != keys[0]:
+            raise AssertionError("Snapshot minimum does not match.")
+        view.close()
+
+    # Function to switch between eager and lazy mode
+    # Returns nothing
+    def do_toggle_lazy(self) -> None:
+        if hasattr(self.heap, 'set_lazy'):
+            self.heap.set_lazy(not self.heap.lazy)
+
+
+# Function to fuzz one heap with a seeded random sequence of operations
+#  engine: str, the heap engine name for make_heap
+#  seed: int, the seed of the random generator (a failure names it)
+#  operations: int, the number of operations
+#  check_every: int, how many operations pass between full validate calls
+#  reverse: bool, whether the heap is in max-heap mode
+#  key_range: int, keys are drawn from 0 to key_range
+# Raises RuntimeError naming the engine, seed and operation on any failure
+# Returns dict, the number of times each operation ran
+def fuzz(engine: str = 'binomial', seed: int = 0, operations: int = 10000, check_every: int = 100,
+         reverse: bool = False, key_range: int = 1000) -> dict:
+    return HeapFuzzer(engine, seed, reverse, key_range).run(operations, check_every)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Random-operation fuzzer for the heap engines")
+    parser.add_argument('--engines', default=','.join(ENGINES))
+    parser.add_argument('--seeds', type=int, default=10, help="number of seeds per engine")
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--operations', type=int, default=100000)
+    parser.add_argument('--check-every', type=int, default=1000,
+                        help="operations between full validate calls (0 only validates at the end)")
+    parser.add_argument('--key-range', type=int, default=1000)
+    parser.add_argument('--reverse', action='store_true', help="fuzz max-heap mode")
+    args = parser.parse_args()
+    for engine in args.engines.split(','):
+        for seed in range(args.first_seed, args.first_seed + args.seeds):
+            start = time.perf_counter()
+            try:
+                fuzz(engine, seed, args.operations, args.check_every, args.reverse, args.key_range)
+            except RuntimeError as error:
+                print(error)
+                sys.exit(1)
+            print('%-10s seed %-6d %d operations in %.2f s'
+                  % (engine, seed, args.operations, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
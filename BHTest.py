@@ -1,18 +1,34 @@
 # George Dunnery - CS 5800
 from BinomialHeap import *
+from CompactBinomialHeap import *
+from ConcurrentHeap import *
+from AsyncHeapQueue import *
+from ShardedHeap import *
+from HeapFactory import *
+from Graphs import *
+from Scheduler import *
+from BHFuzz import *
+from fractions import Fraction
+from math import inf
+import asyncio
+import bisect
+import io
+import random
+import queue
+import tempfile
+import threading
 import unittest
 
 
 # Test class focusing on node functionality
 class NodeTest(unittest.TestCase):
 
-    # Verify that integer keys are enforced
-    def test_create_node_exception(self):
-        try:
-            incorrect = Node("hello")
-        except TypeError:
-            # Verify that the exception is thrown as expected
-            pass
+    # Verify that any orderable key is accepted and becomes the initial rank
+    def test_create_node_any_key(self):
+        for key in ["hello", (3, 1.5, 7), 2 ** 80]:
+            node = Node(key)
+            self.assertEqual(key, node.key)
+            self.assertEqual(key, node.rank)
 
     # Verify that a node is created correctly
     def test_create_node(self):
@@ -26,10 +42,49 @@ class NodeTest(unittest.TestCase):
         self.assertEqual(2743562, test_node.key)
         test_node = Node(-99281)
         self.assertEqual(-99281, test_node.key)
-        # -inf will be the key prior to deletion
+        # Infinite float keys are valid as well
         test_node = Node(float(-inf))
         self.assertEqual(-inf, test_node.key)
 
+    # Verify only the Fibonacci and pairing node class carries prev and mark
+    def test_linked_node(self):
+        self.assertFalse(hasattr(Node(1), 'prev'))
+        self.assertFalse(hasattr(Node(1), 'mark'))
+        node = LinkedNode(3, 'x')
+        self.assertIsInstance(node, Node)
+        self.assertEqual((3, 'x', 3), (node.key, node.value, node.rank))
+        self.assertIsNone(node.prev)
+        self.assertFalse(node.mark)
+        for engine in ENGINES.values():
+            heap = engine()
+            heap.insert(engine.node_type(1))
+            if engine.node_type is not Node:
+                self.assertRaises(TypeError, heap.insert, Node(2))
+            self.assertEqual(1, len(heap))
+
+    # Verify the iterative traversal order, depths and parents
+    def test_traverse(self):
+        root = Node(1)
+        child = Node(4)
+        grandchild = Node(9)
+        sibling = Node(2)
+        root.sibling = sibling
+        root.child = child
+        child.parent = root
+        child.child = grandchild
+        grandchild.parent = child
+        result = [(node.key, depth, parent) for node, depth, parent in root.traverse()]
+        self.assertEqual([(1, 0, None), (4, 1, root), (9, 2, child), (2, 0, None)], result)
+        self.assertEqual("(k=1, p=None, d=0)(k=4, p=1, d=0)(k=9, p=4, d=0)(k=2, p=None, d=0)",
+                         root.walk())
+        # A long chain no longer hits the recursion limit
+        head = Node(0)
+        current = head
+        for key in range(1, 5000):
+            current.sibling = Node(key)
+            current = current.sibling
+        self.assertEqual(5000, len(list(head.traverse())))
+
 
 # Test class focusing on binomial heap functionality
 class BinomialHeapTest(unittest.TestCase):
@@ -39,31 +94,57 @@ class BinomialHeapTest(unittest.TestCase):
         heap = BinomialHeap()
         self.assertIsNone(heap.head)
 
-    # Verify the minimum key is found
-    def test_heap_min(self):
+    # Verify the minimum key is found by scanning the root list
+    def test_heap_find_min(self):
         # Manually insert root list for this test
         # Check address & key value
         heap = BinomialHeap()
         first = Node(150)
         heap.head = first
         # Only one node in the root list
-        self.assertEqual(first, heap.min())
-        self.assertEqual(150, heap.min().key)
+        self.assertEqual(first, heap.find_min())
+        self.assertEqual(150, heap.find_min().key)
         # Min is later in the list
         second = Node(97)
         heap.head.sibling = second
-        self.assertEqual(second, heap.min())
-        self.assertEqual(97, heap.min().key)
+        self.assertEqual(second, heap.find_min())
+        self.assertEqual(97, heap.find_min().key)
         # Min is in the middle
         third = Node(500)
         heap.head.sibling.sibling = third
-        self.assertEqual(second, heap.min())
-        self.assertEqual(97, heap.min().key)
+        self.assertEqual(second, heap.find_min())
+        self.assertEqual(97, heap.find_min().key)
         # Min is negative
         fourth = Node(-1)
         heap.head.sibling.sibling.sibling = fourth
-        self.assertEqual(fourth, heap.min())
-        self.assertEqual(-1, heap.min().key)
+        self.assertEqual(fourth, heap.find_min())
+        self.assertEqual(-1, heap.find_min().key)
+
+    # Verify the cached minimum is maintained by every operation
+    def test_heap_min(self):
+        BinomialHeap.debug = True
+        try:
+            heap = BinomialHeap()
+            self.assertIsNone(heap.min())
+            nodes = [Node(k) for k in [40, 12, 77, 12, 5, 93, 61, 18]]
+            for node in nodes:
+                heap.insert(node)
+                self.assertEqual(heap.find_min().key, heap.min().key)
+            self.assertEqual(nodes[4], heap.min())
+            # Decrease a non-root key below the minimum
+            heap.decrease_key(nodes[5], 1)
+            self.assertEqual(1, heap.min().key)
+            heap.delete(nodes[0])
+            self.assertEqual(1, heap.min().key)
+            previous = None
+            while heap.min() is not None:
+                node = heap.extract_min()
+                if previous is not None:
+                    self.assertLessEqual(previous, node.key)
+                previous = node.key
+            self.assertIsNone(heap.head)
+        finally:
+            BinomialHeap.debug = False
 
     # Verify the linking functions properly
     def test_tree_link(self):
@@ -219,6 +300,111 @@ class BinomialHeapTest(unittest.TestCase):
                    "(k=59, p=39, d=0)(k=12, p=10, d=1)(k=18, p=12, d=0)(k=20, p=10, d=0)"
         self.assertEqual(expected, str(other))
 
+    # Verify meld absorbs the other heap in place and empties it
+    def test_meld(self):
+        BinomialHeap.debug = True
+        try:
+            heap = BinomialHeap()
+            for key in [5, 10, 20]:
+                heap.insert(Node(key))
+            other = BinomialHeap()
+            for key in [3, 12, 18, 39]:
+                other.insert(Node(key))
+            heap.meld(other)
+            self.assertIsNone(other.head)
+            self.assertIsNone(other.min())
+            self.assertEqual("", str(other))
+            self.assertEqual(3, heap.min().key)
+            # Seven nodes leave trees of degree 0, 1 and 2 with the tail last
+            self.assertEqual([0, 1, 2], [heap.head.degree, heap.head.sibling.degree,
+                                         heap.tail.degree])
+            self.assertIsNone(heap.tail.sibling)
+            # Melding an empty heap changes nothing
+            heap.meld(BinomialHeap())
+            self.assertEqual(3, heap.min().key)
+            # Lazy meld splices the root lists and keeps the smaller minimum
+            lazy = BinomialHeap(lazy=True)
+            lazy.insert(Node(1))
+            lazy.insert(Node(50))
+            lazy.meld(heap)
+            self.assertIsNone(heap.head)
+            self.assertEqual(1, lazy.min().key)
+            extracted = []
+            while lazy.head is not None:
+                extracted.append(lazy.extract_min().key)
+            self.assertEqual([1, 3, 5, 10, 12, 18, 20, 39, 50], extracted)
+            self.assertRaises(ValueError, lazy.meld, lazy)
+        finally:
+            BinomialHeap.debug = False
+
+    # Verify the streaming writer emits one indented line per node
+    def test_write(self):
+        heap = BinomialHeap()
+        for key in [5, 4, 25]:
+            heap.insert(Node(key))
+        out = io.StringIO()
+        self.assertEqual(3, heap.write(out, batch=2))
+        expected = "(k=25, p=None, d=0)\n" \
+                   "(k=4, p=None, d=1)\n" \
+                   "  (k=5, p=4, d=0)\n"
+        self.assertEqual(expected, out.getvalue())
+        self.assertEqual(0, BinomialHeap().write(out))
+
+    # Verify save and load rebuild the exact forest for every key encoding
+    def test_save_load(self):
+        rng = random.Random(8)
+        cases = [
+            [rng.randint(-10 ** 12, 10 ** 12) for _ in range(100)],
+            [rng.random() for _ in range(77)],
+            [rng.choice([rng.randint(0, 5), rng.random(), 2 ** 70]) for _ in range(40)],
+            [],
+        ]
+        for keys in cases:
+            heap, nodes = BinomialHeap.from_iterable(keys)
+            if keys:
+                heap.extract_min()
+            for i, node in enumerate(nodes[1:10]):
+                node.value = "payload" + str(i)
+            out = io.BytesIO()
+            heap.save(out)
+            loaded = BinomialHeap.load(io.BytesIO(out.getvalue()))
+            self.assertEqual(str(heap), str(loaded))
+            self.assertEqual([n.value for n, d, p in heap.traverse()],
+                             [n.value for n, d, p in loaded.traverse()])
+            self.assertEqual(heap.min() is None, loaded.min() is None)
+            if keys:
+                self.assertEqual(heap.min().key, loaded.min().key)
+                self.assertIsNone(loaded.tail.sibling)
+        # Lazy heaps keep their unconsolidated root list and mode
+        lazy = BinomialHeap(lazy=True)
+        for key in [4, 1, 3]:
+            lazy.insert(Node(key))
+        out = io.BytesIO()
+        lazy.save(out)
+        loaded = BinomialHeap.load(io.BytesIO(out.getvalue()))
+        self.assertTrue(loaded.lazy)
+        self.assertEqual(str(lazy), str(loaded))
+        self.assertEqual(1, loaded.extract_min().key)
+        # Max-heap mode is restored by load
+        reverse, nodes = BinomialHeap.from_iterable([3, 9, 1], reverse=True)
+        out = io.BytesIO()
+        reverse.save(out)
+        loaded = BinomialHeap.load(io.BytesIO(out.getvalue()))
+        self.assertTrue(loaded.reverse)
+        self.assertEqual([9, 3, 1], [node.key for node in loaded.extract_many(3)])
+        # Memory mapped loading from a real file
+        with tempfile.TemporaryFile() as handle:
+            heap.save(handle)
+            handle.flush()
+            loaded = BinomialHeap.load(handle, use_mmap=True)
+        self.assertEqual(str(heap), str(loaded))
+        # Corrupted or foreign data is rejected
+        data = out.getvalue()
+        self.assertRaises(ValueError, BinomialHeap.load, io.BytesIO(b'XXXX' + data[4:]))
+        self.assertRaises(ValueError, BinomialHeap.load, io.BytesIO(data[:-4]))
+        self.assertRaises(ValueError, BinomialHeap.load,
+                          io.BytesIO(data[:4] + b'\x63\x00' + data[6:]))
+
     # Verify nodes are inserted properly
     def test_insert(self):
         heap = BinomialHeap()
@@ -316,7 +502,7 @@ class BinomialHeapTest(unittest.TestCase):
         self.assertEqual(expected, str(heap))
 
     # Verify key changes to lower value & structure updates as needed
-    # Note: Keys are swapped, not the node objects themselves (address)
+    # Note: Node objects are relinked, so each key stays with its node
     # Check where the new smaller key should bubble up to
     def test_decrease_key(self):
         heap = BinomialHeap()
@@ -351,6 +537,665 @@ class BinomialHeapTest(unittest.TestCase):
             # Error was thrown appropriately
             pass
 
+    # Verify node handles and values stay attached through decrease_key
+    def test_decrease_key_handles(self):
+        heap = BinomialHeap()
+        nodes = {}
+        for key in [8, 3, 11, 6, 9, 2, 14, 5]:
+            nodes[key] = Node(key, "item" + str(key))
+            heap.insert(nodes[key])
+        expected = "(k=2, p=None, d=3)" \
+                   "(k=3, p=2, d=2)(k=6, p=3, d=1)(k=11, p=6, d=0)(k=8, p=3, d=0)" \
+                   "(k=5, p=2, d=1)(k=14, p=5, d=0)" \
+                   "(k=9, p=2, d=0)"
+        self.assertEqual(expected, str(heap))
+        # Move the deepest node to the root
+        deep = nodes[11]
+        heap.decrease_key(deep, 1)
+        self.assertEqual(deep, heap.head)
+        self.assertEqual(deep, heap.min())
+        self.assertEqual(1, deep.key)
+        self.assertEqual("item11", deep.value)
+        self.assertIsNone(deep.parent)
+        self.assertEqual(3, deep.degree)
+        expected = "(k=1, p=None, d=3)" \
+                   "(k=2, p=1, d=2)(k=3, p=2, d=1)(k=6, p=3, d=0)(k=8, p=2, d=0)" \
+                   "(k=5, p=1, d=1)(k=14, p=5, d=0)" \
+                   "(k=9, p=1, d=0)"
+        self.assertEqual(expected, str(heap))
+        # Every other handle still refers to its original key and value
+        for key, node in nodes.items():
+            if node is not deep:
+                self.assertEqual(key, node.key)
+                self.assertEqual("item" + str(key), node.value)
+        # Handles extract in order with their values
+        order = []
+        while heap.head is not None:
+            node = heap.extract_min()
+            order.append(node.value)
+        self.assertEqual(["item11", "item2", "item3", "item5",
+                          "item6", "item8", "item9", "item14"], order)
+
+    # Verify bulk construction builds a valid forest and returns handles in order
+    def test_from_iterable(self):
+        heap, nodes = BinomialHeap.from_iterable([])
+        self.assertIsNone(heap.head)
+        self.assertEqual([], nodes)
+        heap, nodes = BinomialHeap.from_iterable([6, 2, 9, 4, 7])
+        self.assertEqual([6, 2, 9, 4, 7], [node.key for node in nodes])
+        expected = "(k=7, p=None, d=0)" \
+                   "(k=2, p=None, d=2)(k=4, p=2, d=1)(k=9, p=4, d=0)(k=6, p=2, d=0)"
+        self.assertEqual(expected, str(heap))
+        self.assertEqual(nodes[1], heap.min())
+        # Key/value pairs keep their values, and handles work with decrease_key
+        rng = random.Random(3)
+        keys = [rng.randint(-500, 500) for _ in range(300)]
+        heap, nodes = BinomialHeap.from_iterable(((key, i) for i, key in enumerate(keys)),
+                                                 pairs=True)
+        self.assertEqual(list(range(300)), [node.value for node in nodes])
+        heap.decrease_key(nodes[123], -1000)
+        self.assertEqual(nodes[123], heap.min())
+        heap.delete(nodes[7])
+        keys[123] = -1000
+        del keys[7]
+        extracted = []
+        while heap.head is not None:
+            extracted.append(heap.extract_min().key)
+        self.assertEqual(sorted(keys), extracted)
+
+    # Verify lazy mode defers linking until extract_min and stays correct
+    def test_lazy_mode(self):
+        BinomialHeap.debug = True
+        try:
+            heap = BinomialHeap(lazy=True)
+            for key in [5, 9, 1, 7]:
+                heap.insert(Node(key))
+            # Inserts only prepend to the root list
+            expected = "(k=7, p=None, d=0)(k=1, p=None, d=0)" \
+                       "(k=9, p=None, d=0)(k=5, p=None, d=0)"
+            self.assertEqual(expected, str(heap))
+            self.assertEqual(1, heap.min().key)
+            self.assertEqual(5, heap.tail.key)
+            # Lazy union concatenates the root lists
+            other = BinomialHeap(lazy=True)
+            other.insert(Node(3))
+            other.insert(Node(8))
+            heap = heap.union(other)
+            expected += "(k=8, p=None, d=0)(k=3, p=None, d=0)"
+            self.assertEqual(expected, str(heap))
+            self.assertEqual(3, heap.tail.key)
+            # Extract min links everything into degree order
+            self.assertEqual(1, heap.extract_min().key)
+            expected = "(k=3, p=None, d=0)" \
+                       "(k=5, p=None, d=2)(k=7, p=5, d=1)(k=9, p=7, d=0)(k=8, p=5, d=0)"
+            self.assertEqual(expected, str(heap))
+            self.assertEqual(5, heap.tail.key)
+            # Randomized run mixing all operations in lazy mode
+            rng = random.Random(11)
+            heap = BinomialHeap(lazy=True)
+            live = []
+            for step in range(2000):
+                action = rng.random()
+                if action < 0.5 or not live:
+                    node = Node(rng.randint(0, 10000))
+                    heap.insert(node)
+                    live.append(node)
+                elif action < 0.7:
+                    node = heap.extract_min()
+                    self.assertEqual(min(n.key for n in live), node.key)
+                    live.remove(node)
+                elif action < 0.85:
+                    node = rng.choice(live)
+                    heap.decrease_key(node, node.key - rng.randint(0, 500))
+                else:
+                    node = rng.choice(live)
+                    heap.delete(node)
+                    live.remove(node)
+                if step % 500 == 0:
+                    heap.set_lazy(not heap.lazy)
+            heap.set_lazy(False)
+            extracted = []
+            while heap.head is not None:
+                extracted.append(heap.extract_min().key)
+            self.assertEqual(sorted(n.key for n in live), extracted)
+        finally:
+            BinomialHeap.debug = False
+
+    # Verify a decrease that reaches a long lazy root list links it first
+    def test_lazy_decrease_to_roots(self):
+        heap = BinomialHeap(lazy=True)
+        old = [Node(key) for key in range(64)]
+        for node in old:
+            heap.insert(node)
+        heap.extract_min()
+        for key in range(1000):
+            heap.insert(Node(100 + key))
+        self.assertEqual(1006, chain_length(heap.head))
+        # The node bubbles past its tree root, which scans the root list
+        deep = max(old[1:], key=heap.depth)
+        kept = [key for key in range(1, 64) if key != deep.key and not 2 <= key < 30 and key != 40]
+        heap.decrease_key(deep, -1)
+        self.assertLessEqual(chain_length(heap.head), heap.count.bit_length())
+        heap.validate()
+        self.assertIs(deep, heap.min())
+        heap.delete(old[40])
+        heap.delete_many(old[2:30])
+        heap.validate()
+        self.assertEqual([-1] + kept, [node.key for node in heap.extract_many(len(kept) + 1)])
+
+    # Verify nsmallest finds nodes in order and leaves the heap unchanged
+    def test_nsmallest(self):
+        rng = random.Random(21)
+        keys = [rng.randint(0, 50) for _ in range(200)]
+        heap, nodes = BinomialHeap.from_iterable(keys)
+        before = str(heap)
+        self.assertEqual([], heap.nsmallest(0))
+        self.assertEqual(sorted(keys)[:25], [node.key for node in heap.nsmallest(25)])
+        self.assertEqual(sorted(keys), [node.key for node in heap.nsmallest(1000)])
+        self.assertEqual(before, str(heap))
+        self.assertEqual([], BinomialHeap().nsmallest(5))
+
+    # Verify sorted_view, drain, iteration and heapsort
+    def test_drain(self):
+        BinomialHeap.debug = True
+        try:
+            rng = random.Random(23)
+            for lazy in (False, True):
+                keys = [rng.randint(0, 300) for _ in range(150)]
+                heap = BinomialHeap(lazy=lazy)
+                for key in keys:
+                    heap.insert(Node(key))
+                before = str(heap)
+                self.assertEqual(sorted(keys), [node.key for node in heap.sorted_view()])
+                self.assertEqual(before, str(heap))
+                # Closing early puts back every node not yet yielded
+                drained = heap.drain()
+                first = [next(drained).key for _ in range(40)]
+                drained.close()
+                self.assertEqual(sorted(keys)[:40], first)
+                self.assertEqual(110, len(heap))
+                heap.check_min()
+                self.assertEqual(sorted(keys)[40:], [node.key for node in heap])
+                self.assertFalse(heap)
+                self.assertIsNone(heap.min())
+            self.assertEqual([], heapsort([]))
+            self.assertEqual(sorted(keys), heapsort(keys))
+            self.assertEqual(sorted(keys, reverse=True), heapsort(keys, reverse=True))
+            words = ["kiwi", "fig", "banana", "apple"]
+            self.assertEqual(["fig", "kiwi", "apple", "banana"], heapsort(words, key=len))
+        finally:
+            BinomialHeap.debug = False
+
+    # Verify keep_largest mode keeps the largest keys and topk matches heapq
+    def test_keep_largest(self):
+        BinomialHeap.debug = True
+        try:
+            rng = random.Random(24)
+            for lazy in (False, True):
+                keys = [rng.randint(0, 1000) for _ in range(300)]
+                heap = BinomialHeap(lazy=lazy, keep_largest=20)
+                for key in keys:
+                    heap.offer(key)
+                    self.assertLessEqual(len(heap), 20)
+                self.assertEqual(sorted(keys)[-20:], [node.key for node in heap.sorted_view()])
+                # A key not above the minimum is turned away without a node
+                self.assertIsNone(heap.offer(heap.min().key))
+                # insert reports the node left out
+                small = Node(-1)
+                self.assertIs(small, heap.insert(small))
+                smallest = heap.min()
+                self.assertIs(smallest, heap.insert(Node(2000)))
+                self.assertEqual(20, len(heap))
+                # Shrinking the limit and melding both evict minimum nodes
+                evicted = heap.set_keep_largest(5)
+                self.assertEqual(15, len(evicted))
+                self.assertEqual(sorted(node.key for node in evicted), [node.key for node in evicted])
+                other = BinomialHeap(lazy=lazy)
+                for key in (3000, 1, 2500):
+                    other.insert(Node(key))
+                heap.meld(other)
+                self.assertEqual(5, len(heap))
+                self.assertEqual(2000, heap.extract_many(3)[2].key)
+            self.assertRaises(ValueError, BinomialHeap, keep_largest=-1)
+            heap = BinomialHeap(keep_largest=2, index=True)
+            heap.offer(1, 'a')
+            heap.offer(2, 'b')
+            self.assertRaises(ValueError, heap.offer, 3, 'b')
+            heap.offer(3, 'c')
+            self.assertEqual({'b', 'c'}, set(heap.index))
+            # topk agrees with heapq on keys, key functions and reverse order
+            keys = [rng.randint(0, 1000) for _ in range(500)]
+            self.assertEqual(heapq.nlargest(10, keys), topk(keys, 10))
+            self.assertEqual(heapq.nsmallest(10, keys), topk(iter(keys), 10, reverse=True))
+            self.assertEqual(sorted(keys, reverse=True), topk(keys, 600))
+            self.assertEqual([], topk(keys, 0))
+            words = ["pear", "fig", "banana", "kiwi", "apple"]
+            self.assertEqual(["banana", "apple"], topk(words, 2, key=len))
+            # Evicting to make room does not count the insert twice
+            heap = BinomialHeap(keep_largest=3)
+            for key in (1, 2, 3):
+                heap.insert(Node(key))
+            stats = heap.enable_stats()
+            for key in (4, 5, 6):
+                heap.insert(Node(key))
+            self.assertEqual(3, stats.calls['insert'])
+            self.assertEqual([4, 5, 6], [node.key for node in heap.drain()])
+        finally:
+            BinomialHeap.debug = False
+
+    # Verify validate accepts real heaps and reports each kind of corruption
+    def test_validate(self):
+        for lazy in (False, True):
+            heap = BinomialHeap(lazy=lazy, index=True)
+            for key in range(13):
+                heap.insert(Node(key, 'item' + str(key)))
+            heap.validate()
+            heap.extract_min()
+            heap.validate()
+        heap.set_lazy(False)
+        # Root list holds degrees 2 and 3, the minimum 1 is the degree 2 root
+        big = heap.tail
+        grandchild = big.child.child
+
+        def reverse_roots(heap):
+            small = heap.head
+            big.sibling = small
+            small.sibling = None
+            heap.head = big
+            heap.tail = small
+
+        # Lazy mode allows any root degree, so only the size bounds the walk
+        def link_back(heap):
+            heap.lazy = True
+            big.sibling = heap.head
+        corruptions = [
+            (lambda: setattr(grandchild, 'key', -1), "Node rank does not match its key."),
+            (lambda: setattr(grandchild, 'parent', big), "Child does not point at its parent."),
+            (lambda: setattr(big, 'degree', 4), "Node degree does not match its children."),
+            (lambda: reverse_roots(heap), "Root list degrees are not strictly increasing."),
+            (lambda: setattr(heap, 'tail', heap.head), "Root list tail is stale."),
+            (lambda: setattr(heap, 'count', 13), "Root list does not match the heap size."),
+            (lambda: setattr(heap, 'min_node', big), "Cached minimum does not match root list."),
+            (lambda: heap.index.pop('item5'), "Item index does not point at the node."),
+            (lambda: link_back(heap), "The heap holds more nodes than its size (or a cycle)."),
+        ]
+        for corrupt, message in corruptions:
+            state = [(node, node.key, node.parent, node.degree, node.sibling)
+                     for node, depth, parent in heap.traverse()]
+            fields = (heap.head, heap.tail, heap.count, heap.min_node, dict(heap.index), heap.lazy)
+            corrupt()
+            with self.assertRaises(RuntimeError) as raised:
+                heap.validate()
+            self.assertEqual(message, str(raised.exception))
+            for node, key, parent, degree, sibling in state:
+                node.key, node.parent, node.degree, node.sibling = key, parent, degree, sibling
+            heap.head, heap.tail, heap.count, heap.min_node, heap.index, heap.lazy = fields
+            heap.validate()
+
+    # Verify snapshots keep their contents while the heap changes under them
+    def test_snapshot(self):
+        rng = random.Random(25)
+        for lazy in (False, True):
+            keys = [rng.randint(0, 500) for _ in range(200)]
+            heap = BinomialHeap(lazy=lazy)
+            nodes = [Node(key, i) for i, key in enumerate(keys)]
+            for node in nodes:
+                heap.insert(node)
+            view = heap.snapshot()
+            self.assertEqual((200, min(keys)), (len(view), view.min()[0]))
+            # One decrease_key copies only the path it relinks
+            heap.decrease_key(nodes[5], -1)
+            self.assertLessEqual(len(view.saved), 2 * 8)
+            later = heap.snapshot()
+            heap.extract_many(30)
+            heap.delete_many(nodes[100:120])
+            heap.decrease_keys([(node, node.key - 50) for node in nodes[150:160]])
+            other = BinomialHeap(lazy=not lazy)
+            for key in range(50):
+                other.insert(Node(key))
+            view_of_other = other.snapshot()
+            heap.meld(other)
+            heap.split(64)
+            for node in heap.drain():
+                pass
+            heap.validate()
+            self.assertEqual(sorted(keys), [key for key, value in view.sorted_view()])
+            self.assertEqual(sorted(keys)[:5], [key for key, value in view.nsmallest(5)])
+            self.assertEqual([], view.nsmallest(-1))
+            self.assertEqual(list(range(50)), [key for key, value in view_of_other.sorted_view()])
+            self.assertEqual(-1, later.min()[0])
+            self.assertEqual(200, len(list(later)))
+            bounds = [100, 250, 400]
+            expected = [0] * 4
+            for key in keys:
+                expected[bisect.bisect_right(bounds, key)] += 1
+            self.assertEqual(expected, view.histogram(bounds))
+            # Closed views stop the copying and can no longer be read
+            view.close()
+            self.assertRaises(ValueError, view.min)
+            with later:
+                pass
+            self.assertRaises(ValueError, list, later)
+            del view_of_other
+            # The next write that copies nodes drops the closed views
+            heap.insert(Node(0))
+            heap.extract_min()
+            self.assertEqual([], heap.views)
+        # A view of an empty heap stays empty
+        with BinomialHeap().snapshot() as view:
+            self.assertEqual((0, None, [0, 0]), (len(view), view.min(), view.histogram([1])))
+
+    # Verify extract_many removes batches in order with one consolidation
+    def test_extract_many(self):
+        BinomialHeap.debug = True
+        try:
+            rng = random.Random(22)
+            for lazy in (False, True):
+                keys = [rng.randint(0, 1000) for _ in range(500)]
+                heap = BinomialHeap(lazy=lazy)
+                for key in keys:
+                    heap.insert(Node(key))
+                keys.sort()
+                taken = []
+                for size in (1, 7, 100, 0, 250, 1000):
+                    batch = heap.extract_many(size)
+                    for node in batch:
+                        self.assertIsNone(node.parent)
+                        self.assertIsNone(node.child)
+                        self.assertIsNone(node.sibling)
+                    taken.extend(node.key for node in batch)
+                    self.assertEqual(keys[:len(taken)], taken)
+                self.assertEqual(keys, taken)
+                self.assertIsNone(heap.head)
+                self.assertIsNone(heap.min())
+        finally:
+            BinomialHeap.debug = False
+
+    # Verify batched decrease_keys keeps heap order, handles and the minimum
+    def test_decrease_keys(self):
+        BinomialHeap.debug = True
+        try:
+            rng = random.Random(31)
+            for trial in range(20):
+                keys = [rng.randint(0, 100) for _ in range(120)]
+                heap, nodes = BinomialHeap.from_iterable(keys)
+                batch = rng.sample(range(120), 40)
+                pairs = [(nodes[i], keys[i] - rng.randint(0, 60)) for i in batch]
+                # Give some nodes equal new keys to exercise ties
+                pairs.extend((nodes[i], -5) for i in rng.sample(sorted(set(range(120)) - set(batch)), 5))
+                heap.decrease_keys(pairs)
+                for node, new_key in pairs:
+                    self.assertEqual(new_key, node.key)
+                for node, depth, parent in heap.traverse():
+                    if parent is not None:
+                        self.assertLessEqual(parent.key, node.key)
+                expected = sorted(node.key for node in nodes)
+                self.assertEqual(expected, [node.key for node in heap.extract_many(200)])
+            # Invalid batches are rejected before anything changes
+            heap, nodes = BinomialHeap.from_iterable([5, 6, 7])
+            self.assertRaises(ValueError, heap.decrease_keys, [(nodes[0], 1), (nodes[1], 9)])
+            self.assertRaises(ValueError, heap.decrease_keys, [(nodes[0], 1), (nodes[0], 0)])
+            self.assertEqual([5, 6, 7], [node.key for node in nodes])
+        finally:
+            BinomialHeap.debug = False
+
+    # Verify delete_many removes exactly the batch with one consolidation
+    def test_delete_many(self):
+        BinomialHeap.debug = True
+        try:
+            rng = random.Random(32)
+            for lazy in (False, True):
+                keys = [rng.randint(0, 1000) for _ in range(300)]
+                heap = BinomialHeap(lazy=lazy)
+                nodes = [Node(key) for key in keys]
+                for node in nodes:
+                    heap.insert(node)
+                survivors = list(nodes)
+                survivors.remove(heap.extract_min())
+                doomed = rng.sample(survivors, 120)
+                heap.delete_many(doomed)
+                for node in doomed:
+                    self.assertIsNone(node.parent)
+                    self.assertIsNone(node.child)
+                expected = sorted(node.key for node in set(survivors) - set(doomed))
+                self.assertEqual(expected, [node.key for node in heap.extract_many(1000)])
+            heap, nodes = BinomialHeap.from_iterable([1, 2])
+            self.assertRaises(ValueError, heap.delete_many, [nodes[0], nodes[0]])
+            heap.delete_many([])
+            self.assertEqual(1, heap.min().key)
+        finally:
+            BinomialHeap.debug = False
+
+    # Verify tuple keys, key functions and max-heap mode
+    def test_key_ordering(self):
+        BinomialHeap.debug = True
+        try:
+            rng = random.Random(41)
+            # Tuple keys such as (priority, timestamp, seq) compare directly
+            keys = [(rng.randint(0, 3), rng.random(), i) for i in range(100)]
+            heap = BinomialHeap()
+            nodes = [Node(key) for key in keys]
+            for node in nodes:
+                heap.insert(node)
+            heap.decrease_key(nodes[50], (-1, 0.0, 50))
+            heap.delete(nodes[10])
+            self.assertEqual((-1, 0.0, 50), heap.min().key)
+            expected = sorted(keys[:10] + keys[11:50] + [(-1, 0.0, 50)] + keys[51:])
+            self.assertEqual(expected, [node.key for node in heap.extract_many(200)])
+            # Max-heap mode with numbers and with strings
+            for keys in ([rng.randint(-50, 50) for _ in range(60)],
+                         ["k" + str(rng.randint(0, 999)) for _ in range(60)]):
+                heap, nodes = BinomialHeap.from_iterable(keys, reverse=True)
+                self.assertEqual(max(keys), heap.min().key)
+                heap.delete(nodes[0])
+                self.assertEqual(sorted(keys[1:], reverse=True),
+                                 [heap.extract_min().key for _ in range(59)])
+            # Mixed numeric key types order in max-heap mode as they do in min-heap mode
+            for keys in ([3, Fraction(7, 2), 1, Fraction(1, 3), 5],
+                         [0.5, True, 2.5, False, 1.0],
+                         [2, 1.5, True, Fraction(5, 2), -0.5]):
+                heap = BinomialHeap.from_iterable(keys, reverse=True)[0]
+                self.assertEqual(sorted(keys, reverse=True), [node.key for node in heap.drain()])
+                heap = BinomialHeap(reverse=True)
+                for key in keys:
+                    heap.insert(Node(key))
+                self.assertEqual(sorted(keys, reverse=True),
+                                 [heap.extract_min().key for _ in range(len(keys))])
+            # Keys that cannot be compared raise TypeError, not AttributeError
+            heap = BinomialHeap(reverse=True)
+            heap.insert(Node(1))
+            self.assertRaises(TypeError, heap.insert, Node("a"))
+            heap = BinomialHeap(reverse=True)
+            low = Node(1)
+            heap.insert(low)
+            heap.insert(Node(5))
+            heap.decrease_key(low, 9)
+            self.assertEqual(low, heap.min())
+            self.assertRaises(ValueError, heap.decrease_key, low, 3)
+            # A key function orders nodes by a derived value
+            heap = BinomialHeap(key=len)
+            for word in ["pear", "fig", "banana", "kiwi"]:
+                heap.insert(Node(word))
+            self.assertEqual("fig", heap.extract_min().key)
+            self.assertEqual(4, len(heap.extract_min().key))
+            # Heaps with different orderings cannot be combined
+            self.assertRaises(ValueError, heap.meld, BinomialHeap())
+            self.assertRaises(ValueError, BinomialHeap().union, BinomialHeap(reverse=True))
+        finally:
+            BinomialHeap.debug = False
+
+    # Verify len, truth value and the root-degree bitmap through every operation
+    def test_size(self):
+        BinomialHeap.debug = True
+        try:
+            rng = random.Random(17)
+
+            def check(heap, expected):
+                self.assertEqual(expected, len(heap))
+                self.assertEqual(expected, len(list(heap.traverse())))
+                self.assertEqual(expected > 0, bool(heap))
+                heap.check_degrees()
+
+            heap = BinomialHeap()
+            check(heap, 0)
+            nodes = [Node(rng.randint(0, 99)) for _ in range(45)]
+            for node in nodes:
+                heap.insert(node)
+            check(heap, 45)
+            # 45 is 101101 in binary, so the roots have degrees 0, 2, 3 and 5
+            self.assertEqual([0, 2, 3, 5], [node.degree for node, depth, parent in heap.traverse()
+                                            if parent is None])
+            self.assertEqual(45, heap.degree_bitmap())
+            popped = heap.extract_min()
+            heap.delete(nodes[1] if nodes[0] is popped else nodes[0])
+            check(heap, 43)
+            other, more = BinomialHeap.from_iterable(range(21))
+            check(other, 21)
+            # 101011 + 10101 = 1000000 in binary: 4 + 3 - 1 = 6 carries
+            self.assertEqual(6, heap.predict_links(other))
+            heap.enable_stats()
+            heap.meld(other)
+            self.assertEqual(6, heap.stats.links)
+            heap.disable_stats()
+            check(heap, 64)
+            check(other, 0)
+            taken = set(heap.extract_many(10))
+            check(heap, 54)
+            heap.delete_many([node for node in more if node not in taken][-4:])
+            check(heap, 50)
+            part = heap.split(20)
+            check(part, 18)
+            check(heap, 32)
+            unite = heap.union(part)
+            check(unite, 50)
+            out = io.BytesIO()
+            unite.save(out)
+            out.seek(0)
+            check(BinomialHeap.load(out), 50)
+            lazy = BinomialHeap(lazy=True)
+            for key in range(9):
+                lazy.insert(Node(key))
+            check(lazy, 9)
+            check(lazy.union(BinomialHeap(lazy=True)), 9)
+            lazy.extract_min()
+            check(lazy, 8)
+            # A corrupted root list is detected
+            unite.head.degree += 1
+            self.assertRaises(RuntimeError, unite.check_degrees)
+        finally:
+            BinomialHeap.debug = False
+
+    # Verify the item index stays in sync through every operation
+    def test_index(self):
+        BinomialHeap.debug = True
+        try:
+            rng = random.Random(29)
+            heap = BinomialHeap(index=True)
+            priority = {}
+            for i in range(60):
+                item = 'task' + str(i)
+                priority[item] = rng.randint(0, 100)
+                heap.insert(Node(priority[item], item))
+            self.assertTrue(heap.contains('task7'))
+            self.assertIn('task7', heap)
+            self.assertNotIn('task99', heap)
+            self.assertIsNone(heap.find('task99'))
+            self.assertRaises(ValueError, heap.insert, Node(1, 'task3'))
+            # Moving priorities both ways keeps the same handle
+            node = heap.find('task10')
+            self.assertIs(node, heap.update_priority('task10', -1))
+            self.assertIs(node, heap.min())
+            self.assertIs(node, heap.update_priority('task10', 500))
+            self.assertIs(node, heap.find('task10'))
+            priority['task10'] = 500
+            self.assertRaises(ValueError, heap.increase_key, node, 3)
+            self.assertEqual('task20', heap.remove('task20').value)
+            del priority['task20']
+            self.assertRaises(KeyError, heap.remove, 'task20')
+            for node in heap.extract_many(5):
+                del priority[node.value]
+            heap.delete_many([heap.find('task30'), heap.find('task31')])
+            del priority['task30'], priority['task31']
+            self.assertEqual(set(priority), set(heap.index))
+            # Meld merges the indexes and rejects duplicate items
+            other = BinomialHeap()
+            other.insert(Node(7, 'extra'))
+            heap.meld(other)
+            priority['extra'] = 7
+            clash = BinomialHeap(index=True)
+            clash.insert(Node(0, 'task40'))
+            self.assertRaises(ValueError, heap.meld, clash)
+            self.assertEqual(1, len(clash))
+            # Union rejects duplicate items before relinking either input
+            for lazy in (False, True):
+                a = BinomialHeap(lazy=lazy, index=True)
+                b = BinomialHeap(lazy=lazy, index=True)
+                for key in range(5):
+                    a.insert(Node(key, 'a' + str(key)))
+                    b.insert(Node(key, 'b' + str(key)))
+                b.insert(Node(9, 'a3'))
+                self.assertRaises(ValueError, a.union, b)
+                a.validate()
+                b.validate()
+                self.assertEqual((5, 6), (len(a), len(b)))
+                b.remove('a3')
+                unite = a.union(b)
+                unite.validate()
+                self.assertEqual(set(a.index) | set(b.index), set(unite.index))
+            part = heap.split(16)
+            self.assertEqual(16, len(part.index))
+            self.assertTrue(set(part.index).isdisjoint(heap.index))
+            heap.meld(part)
+            for node, depth, parent in heap.traverse():
+                self.assertIs(node, heap.index[node.value])
+                self.assertEqual(priority[node.value], node.key)
+            drained = heap.drain()
+            first = next(drained)
+            drained.close()
+            self.assertNotIn(first.value, heap)
+            self.assertEqual(len(priority) - 1, len(heap.index))
+            self.assertRaises(ValueError, BinomialHeap().contains, 'task1')
+            heap.set_index(False)
+            self.assertIsNone(heap.index)
+        finally:
+            BinomialHeap.debug = False
+
+    # Verify the opt-in counters, timing wrappers and callback
+    def test_stats(self):
+        heap = BinomialHeap()
+        self.assertIsNone(heap.stats_snapshot())
+        calls = []
+        heap.enable_stats(lambda op, seconds, source: calls.append((op, source)))
+        nodes = [Node(key) for key in range(8)]
+        for node in nodes:
+            heap.insert(node)
+        # Eight single nodes become one tree of degree 3 with 7 links
+        stats = heap.stats_snapshot()
+        self.assertEqual(7, stats['links'])
+        self.assertEqual(8, stats['calls']['insert'])
+        self.assertEqual([('insert', heap)] * 8, calls)
+        # The node with the largest key is a leaf three levels down
+        heap.decrease_key(nodes[7], -1)
+        stats = heap.stats_snapshot()
+        self.assertEqual((1, 3, 3), (stats['bubble_ups'], stats['bubble_distance'],
+                                     stats['max_bubble_distance']))
+        merged = stats['merge_steps']
+        self.assertEqual(-1, heap.extract_min().key)
+        stats = heap.stats_snapshot()
+        # The root is found at once and its three children merge back
+        self.assertEqual((1, 1), (stats['root_scans'], stats['root_scan_length']))
+        self.assertEqual(merged + 3, stats['merge_steps'])
+        self.assertGreaterEqual(stats['seconds']['extract_min'], 0.0)
+        # Snapshots are copies
+        heap.stats.reset()
+        self.assertEqual(7, stats['links'])
+        self.assertEqual(0, heap.stats_snapshot()['links'])
+        heap.disable_stats()
+        self.assertIsNone(heap.stats)
+        self.assertNotIn('insert', vars(heap))
+        heap.insert(Node(3))
+        self.assertEqual(10, len(calls))
+
     # Verify that deletions are handled properly
     # Relies on decrease_key and extract_min!
     def test_delete(self):
@@ -391,6 +1236,613 @@ class BinomialHeapTest(unittest.TestCase):
         self.assertEqual("", str(heap))
 
 
+# Tests shared by every heap engine, mixed into one test class per engine
+# The engine name is set by each subclass and heaps come from make_heap
+class HeapEngineContract:
+
+    engine = None
+
+    # Turn on the structure checks of the engine under test
+    def setUp(self):
+        ENGINES[self.engine].debug = True
+
+    def tearDown(self):
+        ENGINES[self.engine].debug = False
+
+    # Verify random operations against a plain set model
+    def test_model(self):
+        rng = random.Random(61)
+        heap = make_heap(self.engine)
+        alive = set()
+        for step in range(3000):
+            choice = rng.random()
+            if choice < 0.4 or not alive:
+                node = heap.node_type(rng.randint(0, 200))
+                heap.insert(node)
+                alive.add(node)
+            elif choice < 0.6:
+                node = rng.choice(sorted(alive, key=id))
+                heap.decrease_key(node, node.key - rng.randint(0, 50))
+            elif choice < 0.7:
+                node = rng.choice(sorted(alive, key=id))
+                heap.delete(node)
+                alive.remove(node)
+            else:
+                node = heap.extract_min()
+                self.assertEqual(min(other.key for other in alive), node.key)
+                alive.remove(node)
+            self.assertEqual(len(alive), len(heap))
+        expected = sorted(node.key for node in alive)
+        self.assertEqual(expected, [heap.extract_min().key for _ in range(len(alive))])
+        self.assertFalse(heap)
+        self.assertIsNone(heap.min())
+        self.assertRaises(Exception, heap.extract_min)
+
+    # Verify handles keep their identity, key and value through every operation
+    def test_handles(self):
+        heap, nodes = ENGINES[self.engine].from_iterable([(k, str(k)) for k in range(40)], pairs=True)
+        self.assertEqual(40, len(heap))
+        heap.decrease_key(nodes[30], -1)
+        self.assertIs(nodes[30], heap.min())
+        heap.delete(nodes[5])
+        self.assertRaises(ValueError, heap.decrease_key, nodes[10], 11)
+        popped = [heap.extract_min() for _ in range(5)]
+        self.assertEqual([nodes[30], nodes[0], nodes[1], nodes[2], nodes[3]], popped)
+        self.assertEqual(['30', '0', '1', '2', '3'], [node.value for node in popped])
+        # Every node left is reachable exactly once, in heap order
+        seen = set()
+        for node, depth, parent in heap.traverse():
+            self.assertNotIn(node, seen)
+            seen.add(node)
+            if parent is not None:
+                self.assertLessEqual(parent.key, node.key)
+        self.assertEqual(set(nodes) - set(popped) - {nodes[5]}, seen)
+
+    # Verify sorted_view leaves the heap alone and drain can stop early
+    def test_drain(self):
+        rng = random.Random(62)
+        keys = [rng.randint(0, 100) for _ in range(200)]
+        heap, nodes = ENGINES[self.engine].from_iterable(keys)
+        heap.decrease_key(nodes[7], -5)
+        keys[7] = -5
+        self.assertEqual(sorted(keys), [node.key for node in heap.sorted_view()])
+        self.assertEqual(200, len(heap))
+        drained = iter(heap)
+        self.assertEqual(sorted(keys)[:50], [next(drained).key for _ in range(50)])
+        drained.close()
+        heap.check_min()
+        self.assertEqual(150, len(heap))
+        self.assertEqual(sorted(keys)[50:], [node.key for node in heap.drain()])
+        self.assertEqual(0, len(heap))
+
+    # Verify meld and union move every node and reject mismatched heaps
+    def test_meld_union(self):
+        heap, nodes = ENGINES[self.engine].from_iterable([9, 4, 7])
+        other, more = ENGINES[self.engine].from_iterable([8, 1, 6, 2])
+        heap.meld(other)
+        self.assertEqual((7, 0), (len(heap), len(other)))
+        self.assertIsNone(other.min())
+        self.assertEqual(1, heap.min().key)
+        self.assertRaises(ValueError, heap.meld, heap)
+        self.assertRaises(ValueError, heap.meld, make_heap(self.engine, reverse=True))
+        foreign = 'pairing' if self.engine != 'pairing' else 'binomial'
+        self.assertRaises(TypeError, heap.meld, make_heap(foreign))
+        unite = heap.union(ENGINES[self.engine].from_iterable([0, 5])[0])
+        self.assertEqual([0, 1, 2, 4, 5, 6, 7, 8, 9], [node.key for node in unite.extract_many(20)])
+
+    # Verify key functions, max-heap mode, batch operations and stats
+    def test_ordering_and_batches(self):
+        words = ["pear", "fig", "banana", "kiwi", "apple"]
+        heap = make_heap(self.engine, key=len, reverse=True)
+        for word in words:
+            heap.insert(heap.node_type(word))
+        self.assertEqual("banana", heap.extract_min().key)
+        heap, nodes = ENGINES[self.engine].from_iterable(range(50), reverse=True)
+        self.assertEqual(49, heap.min().key)
+        heap.decrease_keys([(nodes[3], 100), (nodes[4], 60)])
+        self.assertEqual([100, 60, 49], [node.key for node in heap.nsmallest(3)])
+        # A negative count takes nothing on every engine
+        self.assertEqual([], heap.nsmallest(-1))
+        self.assertEqual([], heap.extract_many(-1))
+        self.assertEqual(50, len(heap))
+        heap.delete_many([nodes[49], nodes[0], nodes[20]])
+        self.assertEqual([100, 60, 48, 47], [node.key for node in heap.extract_many(4)])
+        self.assertEqual(43, len(heap))
+        self.assertRaises(ValueError, heap.delete_many, [nodes[1], nodes[1]])
+        stats = heap.enable_stats()
+        heap.extract_min()
+        self.assertEqual(1, stats.calls['extract_min'])
+        heap.disable_stats()
+
+    # Verify seeded random operations agree with the reference model
+    def test_fuzz(self):
+        fuzz(self.engine, seed=5800, operations=3000, check_every=10)
+        fuzz(self.engine, seed=5801, operations=1000, check_every=10, reverse=True, key_range=20)
+
+
+# Test class running the shared engine tests on the binomial heap
+class BinomialEngineTest(HeapEngineContract, unittest.TestCase):
+
+    engine = 'binomial'
+
+
+# Test class focusing on the Fibonacci heap engine
+class FibonacciHeapTest(HeapEngineContract, unittest.TestCase):
+
+    engine = 'fibonacci'
+
+    # Verify a second cut below a marked node cuts the node as well
+    def test_cascading_cut(self):
+        heap, nodes = FibonacciHeap.from_iterable(range(9))
+        heap.extract_min()
+        # One tree of degree 3 rooted at 1, whose child 5 has children 6 and 7
+        self.assertIs(nodes[5], nodes[7].parent)
+        heap.decrease_key(nodes[7], -1)
+        self.assertTrue(nodes[5].mark)
+        heap.decrease_key(nodes[6], -2)
+        self.assertIsNone(nodes[5].parent)
+        self.assertFalse(nodes[5].mark)
+        self.assertEqual(-2, heap.min().key)
+
+
+# Test class focusing on the pairing heap engine and the engine factory
+class PairingHeapTest(HeapEngineContract, unittest.TestCase):
+
+    engine = 'pairing'
+
+    # Verify the factory resolves engine and workload names
+    def test_factory(self):
+        self.assertIsInstance(make_heap(), BinomialHeap)
+        self.assertIsInstance(make_heap('pairing'), PairingHeap)
+        self.assertIsInstance(make_heap('decrease_key'), ENGINES[WORKLOADS['decrease_key']])
+        self.assertTrue(make_heap('binomial', lazy=True).lazy)
+        self.assertRaises(ValueError, make_heap, 'splay')
+
+
+# Test class focusing on the graph routines
+class GraphsTest(unittest.TestCase):
+
+    # Function to build a random connected undirected graph
+    #  n: int, the number of vertices
+    #  rng: Random, the seeded generator
+    # Returns list of lists of (vertex, weight) tuples
+    def random_graph(self, n: int, rng: random.Random) -> list:
+        graph = [[] for _ in range(n)]
+        edges = [(v, rng.randrange(v), rng.randint(1, 20)) for v in range(1, n)]
+        edges += [(rng.randrange(n), rng.randrange(n), rng.randint(1, 20)) for _ in range(3 * n)]
+        for u, v, weight in edges:
+            graph[u].append((v, weight))
+            graph[v].append((u, weight))
+        return graph
+
+    # Function to compute reference distances with Bellman-Ford
+    #  graph: list of lists of (vertex, weight) tuples
+    #  source: int, the start vertex
+    # Returns list, the distance of every vertex
+    def reference(self, graph: list, source: int) -> list:
+        distance = [inf] * len(graph)
+        distance[source] = 0
+        changed = True
+        while changed:
+            changed = False
+            for u in range(len(graph)):
+                for v, weight in graph[u]:
+                    if distance[u] + weight < distance[v]:
+                        distance[v] = distance[u] + weight
+                        changed = True
+        return distance
+
+    # Verify Dijkstra, shortest_path and A* on every engine and format
+    def test_shortest_paths(self):
+        rng = random.Random(71)
+        graph = self.random_graph(120, rng)
+        expected = self.reference(graph, 0)
+        # Cheapest weight between each pair of adjacent vertices
+        cheapest = {}
+        for u in range(120):
+            for v, weight in graph[u]:
+                cheapest[(u, v)] = min(weight, cheapest.get((u, v), inf))
+        for engine in ENGINES:
+            for form in (graph, to_csr(graph), dict(enumerate(graph))):
+                distance, previous = dijkstra(form, 0, engine=engine)
+                self.assertEqual(expected, [distance[v] for v in range(120)])
+                length, path = shortest_path(form, 0, 77, engine)
+                self.assertEqual(expected[77], length)
+                self.assertEqual((0, 77), (path[0], path[-1]))
+                self.assertEqual(length, sum(cheapest[(path[i], path[i + 1])]
+                                             for i in range(len(path) - 1)))
+                self.assertEqual((length, path), astar(form, 0, 77, lambda v: 0, engine))
+        # Early exit settles only part of the graph
+        distance, previous = dijkstra(graph, 0, target=0)
+        self.assertEqual({0: 0}, distance)
+        self.assertEqual((inf, []), shortest_path([[], []], 0, 1))
+        self.assertRaises(ValueError, dijkstra, [[(1, -1)], []], 0)
+
+    # Verify A* on a grid with an admissible (Manhattan) heuristic
+    def test_astar_grid(self):
+        size = 30
+        rng = random.Random(72)
+        blocked = set((rng.randrange(size), rng.randrange(size)) for _ in range(200)) - {(0, 0), (29, 29)}
+        grid = {}
+        for x in range(size):
+            for y in range(size):
+                grid[(x, y)] = [((x + dx, y + dy), 1) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                                if 0 <= x + dx < size and 0 <= y + dy < size
+                                and (x + dx, y + dy) not in blocked]
+        goal = (29, 29)
+        expected = shortest_path(grid, (0, 0), goal)[0]
+        length, path = astar(grid, (0, 0), goal, lambda v: abs(v[0] - goal[0]) + abs(v[1] - goal[1]))
+        self.assertEqual(expected, length)
+        self.assertEqual(length, len(path) - 1)
+
+    # Verify Prim finds a spanning tree as light as Kruskal's
+    def test_prim(self):
+        rng = random.Random(73)
+        graph = self.random_graph(150, rng)
+        # Kruskal with union-find as the reference
+        leader = list(range(150))
+
+        def find(v):
+            while leader[v] != v:
+                leader[v] = leader[leader[v]]
+                v = leader[v]
+            return v
+        expected = 0
+        for weight, u, v in sorted((w, u, v) for u in range(150) for v, w in graph[u]):
+            if find(u) != find(v):
+                leader[find(u)] = find(v)
+                expected += weight
+        for engine in ENGINES:
+            total, tree = prim(to_csr(graph), 0, engine)
+            self.assertEqual(expected, total)
+            self.assertEqual(149, len(tree))
+            self.assertEqual(150, len(set(v for u, v, w in tree) | {0}))
+
+
+# Test class focusing on the deadline scheduler
+class SchedulerTest(unittest.TestCase):
+
+    # Verify due jobs come out in order with cancels and reschedules applied
+    def test_pop_due(self):
+        BinomialHeap.debug = True
+        try:
+            rng = random.Random(81)
+            for lazy in (False, True):
+                scheduler = Scheduler(lazy=lazy, min_compact=8)
+                handles = [scheduler.schedule(rng.randint(0, 1000), i) for i in range(300)]
+                expected = {handle.job: handle.at for handle in handles}
+                for handle in rng.sample(handles, 120):
+                    self.assertTrue(scheduler.cancel(handle))
+                    self.assertFalse(scheduler.cancel(handle))
+                    del expected[handle.job]
+                for handle in rng.sample(handles, 100):
+                    if handle.job in expected:
+                        at = handle.at + rng.randint(-300, 300)
+                        scheduler.reschedule(handle, at)
+                        expected[handle.job] = at
+                    else:
+                        self.assertRaises(ValueError, scheduler.reschedule, handle, 5)
+                self.assertEqual(len(expected), len(scheduler))
+                self.assertEqual(min(expected.values()), scheduler.next_deadline())
+                popped = []
+                for now in range(-300, 1400, 50):
+                    due = scheduler.pop_due(now)
+                    self.assertTrue(all(handle.at <= now for handle in due))
+                    self.assertEqual(sorted(handle.at for handle in due), [handle.at for handle in due])
+                    popped.extend(due)
+                    if scheduler.next_deadline() is not None:
+                        self.assertGreater(scheduler.next_deadline(), now)
+                self.assertEqual(expected, {handle.job: handle.at for handle in popped})
+                self.assertEqual(0, len(scheduler))
+                self.assertIsNone(scheduler.next_deadline())
+                self.assertFalse(scheduler.cancel(popped[0]))
+        finally:
+            BinomialHeap.debug = False
+
+    # Verify tombstones are compacted once they dominate the heap
+    def test_compaction(self):
+        scheduler = Scheduler(min_compact=10)
+        handles = [scheduler.schedule(i, i) for i in range(40)]
+        for handle in handles[:20]:
+            scheduler.cancel(handle)
+        self.assertEqual(20, len(scheduler.dead))
+        # The 21st cancel pushes tombstones past half of the heap
+        scheduler.cancel(handles[20])
+        self.assertEqual(0, len(scheduler.dead))
+        self.assertEqual(19, len(scheduler.heap))
+        for handle in handles[21:26]:
+            scheduler.reschedule(handle, 100)
+        self.assertEqual(5, len(scheduler.dead))
+        self.assertEqual(5, scheduler.compact())
+        self.assertEqual(list(range(26, 40)) + [100] * 5,
+                         [handle.at for handle in scheduler.pop_due(100)])
+
+
+# Test class focusing on the array-backed binomial heap
+class CompactBinomialHeapTest(unittest.TestCase):
+
+    # Verify the structure matches the object-based heap for the same inserts
+    def test_insert_matches_node_heap(self):
+        keys = [8, 3, 11, 6, 9, 2, 14, 5, -1, 7]
+        heap = BinomialHeap()
+        compact = CompactBinomialHeap()
+        for key in keys:
+            heap.insert(Node(float(key)))
+            compact.insert(key)
+        self.assertEqual(str(heap), str(compact))
+        self.assertEqual(-1, compact.key[compact.min()])
+        self.assertEqual(len(keys), compact.size)
+
+    # Verify extract_min order, decrease_key handles, delete and handle reuse
+    def test_operations(self):
+        rng = random.Random(5800)
+        keys = [rng.randint(0, 1000) for _ in range(200)]
+        compact = CompactBinomialHeap()
+        handles = [compact.insert(key) for key in keys]
+        # Handles keep referring to their own keys through decrease_key
+        compact.decrease_key(handles[150], -5)
+        self.assertEqual(-5, compact.key[handles[150]])
+        self.assertEqual(handles[150], compact.min())
+        compact.delete(handles[10])
+        expected = sorted(keys[:10] + keys[11:150] + [-5] + keys[151:])
+        self.assertEqual(len(expected), compact.size)
+        extracted = [compact.key[compact.extract_min()] for _ in range(50)]
+        self.assertEqual(expected[:50], extracted)
+        # Released handles are reused before the columns grow
+        columns = len(compact.key)
+        compact.insert(0)
+        self.assertEqual(columns, len(compact.key))
+        remaining = []
+        while compact.min() != NIL:
+            remaining.append(compact.key[compact.extract_min()])
+        self.assertEqual(sorted(expected[50:] + [0]), remaining)
+        self.assertEqual("", str(compact))
+        self.assertRaises(Exception, compact.extract_min)
+
+
+# Test class focusing on the thread-safe heap
+class ConcurrentBinomialHeapTest(unittest.TestCase):
+
+    # Verify the basic operations behave like BinomialHeap
+    def test_operations(self):
+        heap = ConcurrentBinomialHeap()
+        self.assertIsNone(heap.min())
+        self.assertRaises(queue.Empty, heap.get, 0.01)
+        nodes = [heap.put(key, str(key)) for key in [7, 3, 9, 5]]
+        self.assertEqual(3, heap.min().key)
+        heap.decrease_key(nodes[2], 1)
+        heap.delete(nodes[1])
+        self.assertEqual("9", heap.extract_min().value)
+        other = ConcurrentBinomialHeap()
+        other.put(4)
+        unite = heap.union(other)
+        self.assertIsNone(heap.min())
+        self.assertEqual([4, 5, 7], [unite.get(0).key for _ in range(3)])
+        self.assertRaises(ValueError, unite.meld, unite)
+
+    # Verify buffers of exited producer threads are dropped once flushed
+    def test_short_lived_producers(self):
+        heap = ConcurrentBinomialHeap()
+        for batch in range(4):
+            threads = [threading.Thread(target=heap.put, args=(batch * 50 + key,))
+                       for key in range(50)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            # Every insert is kept, then the emptied buffers go
+            self.assertEqual(50 * (batch + 1), len(heap))
+            self.assertEqual(0, heap.min().key)
+            self.assertEqual([], heap.buffers)
+        heap.put(-1)
+        self.assertEqual(1, len(heap.buffers))
+        self.assertEqual(-1, heap.extract_min().key)
+        self.assertEqual(1, len(heap.buffers))
+        self.assertEqual(list(range(200)), [heap.extract_min().key for _ in range(200)])
+
+    # Verify readers see consistent snapshots while a writer keeps changing the heap
+    def test_snapshot_readers(self):
+        heap = ConcurrentBinomialHeap()
+        nodes = set(heap.put(key) for key in range(1000))
+        done = threading.Event()
+        errors = []
+
+        def writer():
+            rng = random.Random(26)
+            try:
+                for _ in range(2000):
+                    nodes.add(heap.put(rng.randint(0, 5000)))
+                    node = rng.choice(list(nodes)[-100:])
+                    heap.decrease_key(node, node.key - rng.randint(0, 100))
+                    if rng.random() < 0.5:
+                        nodes.discard(heap.extract_min())
+            finally:
+                done.set()
+
+        def reader():
+            while True:
+                with heap.snapshot() as view:
+                    keys = [key for key, value in view.sorted_view()]
+                    if len(keys) != len(view) or keys != sorted(keys):
+                        errors.append(len(keys))
+                if done.is_set():
+                    break
+
+        threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        heap.put(0)
+        heap.extract_min()
+        self.assertEqual([], heap.heap.views)
+
+    # Verify producers and consumers on many threads lose and repeat nothing
+    # and leave a heap whose structure is still valid
+    def test_stress(self):
+        heap = ConcurrentBinomialHeap()
+        producers = 8
+        per_producer = 1500
+        consumed = []
+        consumed_lock = threading.Lock()
+
+        def produce(seed, decrease):
+            rng = random.Random(seed)
+            handles = []
+            for i in range(per_producer):
+                handles.append(heap.put(rng.randint(0, 10 ** 6), (seed, i)))
+                # Reprioritize nodes while no consumer can remove them
+                if decrease and i % 10 == 9:
+                    node = handles[rng.randrange(len(handles))]
+                    heap.decrease_key(node, node.key - rng.randint(0, 1000))
+
+        def consume():
+            local = []
+            while True:
+                try:
+                    node = heap.get(timeout=0.5)
+                except queue.Empty:
+                    break
+                local.append(node.value)
+            with consumed_lock:
+                consumed.extend(local)
+
+        def run(threads):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        # Phase 1: concurrent inserts and decrease_key, then check the structure
+        run([threading.Thread(target=produce, args=(seed, True)) for seed in range(producers)])
+        heap.min()
+        for node, depth, parent in heap.heap.traverse():
+            if parent is not None:
+                self.assertLessEqual(parent.key, node.key)
+        heap.heap.check_min()
+        self.assertEqual(producers * per_producer, len(list(heap.heap.traverse())))
+        self.assertEqual(producers * per_producer, len(heap))
+        # Phase 2: consumers drain while producers keep inserting
+        run([threading.Thread(target=produce, args=(seed, False))
+             for seed in range(producers, 2 * producers)] +
+            [threading.Thread(target=consume) for _ in range(4)])
+        self.assertEqual(2 * producers * per_producer, len(consumed))
+        self.assertEqual(2 * producers * per_producer, len(set(consumed)))
+        self.assertIsNone(heap.min())
+
+
+# Test class focusing on the asyncio queue
+class HeapQueueTest(unittest.TestCase):
+
+    # Verify ordering, reprioritize and remove through handles
+    def test_handles(self):
+        async def scenario():
+            q = HeapQueue()
+            handles = {key: q.put_nowait(key, "job" + str(key)) for key in [30, 10, 20, 40]}
+            q.reprioritize(handles[40], 5)
+            q.reprioritize(handles[10], 35)
+            q.remove(handles[20])
+            self.assertEqual(3, q.qsize())
+            order = [(await q.get()).value for _ in range(3)]
+            self.assertEqual(["job40", "job30", "job10"], order)
+            self.assertTrue(q.empty())
+            self.assertRaises(asyncio.QueueEmpty, q.get_nowait)
+            for _ in range(3):
+                q.task_done()
+            await asyncio.wait_for(q.join(), 1)
+        asyncio.run(scenario())
+
+    # Verify handles already taken or removed are rejected without harm
+    def test_stale_handles(self):
+        async def scenario():
+            q = HeapQueue()
+            first = q.put_nowait(1)
+            second = q.put_nowait(2)
+            removed = q.put_nowait(3)
+            q.remove(removed)
+            taken = await q.get()
+            self.assertIs(first, taken)
+            for handle in (taken, removed, Node(0)):
+                self.assertRaises(ValueError, q.reprioritize, handle, 0)
+                self.assertRaises(ValueError, q.remove, handle)
+            # The queue is intact and still serves the remaining entry
+            self.assertEqual(1, q.qsize())
+            q.reprioritize(second, 0)
+            self.assertIs(second, await q.get())
+            self.assertTrue(q.empty())
+        asyncio.run(scenario())
+
+    # Verify maxsize backpressure and that cancelled waiters lose nothing
+    def test_waiters(self):
+        async def scenario():
+            q = HeapQueue(maxsize=2)
+            q.put_nowait(2)
+            q.put_nowait(1)
+            self.assertTrue(q.full())
+            self.assertRaises(asyncio.QueueFull, q.put_nowait, 3)
+            blocked = asyncio.ensure_future(q.put(0))
+            await asyncio.sleep(0)
+            self.assertFalse(blocked.done())
+            self.assertEqual(1, (await q.get()).key)
+            handle = await asyncio.wait_for(blocked, 1)
+            self.assertEqual(0, handle.key)
+            self.assertEqual([0, 2], [(await q.get()).key for _ in range(2)])
+            # A getter cancelled right after being woken passes the entry on
+            first = asyncio.ensure_future(q.get())
+            second = asyncio.ensure_future(q.get())
+            await asyncio.sleep(0)
+            q.put_nowait(7)
+            first.cancel()
+            node = await asyncio.wait_for(second, 1)
+            self.assertEqual(7, node.key)
+            self.assertTrue(first.cancelled())
+            # A getter that times out leaves the queue usable
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(q.get(), 0.01)
+            q.put_nowait(8)
+            self.assertEqual(8, (await q.get()).key)
+        asyncio.run(scenario())
+
+
+# Test class focusing on the multi-process sharded heap
+class ShardedHeapTest(unittest.TestCase):
+
+    # Verify keys come back in order across shards, including late inserts
+    def test_order(self):
+        rng = random.Random(51)
+        keys = [rng.random() for _ in range(5000)]
+        with ShardedHeap(3, batch=64, capacity=1024) as heap:
+            for key in keys:
+                heap.insert(key)
+            self.assertEqual(5000, len(heap))
+            self.assertEqual(min(keys), heap.min())
+            first = heap.extract_many(700)
+            self.assertEqual(sorted(keys)[:700], first)
+            late = [key / 100 for key in keys[:300]]
+            for key in late:
+                heap.insert(key)
+            self.assertEqual(min(late), heap.extract_min())
+            rest = heap.extract_many(10 ** 6)
+            self.assertEqual(sorted(sorted(keys)[700:] + late)[1:], rest)
+            self.assertEqual(0, len(heap))
+            self.assertRaises(Exception, heap.extract_min)
+
+    # Verify a drained shard adopts trees from the largest shard
+    def test_rebalance(self):
+        with ShardedHeap(2, batch=16, capacity=4096) as heap:
+            keys = []
+            # Shards are filled in turn, so the first shard gets every small key
+            for i in range(2000):
+                key = float(i if i % 2 == 0 else 10 ** 6 + i)
+                keys.append(key)
+                heap.insert(key)
+            result = heap.extract_many(1100)
+            self.assertEqual(sorted(keys)[:1100], result)
+            self.assertTrue(all(shard.size > 0 for shard in heap.shards))
+            self.assertEqual(sorted(keys)[1100:], heap.extract_many(5000))
+
+
 def main():
     unittest.main(verbosity=3)
 
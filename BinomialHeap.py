@@ -1,15 +1,705 @@
 # George Dunnery - CS 5800
 from Node import *
-from math import inf
+from array import array
+from itertools import islice
+import bisect
+import heapq
+import mmap
+import numbers
+import pickle
+import struct
+import sys
+import time
+import weakref
+
+# Binary snapshot layout used by save and load (all integers little endian)
+# Header: magic, version, key code, flags, node count, pre-order index of the min root
+SNAPSHOT_MAGIC = b'BNHP'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<4sHcBQQ')
+# Flag bits stored in the header
+SNAPSHOT_LAZY = 1
+SNAPSHOT_VALUES = 2
+SNAPSHOT_REVERSE = 4
+
+
+# Class to invert the ordering of any key for max-heap mode
+# Real number keys are negated instead, which is faster to compare and lets
+# mixed numeric types (int, float, bool, Fraction, ...) compare with each other
+class ReverseRank:
+
+    __slots__ = ('key',)
+
+    # Constructs a reversed rank around a key
+    #  key: any, a key that supports <
+    def __init__(self, key):
+        self.key = key
+
+    # Comparisons with anything but a ReverseRank return NotImplemented, so
+    # mixing reversed keys with negated numbers raises a TypeError
+    def __lt__(self, other: 'ReverseRank') -> bool:
+        if type(other) is not ReverseRank:
+            return NotImplemented
+        return other.key < self.key
+
+    def __gt__(self, other: 'ReverseRank') -> bool:
+        if type(other) is not ReverseRank:
+            return NotImplemented
+        return self.key < other.key
+
+    def __le__(self, other: 'ReverseRank') -> bool:
+        if type(other) is not ReverseRank:
+            return NotImplemented
+        return not self.key < other.key
+
+    def __ge__(self, other: 'ReverseRank') -> bool:
+        if type(other) is not ReverseRank:
+            return NotImplemented
+        return not other.key < self.key
+
+    def __eq__(self, other: 'ReverseRank') -> bool:
+        if type(other) is not ReverseRank:
+            return NotImplemented
+        return self.key == other.key
+
+    __hash__ = None
+
+
+# Function to reverse the order of a key for max-heap mode
+#  key: any, the key to reverse
+# Returns the negated number for real number keys, or a ReverseRank otherwise
+def reverse_rank(key):
+    # Exact int and float checks first, they are the common case and cheaper
+    # than the isinstance check that covers the other real number types
+    if type(key) is int or type(key) is float or isinstance(key, numbers.Real):
+        return -key
+    return ReverseRank(key)
+
+
+# Function to build the function that maps a key to the rank the heap compares
+#  key: function of one argument or None, extracts the comparison key
+#  reverse: bool, whether larger keys come first (max-heap mode)
+# Returns a function, or None when keys are compared directly (the fast path)
+def make_ranker(key=None, reverse: bool = False):
+    if key is None:
+        return reverse_rank if reverse else None
+    if reverse:
+        return lambda item: reverse_rank(key(item))
+    return key
+
+
+# Function to count the nodes in a sibling list
+# Only called by instrumented heaps, so the hot paths keep no counters
+#  node: Node, the first node of the list (or None)
+#  stop: Node or None, count up to and including this node instead
+# Returns int, the number of nodes counted
+def chain_length(node, stop=None) -> int:
+    length = 0
+    while node is not None:
+        length += 1
+        if node is stop:
+            break
+        node = node.sibling
+    return length
+
+
+# Function to sort keys with a binomial heap
+# Builds the heap bottom-up in linear time, then drains it
+#  iterable: iterable of keys
+#  key, reverse: ordering options, as for sorted
+# Returns list, the keys in sorted order
+def heapsort(iterable, key=None, reverse: bool = False) -> list:
+    heap = BinomialHeap.from_iterable(iterable, key=key, reverse=reverse)[0]
+    return [node.key for node in heap.drain()]
+
+
+# Function to find the k largest keys of a stream, the intended entry point
+# to the keep_largest mode of BinomialHeap. Memory stays O(k): once the heap
+# is full, most keys are rejected by one comparison with the smallest key
+# kept, before any node is allocated
+#  iterable: iterable of keys
+#  k: int, the number of keys to keep
+#  key, reverse: ordering options, as for heapq.nlargest (reverse keeps the k smallest)
+# Returns list, the k largest keys, largest first
+def topk(iterable, k: int, key=None, reverse: bool = False) -> list:
+    if k <= 0:
+        return []
+    heap = BinomialHeap(key=key, reverse=reverse, keep_largest=k)
+    offer = heap.offer
+    for item in iterable:
+        offer(item)
+    result = [node.key for node in heap.drain()]
+    result.reverse()
+    return result
+
+
+# Operations that enable_stats times with a wrapper on the heap instance
+TIMED_OPERATIONS = ('insert', 'extract_min', 'decrease_key', 'delete', 'meld', 'union',
+                    'extract_many', 'delete_many', 'decrease_keys')
+
+
+# Class to count the structural work done by an instrumented heap
+class HeapStats:
+
+    __slots__ = ('links', 'merge_steps', 'root_scans', 'root_scan_length', 'max_root_scan',
+                 'bubble_ups', 'bubble_distance', 'max_bubble_distance', 'calls', 'seconds')
+
+    # Constructs a set of counters, all zero
+    def __init__(self):
+        self.reset()
+
+    # Function to set every counter back to zero
+    # Returns nothing
+    def reset(self) -> None:
+        # Number of tree_link calls
+        self.links = 0
+        # Number of roots placed while merging root lists
+        self.merge_steps = 0
+        # Number of root list scans, their total and longest length
+        self.root_scans = 0
+        self.root_scan_length = 0
+        self.max_root_scan = 0
+        # Number of decrease_key bubble-ups, their total and longest distance in levels
+        self.bubble_ups = 0
+        self.bubble_distance = 0
+        self.max_bubble_distance = 0
+        # Calls and wall time in seconds per operation name
+        self.calls = {}
+        self.seconds = {}
+
+    # Function to record one root list scan
+    #  length: int, the number of roots visited
+    # Returns nothing
+    def scan(self, length: int) -> None:
+        self.root_scans += 1
+        self.root_scan_length += length
+        if length > self.max_root_scan:
+            self.max_root_scan = length
+
+    # Function to record how far one node moved up in decrease_key
+    #  distance: int, the number of levels moved
+    # Returns nothing
+    def bubble(self, distance: int) -> None:
+        self.bubble_ups += 1
+        self.bubble_distance += distance
+        if distance > self.max_bubble_distance:
+            self.max_bubble_distance = distance
+
+    # Function to record one timed operation
+    #  op: str, the operation name
+    #  seconds: float, the wall time of the call
+    # Returns nothing
+    def record(self, op: str, seconds: float) -> None:
+        self.calls[op] = self.calls.get(op, 0) + 1
+        self.seconds[op] = self.seconds.get(op, 0.0) + seconds
+
+    # Function to copy the counters, safe to keep while the heap changes
+    # Returns dict, every counter by name
+    def snapshot(self) -> dict:
+        result = {name: getattr(self, name) for name in self.__slots__}
+        result['calls'] = dict(self.calls)
+        result['seconds'] = dict(self.seconds)
+        return result
+
+
+# Class to represent a read-only view of a BinomialHeap at one point in time
+# The view shares every node with the live heap. While it is open, the heap
+# copies the fields of each node into the view just before it changes them
+# (copy-on-write), so only the paths touched by writers are copied and
+# readers never block writers. A view is closed by close(), at the end of a
+# with block, or when it is garbage collected. Only writers change the list
+# of views of a heap, they drop closed views the next time they copy nodes
+class HeapView:
+
+    __slots__ = ('head', 'min_node', 'count', 'saved', 'finalizer', '__weakref__')
+
+    # Constructs an open view of a heap, in O(1)
+    #  heap: BinomialHeap, the heap to view (not in the middle of a change)
+    def __init__(self, heap: 'BinomialHeap'):
+        self.head = heap.head
+        self.min_node = heap.min_node
+        self.count = heap.count
+        # Fields of every node changed since the view was taken, see fields
+        self.saved = {}
+        # Alive until the view is closed, writers test it before copying
+        self.finalizer = weakref.finalize(self, self.saved.clear)
+        heap.views = [entry for entry in heap.views if entry[1].alive] + [(self.saved, self.finalizer)]
+
+    # Function to stop tracking changes, the view cannot be read afterwards
+    # Returns nothing
+    def close(self) -> None:
+        self.finalizer()
+
+    # Defines entering a with block, which returns the view itself
+    def __enter__(self) -> 'HeapView':
+        return self
+
+    # Defines leaving a with block, which closes the view
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Defines the number of nodes in the heap when the view was taken
+    def __len__(self) -> int:
+        return self.count
+
+    # Auxiliary function to every reader
+    # Function to read a node as it was when the view was taken
+    # The live fields are read before the copy is looked up: a writer copies a
+    # node before changing it, so if no copy exists yet the live fields were
+    # still the original ones
+    #  node: Node, a node reachable from the view
+    # Returns tuple (key, value, rank, child, sibling)
+    def fields(self, node: 'Node') -> tuple:
+        if not self.finalizer.alive:
+            raise ValueError("The view is closed.")
+        current = (node.key, node.value, node.rank, node.child, node.sibling)
+        return self.saved.get(node, current)
+
+    # Function to get the minimum when the view was taken
+    # Returns tuple (key, value) of the minimum, or None when the heap was empty
+    def min(self) -> tuple or None:
+        if self.min_node is None:
+            return None
+        return self.fields(self.min_node)[:2]
+
+    # Defines iteration over the view, in no particular order
+    # Yields tuple (key, value) of every node
+    def __iter__(self):
+        stack = [] if self.head is None else [self.head]
+        while stack:
+            key, value, rank, child, sibling = self.fields(stack.pop())
+            yield key, value
+            if sibling is not None:
+                stack.append(sibling)
+            if child is not None:
+                stack.append(child)
+
+    # Function to walk the view in ascending key order, see BinomialHeap.sorted_view
+    # Yields tuple (key, value) of every node in ascending key order
+    def sorted_view(self):
+        count = 0
+        frontier = []
+        node = self.head
+        while node is not None:
+            key, value, rank, child, sibling = self.fields(node)
+            frontier.append((rank, count, node))
+            count += 1
+            node = sibling
+        heapq.heapify(frontier)
+        while frontier:
+            key, value, rank, child, sibling = self.fields(heapq.heappop(frontier)[2])
+            while child is not None:
+                fields = self.fields(child)
+                heapq.heappush(frontier, (fields[2], count, child))
+                count += 1
+                child = fields[4]
+            yield key, value
+
+    # Function to get the k smallest keys when the view was taken
+    #  k: int, the number of items (0 or less gives an empty list)
+    # Returns list of (key, value) tuples in ascending key order
+    def nsmallest(self, k: int) -> list:
+        return list(islice(self.sorted_view(), max(k, 0)))
+
+    # Function to count the keys that fall between consecutive bounds
+    # Bucket 0 holds keys below bounds[0], bucket i keys from bounds[i - 1] up
+    # to (not including) bounds[i], and the last bucket keys from bounds[-1] up.
+    # Keys are compared directly, ignoring any key function or max-heap mode
+    #  bounds: sorted list of keys, the bucket edges
+    # Returns list of int, len(bounds) + 1 counts
+    def histogram(self, bounds: list) -> list:
+        counts = [0] * (len(bounds) + 1)
+        for key, value in self:
+            counts[bisect.bisect_right(bounds, key)] += 1
+        return counts
 
 
 # Class to represent a binomial heap
 class BinomialHeap:
 
+    # When True, every mutating operation verifies the cached minimum
+    # against a full root list scan (slow, intended for testing)
+    debug = False
+
+    # Class of the node handles this engine takes, see HeapFactory.ENGINES
+    node_type = Node
+
     # Constructs a binomial heap object
     # Initially empty where head is None
-    def __init__(self):
+    #  lazy: bool, defer linking trees until the next extract_min
+    #  key: function of one argument or None, maps a node key to the value compared
+    #  reverse: bool, whether larger keys come first (max-heap mode)
+    #  index: bool, keep a dict from each node's value (the item) to its node
+    #  keep_largest: int, keep only this many largest keys (0 for no limit), see offer
+    def __init__(self, lazy: bool = False, key=None, reverse: bool = False, index: bool = False,
+                 keep_largest: int = 0):
         self.head = None
+        # Last node of the root list, allows O(1) splicing in lazy mode
+        self.tail = None
+        # Cached pointer to the root with the minimum key (None when empty)
+        self.min_node = None
+        # In lazy mode the root list may hold unordered, duplicate degree trees
+        self.lazy = lazy
+        # Number of nodes in the heap. Outside lazy mode its binary digits are
+        # also the root-degree bitmap: bit d is set when a tree of degree d is a root
+        self.count = 0
+        # Nodes are compared by rank, which is the key itself unless a key
+        # function or max-heap mode is set (ranker is None on the fast path)
+        self.key = key
+        self.reverse = reverse
+        self.ranker = make_ranker(key, reverse)
+        # Dict from item (node value) to node when the index is enabled,
+        # otherwise None. Items must be hashable and distinct
+        self.index = {} if index else None
+        # Keep-the-k-largest mode: once count reaches keep_largest, a new node
+        # only gets in by evicting the minimum. The heap then drops its most
+        # urgent entries, so this is a top-k filter (see topk), not a bounded queue
+        if keep_largest < 0:
+            raise ValueError("keep_largest must not be negative.")
+        self.keep_largest = keep_largest
+        # (copied fields, finalizer) of every HeapView that watches the nodes
+        # of this heap, empty so the writers only pay for one truth test while
+        # no view is open
+        self.views = []
+        # HeapStats while instrumentation is enabled, otherwise None so the
+        # hot paths only pay for one attribute test
+        self.stats = None
+        self.stats_callback = None
+
+    # Function to turn on operation counters and per-operation timing
+    # Timed operations are wrapped on this instance only, so heaps without
+    # stats keep calling the plain methods
+    #  callback: function or None, called as callback(op, seconds, heap)
+    #            after every timed operation
+    # Returns HeapStats, the live counters
+    def enable_stats(self, callback=None) -> 'HeapStats':
+        if self.stats is None:
+            self.stats = HeapStats()
+            for op in TIMED_OPERATIONS:
+                setattr(self, op, self.timed(op, getattr(self, op)))
+        self.stats_callback = callback
+        return self.stats
+
+    # Function to turn off instrumentation and remove the timing wrappers
+    # Returns nothing
+    def disable_stats(self) -> None:
+        if self.stats is not None:
+            for op in TIMED_OPERATIONS:
+                delattr(self, op)
+        self.stats = None
+        self.stats_callback = None
+
+    # Function to copy the current counters
+    # Returns dict, every counter by name, or None when stats are disabled
+    def stats_snapshot(self) -> dict or None:
+        if self.stats is None:
+            return None
+        return self.stats.snapshot()
+
+    # Auxiliary function to enable_stats, please use enable_stats instead!
+    # Function to wrap a bound method so each call is timed and reported
+    #  op: str, the operation name
+    #  method: bound method, the operation to wrap
+    # Returns function, the timed wrapper
+    def timed(self, op: str, method):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                self.stats.record(op, seconds)
+                if self.stats_callback is not None:
+                    self.stats_callback(op, seconds, self)
+        wrapper.__name__ = op
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+
+    # Defines the number of nodes in the heap, in O(1)
+    def __len__(self) -> int:
+        return self.count
+
+    # Defines the truth value of the heap, False when empty
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    # Function to get the root-degree bitmap of an eager heap
+    # Bit d is set when the root list holds a tree of degree d (2 ** d nodes)
+    # Returns int, the bitmap (equal to the size, since n = sum of 2 ** d)
+    def degree_bitmap(self) -> int:
+        return self.count
+
+    # Function to predict the links a meld or union with another eager heap makes
+    # Adding the two bitmaps in binary carries once per link
+    #  other_heap: BinomialHeap, the heap that would be combined with this one
+    # Returns int, the number of tree_link calls the merge will perform
+    def predict_links(self, other_heap: 'BinomialHeap') -> int:
+        total = self.count + other_heap.count
+        return bin(self.count).count('1') + bin(other_heap.count).count('1') - bin(total).count('1')
+
+    # Function to verify the root list against the size and root-degree bitmap
+    # Raises RuntimeError when the structure is corrupted
+    # Returns nothing
+    def check_degrees(self) -> None:
+        total = 0
+        seen = 0
+        previous = -1
+        node = self.head
+        while node is not None:
+            total += 1 << node.degree
+            if not self.lazy:
+                if node.degree <= previous:
+                    raise RuntimeError("Root list degrees are not strictly increasing.")
+                seen |= 1 << node.degree
+                previous = node.degree
+            node = node.sibling
+        if total != self.count or not self.lazy and seen != self.count:
+            raise RuntimeError("Root list does not match the heap size.")
+        if self.index is not None and len(self.index) != self.count:
+            raise RuntimeError("Item index does not match the heap size.")
+
+    # Function to verify every structural invariant in one linear pass
+    # Checks the rank, heap order and parent pointer of every node, that a node
+    # of degree d has children of degrees d - 1 down to 0, the root list (unique
+    # degrees in increasing order outside lazy mode) and its tail, the cached
+    # minimum, the size and the item index. A cycle makes the walk exceed the
+    # size and is reported instead of looping forever
+    # Raises RuntimeError when the structure is corrupted
+    # Returns nothing
+    def validate(self) -> None:
+        index = self.index
+        total = 0
+        best = None
+        found = False
+        last = None
+        root = self.head
+        while root is not None:
+            if root.parent is not None:
+                raise RuntimeError("Root has a parent pointer.")
+            if not self.lazy and last is not None and root.degree <= last.degree:
+                raise RuntimeError("Root list degrees are not strictly increasing.")
+            if best is None or root.rank < best.rank:
+                best = root
+            if root is self.min_node:
+                found = True
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                total += 1
+                if total > self.count:
+                    raise RuntimeError("The heap holds more nodes than its size (or a cycle).")
+                if node.rank != self.rank(node.key):
+                    raise RuntimeError("Node rank does not match its key.")
+                if index is not None and index.get(node.value) is not node:
+                    raise RuntimeError("Item index does not point at the node.")
+                expected = node.degree - 1
+                child = node.child
+                while child is not None:
+                    if child.parent is not node:
+                        raise RuntimeError("Child does not point at its parent.")
+                    if child.rank < node.rank:
+                        raise RuntimeError("Child keys must be larger than parent keys.")
+                    if child.degree != expected:
+                        raise RuntimeError("Node degree does not match its children.")
+                    expected -= 1
+                    stack.append(child)
+                    child = child.sibling
+                if expected != -1:
+                    raise RuntimeError("Node degree does not match its children.")
+            last = root
+            root = root.sibling
+        if last is not self.tail:
+            raise RuntimeError("Root list tail is stale.")
+        if total != self.count:
+            raise RuntimeError("Root list does not match the heap size.")
+        if best is None and self.min_node is not None or best is not None and (
+                not found or best.rank < self.min_node.rank):
+            raise RuntimeError("Cached minimum does not match root list.")
+        if index is not None and len(index) != self.count:
+            raise RuntimeError("Item index does not match the heap size.")
+
+    # Function to take a read-only view of the heap as it is now, in O(1)
+    # The heap copies only the nodes it changes while the view is open, see
+    # HeapView. With several threads, take it under the lock the writers use
+    # Returns HeapView, the open view
+    def snapshot(self) -> 'HeapView':
+        return HeapView(self)
+
+    # Auxiliary function to every operation that changes nodes
+    # Function to copy nodes into the open views just before they change
+    # Each view keeps the fields a node had when the view was taken, so a node
+    # is copied at most once per view
+    #  nodes: Node or None, the nodes about to change
+    # Returns nothing
+    def preserve(self, *nodes) -> None:
+        for saved, finalizer in self.views:
+            if not finalizer.alive:
+                self.prune_views()
+                continue
+            for node in nodes:
+                if node is not None and node not in saved:
+                    saved[node] = (node.key, node.value, node.rank, node.child, node.sibling)
+
+    # Auxiliary function to every operation that relinks a sibling list
+    # Function to copy every node of a sibling list into the open views
+    #  node: Node, the first node of the list (or None)
+    # Returns nothing
+    def preserve_list(self, node: 'Node') -> None:
+        for saved, finalizer in self.views:
+            if not finalizer.alive:
+                self.prune_views()
+                continue
+            current = node
+            while current is not None:
+                if current not in saved:
+                    saved[current] = (current.key, current.value, current.rank,
+                                      current.child, current.sibling)
+                current = current.sibling
+
+    # Auxiliary function to preserve and preserve_list
+    # Function to drop the closed views, the list is rebound so a reader
+    # taking it at the same time is unaffected
+    # Returns nothing
+    def prune_views(self) -> None:
+        self.views = [entry for entry in self.views if entry[1].alive]
+
+    # Auxiliary function to meld, union and split
+    # Function to make this heap copy nodes for the open views of another heap
+    # Called before nodes of other_heap move into this heap, so a view keeps
+    # seeing its nodes as they were whichever heap changes them next
+    #  other_heap: BinomialHeap, the heap whose nodes this heap will change
+    # Returns nothing
+    def watch_views(self, other_heap: 'BinomialHeap') -> None:
+        for entry in other_heap.views:
+            if entry[1].alive and all(entry[0] is not mine[0] for mine in self.views):
+                self.views = self.views + [entry]
+
+    # Function to compute the rank a key is compared by in this heap
+    #  key: any, a node key
+    # Returns the rank of the key
+    def rank(self, key):
+        if self.ranker is None:
+            return key
+        return self.ranker(key)
+
+    # Function to turn the item index on or off
+    # Turning it on indexes every node already in the heap
+    #  enabled: bool, whether the heap should keep the index
+    # Returns nothing
+    def set_index(self, enabled: bool) -> None:
+        if not enabled:
+            self.index = None
+            return
+        index = {}
+        for node, depth, parent in self.traverse():
+            if node.value in index:
+                raise ValueError("Indexed items must be distinct.")
+            index[node.value] = node
+        self.index = index
+
+    # Auxiliary function to the item index functions
+    # Function to look up the node of an item in an indexed heap
+    #  item: any hashable, the value of a node
+    # Returns Node, the node holding the item
+    def indexed(self, item) -> 'Node':
+        if self.index is None:
+            raise ValueError("The heap has no item index, use index=True.")
+        node = self.index.get(item)
+        if node is None:
+            raise KeyError(item)
+        return node
+
+    # Function to check whether an item is in an indexed heap in O(1)
+    #  item: any hashable, the value of a node
+    # Returns bool, True when a node holds the item
+    def contains(self, item) -> bool:
+        if self.index is None:
+            raise ValueError("The heap has no item index, use index=True.")
+        return item in self.index
+
+    # Defines the in operator for indexed heaps
+    def __contains__(self, item) -> bool:
+        return self.contains(item)
+
+    # Function to find the node holding an item in O(1)
+    #  item: any hashable, the value of a node
+    # Returns Node, the node holding the item, or None when absent
+    def find(self, item) -> 'Node' or None:
+        if self.index is None:
+            raise ValueError("The heap has no item index, use index=True.")
+        return self.index.get(item)
+
+    # Function to change the key of an item in either direction
+    # A smaller key bubbles up with decrease_key, a larger one uses increase_key
+    #  item: any hashable, the value of a node
+    #  new_key: any, the new key for the item
+    # Returns Node, the node holding the item (the same handle as before)
+    def update_priority(self, item, new_key) -> 'Node':
+        node = self.indexed(item)
+        if self.rank(new_key) < node.rank:
+            self.decrease_key(node, new_key)
+        elif node.rank < self.rank(new_key):
+            self.increase_key(node, new_key)
+        else:
+            if self.views:
+                self.preserve(node)
+            node.key = new_key
+        return node
+
+    # Function to remove an item from an indexed heap
+    #  item: any hashable, the value of a node
+    # Returns Node, the detached node that held the item
+    def remove(self, item) -> 'Node':
+        node = self.indexed(item)
+        self.delete(node)
+        return node
+
+    # Function to build a heap from many keys in linear time
+    # Trees are linked bottom-up like incrementing a binary counter,
+    # so no intermediate heaps are created and no root list is merged
+    #  items: iterable of keys, or of (key, value) pairs when pairs is True
+    #  pairs: bool, whether each item is a (key, value) pair
+    #  key, reverse: ordering options, as for the constructor
+    # Returns tuple (BinomialHeap, list of Node handles in input order)
+    @classmethod
+    def from_iterable(cls, items, pairs: bool = False, key=None, reverse: bool = False) -> tuple:
+        heap = cls(key=key, reverse=reverse)
+        ranker = heap.ranker
+        nodes = []
+        # trees[d] holds the pending binomial tree of degree d, if any
+        trees = []
+        for item in items:
+            node = Node(*item) if pairs else Node(item)
+            if ranker is not None:
+                node.rank = ranker(node.key)
+            nodes.append(node)
+            # Propagate the carry through the occupied degrees
+            carry = node
+            degree = 0
+            while degree < len(trees) and trees[degree] is not None:
+                other = trees[degree]
+                trees[degree] = None
+                if other.rank <= carry.rank:
+                    heap.tree_link(carry, other)
+                    carry = other
+                else:
+                    heap.tree_link(other, carry)
+                degree += 1
+            if degree == len(trees):
+                trees.append(carry)
+            else:
+                trees[degree] = carry
+        # Chain the remaining trees into a root list in degree order
+        for tree in reversed(trees):
+            if tree is not None:
+                if heap.tail is None:
+                    heap.tail = tree
+                tree.sibling = heap.head
+                heap.head = tree
+                if heap.min_node is None or tree.rank < heap.min_node.rank:
+                    heap.min_node = tree
+        heap.count = len(nodes)
+        return heap, nodes
 
     # Defines the string representation of a binomial heap
     def __str__(self) -> str:
@@ -18,36 +708,251 @@ class BinomialHeap:
         else:
             return ""
 
-    # Function to find the min key in the heap
+    # Function to traverse every node in the heap without recursion
+    # Pre-order, depth first from each tree in the root list
+    # Yields tuple (Node, depth where roots are 0, parent Node or None)
+    def traverse(self):
+        if self.head is not None:
+            yield from self.head.traverse()
+
+    # Function to stream the heap to a text file object, one node per line
+    # Each line is indented two spaces per level below the root list
+    # Lines are written in batches, so memory stays bounded for any heap size
+    #  fileobj: writable text file object
+    #  batch: int, the number of lines to buffer between writes
+    # Returns int, the number of nodes written
+    def write(self, fileobj, batch: int = 4096) -> int:
+        lines = []
+        count = 0
+        for node, depth, parent in self.traverse():
+            lines.append('  ' * depth + str(node) + '\n')
+            if len(lines) >= batch:
+                fileobj.writelines(lines)
+                count += len(lines)
+                lines = []
+        fileobj.writelines(lines)
+        return count + len(lines)
+
+    # Function to save the heap to a binary file object
+    # Nodes are recorded in pre-order (root list order, then child order) with
+    # their degrees, so load can rebuild the exact trees without comparing keys
+    # Keys are packed as int64 or float64 when possible, otherwise pickled
+    # Values are pickled when any node has one
+    #  fileobj: writable binary file object
+    # Returns nothing
+    def save(self, fileobj) -> None:
+        degrees = array('B')
+        keys = []
+        values = []
+        min_index = 0
+        for node, depth, parent in self.traverse():
+            if node is self.min_node:
+                min_index = len(keys)
+            degrees.append(node.degree)
+            keys.append(node.key)
+            values.append(node.value)
+        # Pick the most compact encoding that represents every key exactly
+        if all(type(key) is int and -2 ** 63 <= key < 2 ** 63 for key in keys):
+            code = b'q'
+        elif all(type(key) is float for key in keys):
+            code = b'd'
+        else:
+            code = b'p'
+        flags = SNAPSHOT_LAZY if self.lazy else 0
+        if self.reverse:
+            flags |= SNAPSHOT_REVERSE
+        has_values = any(value is not None for value in values)
+        if has_values:
+            flags |= SNAPSHOT_VALUES
+        fileobj.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, code, flags,
+                                           len(keys), min_index))
+        fileobj.write(degrees.tobytes())
+        if code == b'p':
+            self.save_pickled(fileobj, keys)
+        else:
+            packed = array(code.decode(), keys)
+            if sys.byteorder == 'big':
+                packed.byteswap()
+            fileobj.write(packed.tobytes())
+        if has_values:
+            self.save_pickled(fileobj, values)
+
+    # Auxiliary function to save, please use save instead!
+    # Function to write a length prefixed pickle of a list
+    #  fileobj: writable binary file object
+    #  items: list, the objects to pickle
+    # Returns nothing
+    def save_pickled(self, fileobj, items: list) -> None:
+        data = pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL)
+        fileobj.write(struct.pack('<Q', len(data)))
+        fileobj.write(data)
+
+    # Function to load a heap saved with save
+    # Pickled sections are trusted, only load snapshots from trusted sources
+    # Max-heap mode is restored, but a key function cannot be saved and must
+    # be passed again for heaps that were built with one
+    #  fileobj: readable binary file object
+    #  use_mmap: bool, map the file instead of reading it into memory
+    #            (fileobj must then be a real file with a fileno)
+    #  key: function of one argument or None, the key function of the saved heap
+    # Returns BinomialHeap, the rebuilt heap
+    @classmethod
+    def load(cls, fileobj, use_mmap: bool = False, key=None) -> 'BinomialHeap':
+        if use_mmap:
+            mapped = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                with memoryview(mapped) as view:
+                    return cls.load_view(view, key)
+            finally:
+                mapped.close()
+        with memoryview(fileobj.read()) as view:
+            return cls.load_view(view, key)
+
+    # Auxiliary function to load, please use load instead!
+    # Function to rebuild a heap from the bytes of a snapshot
+    #  view: memoryview, the complete snapshot
+    #  key: function of one argument or None, the key function of the saved heap
+    # Returns BinomialHeap, the rebuilt heap
+    @classmethod
+    def load_view(cls, view: memoryview, key=None) -> 'BinomialHeap':
+        if len(view) < SNAPSHOT_HEADER.size:
+            raise ValueError("Snapshot is truncated or corrupted.")
+        magic, version, code, flags, count, min_index = SNAPSHOT_HEADER.unpack_from(view)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a binomial heap snapshot.")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported snapshot version " + str(version) + ".")
+        offset = SNAPSHOT_HEADER.size
+        degrees = view[offset:offset + count]
+        offset += count
+        if code == b'p':
+            keys, offset = cls.load_pickled(view, offset)
+        elif code in (b'q', b'd'):
+            if offset + 8 * count > len(view):
+                raise ValueError("Snapshot is truncated or corrupted.")
+            packed = view[offset:offset + 8 * count]
+            offset += 8 * count
+            if sys.byteorder == 'big':
+                keys = array(code.decode(), packed)
+                keys.byteswap()
+            else:
+                keys = packed.cast(code.decode())
+        else:
+            raise ValueError("Unknown key encoding in snapshot.")
+        values = None
+        if flags & SNAPSHOT_VALUES:
+            values, offset = cls.load_pickled(view, offset)
+        if len(degrees) != count or len(keys) != count or offset > len(view):
+            raise ValueError("Snapshot is truncated or corrupted.")
+        heap = cls(lazy=bool(flags & SNAPSHOT_LAZY), key=key,
+                   reverse=bool(flags & SNAPSHOT_REVERSE))
+        heap.count = count
+        ranker = heap.ranker
+        # Each stack entry is [parent, children still to attach, last attached child]
+        stack = []
+        for i in range(count):
+            node = Node(keys[i], None if values is None else values[i])
+            if ranker is not None:
+                node.rank = ranker(node.key)
+            node.degree = degrees[i]
+            if stack:
+                entry = stack[-1]
+                node.parent = entry[0]
+                if entry[2] is None:
+                    entry[0].child = node
+                else:
+                    entry[2].sibling = node
+                entry[2] = node
+                entry[1] -= 1
+                if entry[1] == 0:
+                    stack.pop()
+            else:
+                if heap.tail is None:
+                    heap.head = node
+                else:
+                    heap.tail.sibling = node
+                heap.tail = node
+            if i == min_index:
+                heap.min_node = node
+            if node.degree > 0:
+                stack.append([node, node.degree, None])
+        if stack or count and (heap.min_node is None or heap.min_node.parent is not None):
+            raise ValueError("Snapshot is truncated or corrupted.")
+        if isinstance(keys, memoryview):
+            keys.release()
+        return heap
+
+    # Auxiliary function to load, please use load instead!
+    # Function to read a length prefixed pickle of a list
+    #  view: memoryview, the complete snapshot
+    #  offset: int, the position of the length prefix
+    # Returns tuple (list of objects, offset after the pickle)
+    @classmethod
+    def load_pickled(cls, view: memoryview, offset: int) -> tuple:
+        if offset + 8 > len(view):
+            raise ValueError("Snapshot is truncated or corrupted.")
+        length = struct.unpack_from('<Q', view, offset)[0]
+        offset += 8
+        if offset + length > len(view):
+            raise ValueError("Snapshot is truncated or corrupted.")
+        return pickle.loads(view[offset:offset + length]), offset + length
+
+    # Function to get the min key in the heap in O(1) from the cached pointer
     # Returns a pointer to the min node
     def min(self) -> 'Node' or None:
+        return self.min_node
+
+    # Function to find the min key in the heap by scanning the root list
+    # Does not use or update the cached pointer
+    # Returns a pointer to the min node
+    def find_min(self) -> 'Node' or None:
         min_node = None
         current = self.head
-        # Initialize the minimum value as negative infinity
-        min_val = inf
         while current is not None:
-            if current.key < min_val:
-                min_val = current.key
+            if min_node is None or current.rank < min_node.rank:
                 min_node = current
             # Traverse root list, since the min must be a root (all node keys larger)
             current = current.sibling
+        if self.stats is not None:
+            self.stats.scan(chain_length(self.head))
         return min_node
 
+    # Function to verify the cached minimum agrees with a full root list scan
+    # Raises RuntimeError when the cached pointer is stale
+    # Returns nothing
+    def check_min(self) -> None:
+        expected = self.find_min()
+        if expected is None or self.min_node is None:
+            if expected is not self.min_node:
+                raise RuntimeError("Cached minimum does not match root list.")
+            return
+        # Equal keys may tie, so compare keys and confirm the cache is a root
+        current = self.head
+        while current is not None and current is not self.min_node:
+            current = current.sibling
+        if current is None or expected.rank < self.min_node.rank:
+            raise RuntimeError("Cached minimum does not match root list.")
+        self.check_degrees()
+
     # Function to link two binomial trees by manipulating the roots
     #  new_child: Node, the root of the tree to link under a different root
     #  root: Node, the root to which the new_child will be linked (becomes parent)
     # Returns nothing
     def tree_link(self, new_child: 'Node', root: 'Node') -> None:
         # Prevent property violation (root key < all child keys)
-        if root.key > new_child.key:
+        if new_child.rank < root.rank:
             raise ValueError("Child keys must be larger than parent keys.")
         # Prevent breaking pointer references and NoneType error
         if new_child is None or root is None:
             raise ValueError("Node(s) cannot be None for link operation.")
         new_child.parent = root
+        # Both roots were already copied for open views by the caller, which
+        # relinks the whole root list (merge_roots or consolidate)
         new_child.sibling = root.child
         root.child = new_child
         root.degree += 1
+        if self.stats is not None:
+            self.stats.links += 1
 
     # Auxiliary function to union, please use union instead!
     # Function to merge two binomial heaps into one
@@ -55,11 +960,22 @@ class BinomialHeap:
     #  other_heap: BinomialHeap, heap to merge with the current heap
     # Returns Node, the head of the root list for a new BinomialHeap
     def heap_merge(self, other_heap: 'BinomialHeap') -> 'Node' or None:
-        # Assume: at most 1 tree per degree per heap, and already in order by degree
+        if self.debug:
+            self.check_degrees()
+            other_heap.check_degrees()
+        return self.merge_roots(self.head, other_heap.head)
+
+    # Auxiliary function to heap_merge, meld, insert and extract_min
+    # Function to merge two root lists into one list in degree order
+    #  x_node: Node, the head of the first root list (or None)
+    #  y_node: Node, the head of the second root list (or None)
+    # Returns Node, the head of the merged root list
+    def merge_roots(self, x_node: 'Node', y_node: 'Node') -> 'Node' or None:
+        # Assume: at most 1 tree per degree per list, and already in order by degree
+        if self.views:
+            self.preserve_list(x_node)
+            self.preserve_list(y_node)
         # Start at the heads, add the lesser degree tree until both root lists exhausted
-        # Refer to self as x, other as y
-        x_node = self.head
-        y_node = other_heap.head
         # Node selected to insert
         selected = None
         # The head of root list (returned value)
@@ -94,79 +1010,334 @@ class BinomialHeap:
                 prev_node.sibling = selected
             # Always maintain reference to previous node
             prev_node = selected
+        if self.stats is not None:
+            self.stats.merge_steps += chain_length(head_node)
         # Return pointer to head of root list (binomial trees may need linking)
         return head_node
 
+    # Function to change how many of the largest keys the heap keeps
+    # Shrinking the limit evicts minimum nodes until the heap fits
+    #  keep_largest: int, keep only this many largest keys (0 for no limit)
+    # Returns list of Node, the evicted nodes in ascending key order
+    def set_keep_largest(self, keep_largest: int) -> list:
+        if keep_largest < 0:
+            raise ValueError("keep_largest must not be negative.")
+        self.keep_largest = keep_largest
+        return self.trim()
+
+    # Auxiliary function to set_keep_largest and meld
+    # Function to evict minimum nodes until only the keep_largest largest keys remain
+    # Returns list of Node, the evicted nodes in ascending key order
+    def trim(self) -> list:
+        evicted = []
+        if self.keep_largest:
+            while self.count > self.keep_largest:
+                evicted.append(self.extract_root(self.min_node))
+        return evicted
+
+    # Function to switch between eager and lazy (deferred linking) mode
+    # Leaving lazy mode links the pending trees right away
+    #  lazy: bool, whether the heap should defer linking
+    # Returns nothing
+    def set_lazy(self, lazy: bool) -> None:
+        self.lazy = lazy
+        if not lazy:
+            self.consolidate()
+
+    # Function to link every pair of equal degree trees in the root list
+    # Uses a table indexed by degree, so the root list may be in any order
+    # Leaves the root list in degree order with the cached minimum updated
+    # Returns nothing
+    def consolidate(self) -> None:
+        # trees[d] holds the tree of degree d found so far, if any
+        trees = []
+        if self.stats is not None:
+            self.stats.scan(chain_length(self.head))
+        if self.views:
+            self.preserve_list(self.head)
+        node = self.head
+        while node is not None:
+            nxt = node.sibling
+            degree = node.degree
+            while degree < len(trees) and trees[degree] is not None:
+                other = trees[degree]
+                trees[degree] = None
+                if other.rank <= node.rank:
+                    self.tree_link(node, other)
+                    node = other
+                else:
+                    self.tree_link(other, node)
+                degree += 1
+            while degree >= len(trees):
+                trees.append(None)
+            trees[degree] = node
+            node = nxt
+        # Rebuild the root list in degree order
+        self.head = None
+        self.tail = None
+        self.min_node = None
+        for tree in reversed(trees):
+            if tree is not None:
+                if self.tail is None:
+                    self.tail = tree
+                tree.sibling = self.head
+                self.head = tree
+                if self.min_node is None or tree.rank < self.min_node.rank:
+                    self.min_node = tree
+
     # Function to generate heap from union of two binomial heaps (current and other)
+    # In lazy mode the root lists are concatenated in O(1) and linking is deferred
+    # Both inputs share nodes with the result afterwards, use meld to combine in place
     #  other_heap: the other heap to merge with the current heap
     # Returns BinomialHeap, the result of the union
     def union(self, other_heap) -> 'BinomialHeap':
-        # Create new heap and set head as returned node from merging
-        unite = BinomialHeap()
-        unite.head = self.heap_merge(other_heap)
-        if unite.head is None:
-            return unite
+        self.check_ordering(other_heap)
+        # Reject clashing items before either input is relinked
+        if self.index is not None:
+            items = self.index_items(other_heap)
+        # Afterwards the inputs and the result all change the same nodes
+        self.watch_views(other_heap)
+        other_heap.watch_views(self)
+        if self.lazy:
+            unite = self.union_lazy(other_heap)
+        else:
+            # An eager merge needs the other root list in degree order
+            if other_heap.lazy:
+                other_heap.consolidate()
+            # Create new heap and set head as returned node from merging
+            unite = BinomialHeap(key=self.key, reverse=self.reverse)
+            unite.link_roots(self.heap_merge(other_heap))
+            unite.count = self.count + other_heap.count
+        unite.watch_views(self)
+        if self.index is not None:
+            unite.index = dict(self.index)
+            unite.index.update(items)
+        return unite
+
+    # Auxiliary function to union, meld, insert and extract_min
+    # Function to link duplicate degree trees in a root list in degree order
+    # Sets the head, tail and cached minimum of this heap from the result
+    #  head: Node, the head of a merged root list (or None)
+    # Returns nothing
+    def link_roots(self, head: 'Node') -> None:
+        self.head = head
+        if head is None:
+            self.tail = None
+            self.min_node = None
+            return
         # Fix the list by linking duplicate degree trees
+        # Track the minimum of each finished root so no separate scan is needed
+        best = None
         prev = None
-        current = unite.head
+        current = head
         nxt = current.sibling
         while nxt is not None:
             if (current.degree != nxt.degree or
                     nxt.sibling is not None and nxt.sibling.degree == current.degree):
+                # Current is final in the root list, compare it to the minimum
+                if best is None or current.rank < best.rank:
+                    best = current
                 prev = current
                 current = nxt
             else:
-                if current.key <= nxt.key:
+                if current.rank <= nxt.rank:
                     current.sibling = nxt.sibling
                     self.tree_link(nxt, current)
                 else:
                     if prev is None:
-                        unite.head = nxt
+                        self.head = nxt
                     else:
                         prev.sibling = nxt
                     self.tree_link(current, nxt)
                     current = nxt
             nxt = current.sibling
+        # The last root is final as well
+        if best is None or current.rank < best.rank:
+            best = current
+        self.min_node = best
+        self.tail = current
+
+    # Auxiliary function to union, please use union instead!
+    # Function to concatenate two root lists without linking any trees
+    #  other_heap: the other heap to merge with the current heap
+    # Returns BinomialHeap, a lazy heap holding both root lists
+    def union_lazy(self, other_heap) -> 'BinomialHeap':
+        unite = BinomialHeap(lazy=True, key=self.key, reverse=self.reverse)
+        unite.count = self.count + other_heap.count
+        if self.head is None:
+            unite.head = other_heap.head
+            unite.tail = other_heap.tail
+            unite.min_node = other_heap.min_node
+            return unite
+        unite.head = self.head
+        unite.tail = self.tail
+        unite.min_node = self.min_node
+        if other_heap.head is not None:
+            if self.views:
+                self.preserve(self.tail)
+            self.tail.sibling = other_heap.head
+            unite.tail = other_heap.tail
+            if other_heap.min_node.rank < unite.min_node.rank:
+                unite.min_node = other_heap.min_node
         return unite
 
+    # Auxiliary function to union and meld
+    # Function to make sure two heaps order their nodes the same way
+    #  other_heap: BinomialHeap, the heap that will be combined with this one
+    # Returns nothing
+    def check_ordering(self, other_heap: 'BinomialHeap') -> None:
+        if type(other_heap) is not type(self):
+            raise TypeError("Heaps of different engines cannot be combined.")
+        if self.key is not other_heap.key or self.reverse != other_heap.reverse:
+            raise ValueError("Heaps with different key functions or ordering cannot be combined.")
+
+    # Auxiliary function to meld and union
+    # Function to collect the items of another heap for this heap's index
+    # Every item is checked, so callers can reject a clash before any change
+    #  other_heap: BinomialHeap, the heap whose nodes join this heap
+    # Returns dict, from each item of other_heap to its node
+    def index_items(self, other_heap: 'BinomialHeap') -> dict:
+        if other_heap.index is not None:
+            items = other_heap.index
+        else:
+            items = {node.value: node for node, depth, parent in other_heap.traverse()}
+            if len(items) != other_heap.count:
+                raise ValueError("Indexed items must be distinct.")
+        if not self.index.keys().isdisjoint(items):
+            raise ValueError("Indexed items must be distinct.")
+        return items
+
+    # Function to absorb another heap into this one in place
+    # No intermediate heap is created and other_heap is left empty
+    # In lazy mode the root lists are spliced together in O(1)
+    #  other_heap: BinomialHeap, the heap whose nodes move into this heap
+    # Returns nothing
+    def meld(self, other_heap: 'BinomialHeap') -> None:
+        if other_heap is self:
+            raise ValueError("A heap cannot be melded with itself.")
+        self.check_ordering(other_heap)
+        if self.index is not None:
+            self.index.update(self.index_items(other_heap))
+        other_heap.index = None if other_heap.index is None else {}
+        self.watch_views(other_heap)
+        if other_heap.head is not None:
+            if self.lazy:
+                if self.head is None:
+                    self.head = other_heap.head
+                    self.min_node = other_heap.min_node
+                else:
+                    if self.views:
+                        self.preserve(self.tail)
+                    self.tail.sibling = other_heap.head
+                    if other_heap.min_node.rank < self.min_node.rank:
+                        self.min_node = other_heap.min_node
+                self.tail = other_heap.tail
+            else:
+                # An eager merge needs the other root list in degree order
+                if other_heap.lazy:
+                    other_heap.consolidate()
+                self.link_roots(self.merge_roots(self.head, other_heap.head))
+        # The nodes now belong to this heap only
+        self.count += other_heap.count
+        other_heap.head = None
+        other_heap.tail = None
+        other_heap.min_node = None
+        other_heap.count = 0
+        # keep_largest mode drops the smallest nodes that no longer fit
+        self.trim()
+        if self.debug:
+            self.check_min()
+
     # Function to insert a node into the binomial heap
+    # When keep_largest is set and the heap is full, the node replaces the
+    # minimum only if it ranks after it, otherwise the heap is left unchanged
     #  node: Node, the node to add to the binomial heap
-    # Returns nothing
-    def insert(self, node: 'Node') -> None:
-        # Method: Create a heap with just one node, then merge the heaps
-        # and reassign the head node of the root list in the calling heap
-        singleton = BinomialHeap()
+    # Returns Node or None, the node left out to respect keep_largest (the
+    #         evicted minimum, or node itself when it was rejected)
+    def insert(self, node: 'Node') -> 'Node' or None:
+        if self.keep_largest and self.count >= self.keep_largest:
+            return self.evict(node)
+        if self.index is not None:
+            if node.value in self.index:
+                raise ValueError("Indexed items must be distinct.")
+            self.index[node.value] = node
         # Restore default attributes of the node
         node.parent = None
         node.child = None
         node.sibling = None
         node.degree = 0
-        # Assign as the head of the other heap, then merge
-        singleton.head = node
-        self.head = self.union(singleton).head
+        node.rank = node.key if self.ranker is None else self.ranker(node.key)
+        self.count += 1
+        # Lazy mode: prepend to the root list in O(1)
+        if self.lazy:
+            node.sibling = self.head
+            self.head = node
+            if self.tail is None:
+                self.tail = node
+            if self.min_node is None or node.rank < self.min_node.rank:
+                self.min_node = node
+            return
+        # Merge the node in as a one node root list, then link in place
+        self.link_roots(self.merge_roots(self.head, node))
+        if self.debug:
+            self.check_min()
+
+    # Auxiliary function to insert, please use insert or offer instead!
+    # Function to make room in a full keep_largest heap by evicting the minimum
+    #  node: Node, the node to add to the heap
+    # Returns Node, the evicted minimum, or node itself when it was rejected
+    def evict(self, node: 'Node') -> 'Node':
+        rank = node.key if self.ranker is None else self.ranker(node.key)
+        if not self.min_node.rank < rank:
+            return node
+        if self.index is not None and node.value in self.index:
+            raise ValueError("Indexed items must be distinct.")
+        evicted = self.extract_root(self.min_node)
+        # Call the class function, so an enable_stats wrapper on the instance
+        # does not count this insert a second time
+        type(self).insert(self, node)
+        return evicted
+
+    # Function to add a key to a keep_largest heap (or any heap) by value
+    # When the heap is full, a key that does not rank after the minimum is
+    # rejected in O(1) before any node is allocated; otherwise the minimum is
+    # evicted in O(log n) to make room
+    #  key: any, the key of the new node
+    #  value: any, the value of the new node
+    # Returns Node or None, the new node, or None when the key was rejected
+    def offer(self, key, value=None) -> 'Node' or None:
+        if self.keep_largest and self.count >= self.keep_largest:
+            rank = key if self.ranker is None else self.ranker(key)
+            if not self.min_node.rank < rank:
+                return None
+        node = Node(key, value)
+        self.insert(node)
+        return node
 
     # Function to remove and return the node with the minimum key
     # Returns Node, the node with the minimum key
     def extract_min(self) -> 'Node':
         if self.head is None:
             raise Exception("Heap is empty.")
-        # Step 1: Find the minimum node in the heap (in root list)
-        # Maintain reference to the preceding node to min_node
+        return self.extract_root(self.min_node)
+
+    # Auxiliary function to extract_min and delete
+    # Function to remove a node from the root list and merge its children back
+    #  min_node: Node, the root to remove
+    # Returns Node, the removed root
+    def extract_root(self, min_node: 'Node') -> 'Node':
+        # Step 1: Locate the predecessor of the root in the root list
+        # by identity (no key comparisons are needed)
         prev = None
-        min_node = None
-        # Traverse root list at current with prev reference in left_sibling
         current = self.head
-        left_sibling = None
-        # Initialize the minimum value as negative infinity
-        min_val = inf
-        while current is not None:
-            if current.key < min_val:
-                min_val = current.key
-                min_node = current
-                # Track the preceding node to the minimum
-                prev = left_sibling
-            left_sibling = current
+        while current is not min_node:
+            prev = current
             current = current.sibling
+        if self.stats is not None:
+            self.stats.scan(chain_length(self.head, min_node))
+        if self.views:
+            self.preserve(prev, min_node)
+            self.preserve_list(min_node.child)
         # Step 2: Remove the min_node and process its children
         # Splice out the node by reassigning pointer past min_node
         # When prev is None, min_node was head
@@ -174,9 +1345,27 @@ class BinomialHeap:
             self.head = min_node.sibling
         else:
             prev.sibling = min_node.sibling
-        # Create an auxiliary heap to process the children nodes
-        heap = BinomialHeap()
+        if self.tail is min_node:
+            self.tail = prev
+        self.count -= 1
+        if self.index is not None:
+            del self.index[min_node.value]
+        # Lazy mode: splice the children onto the root list and link everything
+        if self.lazy:
+            node = min_node.child
+            while node is not None:
+                node.parent = None
+                if node.sibling is None:
+                    node.sibling = self.head
+                    self.head = min_node.child
+                    break
+                node = node.sibling
+            self.consolidate()
+            if self.debug:
+                self.check_min()
+            return min_node
         # Reverse the order of the the children nodes (prepend)
+        reverse = None
         node = min_node.child
         while node is not None:
             # Keep reference to the next child
@@ -184,41 +1373,402 @@ class BinomialHeap:
             # Remove parent reference (the node to be extracted)
             node.parent = None
             # Prepend: set old head as sibling and node as new head
-            node.sibling = heap.head
-            heap.head = node
+            node.sibling = reverse
+            reverse = node
             # Move on to the next child using nxt reference
             node = nxt
-        # Step 3: Merge the heaps and return the minimum node
-        self.head = self.union(heap).head
+        # Step 3: Merge the children back in place and return the minimum node
+        self.link_roots(self.merge_roots(self.head, reverse))
+        if self.debug:
+            self.check_min()
         return min_node
 
+    # Function to walk the nodes in ascending key order without changing the heap
+    # Uses an auxiliary frontier heap: a node becomes a candidate only after
+    # its parent is yielded, so the first k nodes cost O(k log n)
+    # The heap must not be changed while the walk is in progress
+    # Yields Node, every node in ascending key order
+    def sorted_view(self):
+        # The counter breaks ties so nodes themselves are never compared
+        count = 0
+        frontier = []
+        node = self.head
+        while node is not None:
+            frontier.append((node.rank, count, node))
+            count += 1
+            node = node.sibling
+        heapq.heapify(frontier)
+        heappop = heapq.heappop
+        heappush = heapq.heappush
+        while frontier:
+            node = heappop(frontier)[2]
+            yield node
+            child = node.child
+            while child is not None:
+                heappush(frontier, (child.rank, count, child))
+                count += 1
+                child = child.sibling
+
+    # Function to find the k smallest nodes without changing the heap
+    #  k: int, the number of nodes to find (0 or less gives an empty list)
+    # Returns list of Node, at most k nodes in ascending key order
+    def nsmallest(self, k: int) -> list:
+        return list(islice(self.sorted_view(), max(k, 0)))
+
+    # Function to remove every node in ascending key order
+    # The whole forest is detached up front and walked like sorted_view, so
+    # no tree is linked and each node costs one frontier push and pop
+    # Closing the generator early puts the nodes not yet yielded back
+    # Yields Node, each node detached as it is yielded
+    def drain(self):
+        count = 0
+        frontier = []
+        node = self.head
+        while node is not None:
+            frontier.append((node.rank, count, node))
+            count += 1
+            node = node.sibling
+        heapq.heapify(frontier)
+        remaining = self.count
+        self.head = None
+        self.tail = None
+        self.min_node = None
+        self.count = 0
+        heappop = heapq.heappop
+        heappush = heapq.heappush
+        try:
+            while frontier:
+                node = heappop(frontier)[2]
+                child = node.child
+                while child is not None:
+                    heappush(frontier, (child.rank, count, child))
+                    count += 1
+                    child = child.sibling
+                if self.views:
+                    self.preserve(node)
+                node.parent = None
+                node.child = None
+                node.sibling = None
+                node.degree = 0
+                remaining -= 1
+                if self.index is not None:
+                    del self.index[node.value]
+                yield node
+        finally:
+            if frontier:
+                self.count += remaining
+                self.reattach([entry[2] for entry in frontier])
+
+    # Auxiliary function to drain
+    # Function to put back subtrees whose ancestors were all removed
+    # Every subtree of a binomial tree is a binomial tree, so they become
+    # roots and are linked once
+    #  trees: list of Node, the roots of the subtrees
+    # Returns nothing
+    def reattach(self, trees: list) -> None:
+        for tree in trees:
+            if self.views:
+                self.preserve(tree)
+            tree.parent = None
+            tree.sibling = self.head
+            self.head = tree
+        self.consolidate()
+
+    # Defines iteration over the heap, which drains it in ascending key order
+    # Use sorted_view to iterate without removing the nodes
+    def __iter__(self):
+        return self.drain()
+
+    # Function to remove the k smallest nodes with a single consolidation
+    # The nodes taken always include their ancestors, so the subtrees left
+    # below them are binomial trees that are linked together once at the end
+    #  k: int, the number of nodes to remove
+    # Returns list of Node, at most k detached nodes in ascending key order
+    def extract_many(self, k: int) -> list:
+        taken = self.nsmallest(k)
+        if taken:
+            self.remove_closed(taken)
+        return taken
+
+    # Auxiliary function to extract_many and delete_many
+    # Function to remove nodes whose ancestors are all removed as well
+    # The surviving subtrees become roots and are consolidated once
+    #  taken: list of Node, the nodes to remove (the parent of each is None or taken)
+    # Returns nothing
+    def remove_closed(self, taken: list) -> None:
+        removed = set(taken)
+        if self.views:
+            self.preserve_list(self.head)
+            for node in taken:
+                self.preserve(node)
+                self.preserve_list(node.child)
+        # Collect the surviving roots and the surviving children of taken nodes
+        head = None
+        node = self.head
+        while node is not None:
+            nxt = node.sibling
+            if node not in removed:
+                node.sibling = head
+                head = node
+            node = nxt
+        for node in taken:
+            child = node.child
+            while child is not None:
+                nxt = child.sibling
+                if child not in removed:
+                    child.parent = None
+                    child.sibling = head
+                    head = child
+                child = nxt
+        # Detach the taken nodes so they can be inserted again
+        index = self.index
+        for node in taken:
+            if index is not None:
+                del index[node.value]
+            node.parent = None
+            node.child = None
+            node.sibling = None
+            node.degree = 0
+        self.head = head
+        self.count -= len(taken)
+        self.consolidate()
+        if self.debug:
+            self.check_min()
+
+    # Function to move whole binomial trees into a new heap
+    # Trees are taken largest first while they fit in the limit, so no keys
+    # are compared and no tree is broken up
+    #  limit: int, the most nodes to move
+    # Returns BinomialHeap, a new heap holding the moved trees
+    def split(self, limit: int) -> 'BinomialHeap':
+        part = BinomialHeap(key=self.key, reverse=self.reverse)
+        part.watch_views(self)
+        # With one tree per degree, a tree of degree d holds 2 ** d nodes
+        if self.lazy:
+            self.consolidate()
+        if self.views:
+            self.preserve_list(self.head)
+        roots = []
+        node = self.head
+        while node is not None:
+            roots.append(node)
+            node = node.sibling
+        self.head = None
+        for root in reversed(roots):
+            if 2 ** root.degree <= limit:
+                limit -= 2 ** root.degree
+                part.count += 2 ** root.degree
+                root.sibling = part.head
+                part.head = root
+            else:
+                root.sibling = self.head
+                self.head = root
+        self.count -= part.count
+        # Both root lists hold distinct degrees, this only restores the metadata
+        self.consolidate()
+        part.consolidate()
+        if self.index is not None:
+            part.set_index(True)
+            for item in part.index:
+                del self.index[item]
+        return part
+
+    # Auxiliary function to decrease_key, please use decrease_key instead!
+    # Function to exchange a node with its parent by relinking the two nodes
+    # Keys stay with their nodes, so handles held by callers remain valid
+    #  node: Node, the node to move up one level (must have a parent)
+    # Returns nothing
+    def swap_with_parent(self, node: 'Node') -> None:
+        parent = node.parent
+        grand = parent.parent
+        # A lazy root list may hold O(n) roots, so link it once before scanning
+        # it, which keeps finding the predecessor of a root O(log n). Only roots
+        # are linked, parent may gain a parent of its own
+        if grand is None and self.lazy:
+            self.consolidate()
+            grand = parent.parent
+        # Find the predecessor of parent in its sibling list (root list at the top)
+        parent_prev = None
+        scan = self.head if grand is None else grand.child
+        while scan is not parent:
+            parent_prev = scan
+            scan = scan.sibling
+        # Find the predecessor of node in the child list of parent
+        node_prev = None
+        scan = parent.child
+        while scan is not node:
+            node_prev = scan
+            scan = scan.sibling
+        if self.views:
+            self.preserve(node, parent, grand, parent_prev, node_prev)
+        # Keep references to the old position of node
+        node_child = node.child
+        node_sibling = node.sibling
+        node_degree = node.degree
+        # Step 1: Node takes over the position of parent
+        node.parent = grand
+        node.sibling = parent.sibling
+        node.degree = parent.degree
+        if node_prev is None:
+            node.child = parent
+        else:
+            node.child = parent.child
+            node_prev.sibling = parent
+        # Step 2: Parent takes over the old position of node
+        parent.parent = node
+        parent.sibling = node_sibling
+        parent.child = node_child
+        parent.degree = node_degree
+        # Step 3: Point both child lists at their new parents
+        child = node.child
+        while child is not None:
+            child.parent = node
+            child = child.sibling
+        child = parent.child
+        while child is not None:
+            child.parent = parent
+            child = child.sibling
+        # Step 4: Replace the reference to parent with node
+        if self.tail is parent:
+            self.tail = node
+        if parent_prev is not None:
+            parent_prev.sibling = node
+        elif grand is None:
+            self.head = node
+        else:
+            grand.child = node
+
+    # Function to increase the key of a node to a new value
+    # The node is deleted and inserted again, so it keeps its handle and value
+    # In max-heap mode the new key must be smaller instead
+    #  node: Node, the node that will have its key increased
+    #  new_key: any, the new key for the node (must not come before the old key)
+    # Returns nothing
+    def increase_key(self, node: 'Node', new_key) -> None:
+        if self.rank(new_key) < node.rank:
+            raise ValueError("The new key must be greater than or equal to the old key.")
+        self.delete(node)
+        node.key = new_key
+        self.insert(node)
+
     # Function to decrease the key of a node to a new value
+    # The node is relinked as it moves up, so it keeps its key and value
+    # In max-heap mode the new key must be larger instead
     #  node: Node, the node that will have its key decreased
-    #  new_key: integer or float, the new key for the node (must be smaller)
+    #  new_key: any, the new key for the node (must not come after the old key)
     # Returns nothing
-    def decrease_key(self, node: 'Node', new_key: int or float) -> None:
+    def decrease_key(self, node: 'Node', new_key) -> None:
+        new_rank = new_key if self.ranker is None else self.ranker(new_key)
         # Throw an exception if the new key is larger than the old key
-        if new_key > node.key:
+        if node.rank < new_rank:
             raise ValueError("The new key must be less than or equal to the old key.")
+        if self.views:
+            self.preserve(node)
         node.key = new_key
+        node.rank = new_rank
         # Bubble up, fixing the heap property if needed (parent <= child)
-        current = node
-        above = current.parent
-        while above is not None and current.key < above.key:
-            # Exchange keys
-            tmp = current.key
-            current.key = above.key
-            above.key = tmp
-            # Sibling & child attributes are already correct after exchange keys
-            # Shift up
-            current = above
-            above = above.parent
+        distance = 0
+        above = node.parent
+        while above is not None and new_rank < above.rank:
+            self.swap_with_parent(node)
+            above = node.parent
+            distance += 1
+        if self.stats is not None:
+            self.stats.bubble(distance)
+        # A key that reached the root list may be the new minimum
+        if above is None and new_rank < self.min_node.rank:
+            self.min_node = node
+        if self.debug:
+            self.check_min()
+
+    # Auxiliary function to decrease_keys and delete_many
+    # Function to find the number of edges between a node and its root
+    #  node: Node, the node to measure
+    # Returns int, the depth of the node (roots are 0)
+    def depth(self, node: 'Node') -> int:
+        depth = 0
+        while node.parent is not None:
+            node = node.parent
+            depth += 1
+        return depth
+
+    # Function to decrease the keys of many nodes in one pass
+    # The whole batch is validated before any key changes
+    # Nodes bubble up in order of new key, then depth, so a finished node is
+    # never pushed back down by a later one, and the minimum is updated once
+    #  pairs: iterable of (Node, new key) tuples
+    # Returns nothing
+    def decrease_keys(self, pairs) -> None:
+        pairs = list(pairs)
+        ranks = []
+        seen = set()
+        for node, new_key in pairs:
+            if node in seen:
+                raise ValueError("A node may only appear once in a batch.")
+            seen.add(node)
+            new_rank = self.rank(new_key)
+            if node.rank < new_rank:
+                raise ValueError("The new key must be less than or equal to the old key.")
+            ranks.append(new_rank)
+        # As in delete_many, the root list is linked before any depth is taken
+        if self.lazy:
+            self.consolidate()
+        order = sorted([(ranks[i], self.depth(pairs[i][0]), i) for i in range(len(pairs))])
+        for rank, depth, i in order:
+            node = pairs[i][0]
+            if self.views:
+                self.preserve(node)
+            node.key = pairs[i][1]
+            node.rank = rank
+        for rank, depth, i in order:
+            node = pairs[i][0]
+            distance = 0
+            above = node.parent
+            while above is not None and node.rank < above.rank:
+                self.swap_with_parent(node)
+                above = node.parent
+                distance += 1
+            if self.stats is not None:
+                self.stats.bubble(distance)
+        # The old minimum is only displaced by a smaller node of the batch
+        best = self.min_node if self.min_node is not None and self.min_node.parent is None else None
+        for node, new_key in pairs:
+            if node.parent is None and (best is None or node.rank < best.rank):
+                best = node
+        self.min_node = best
+        if self.debug:
+            self.check_min()
+
+    # Function to delete many nodes with a single consolidation
+    # The whole batch is validated before anything changes
+    # Each node is moved up until it reaches the root list or another node of
+    # the batch, shallowest first, then all of them are removed together
+    #  nodes: iterable of Node, the nodes to delete from the binomial heap
+    # Returns nothing
+    def delete_many(self, nodes) -> None:
+        nodes = list(nodes)
+        batch = set(nodes)
+        if len(batch) != len(nodes):
+            raise ValueError("A node may only appear once in a batch.")
+        if not nodes:
+            return
+        # Link a lazy root list first, so swap_with_parent links nothing while
+        # the batch moves up and the depths below stay valid
+        if self.lazy:
+            self.consolidate()
+        order = sorted([(self.depth(node), i) for i, node in enumerate(nodes)])
+        for depth, i in order:
+            node = nodes[i]
+            while node.parent is not None and node.parent not in batch:
+                self.swap_with_parent(node)
+        self.remove_closed(nodes)
 
     # Function to delete a node
+    # The node is moved up to the root list regardless of its key, so no
+    # sentinel key has to be comparable with the key type
     #  node: Node, the node to delete from the binomial heap
     # Returns nothing
     def delete(self, node: 'Node') -> None:
-        # Force node to min by setting key = -infinity
-        self.decrease_key(node, -inf)
-        # Extract min will remove it, ignore the returned node
-        self.extract_min()
+        while node.parent is not None:
+            self.swap_with_parent(node)
+        self.extract_root(node)
@@ -0,0 +1,270 @@
+# George Dunnery - CS 5800
+from array import array
+from math import inf
+
+# Handle stored in the link columns in place of None
+NIL = -1
+
+
+# Class to represent a binomial heap with array-backed node storage
+# Node fields live in parallel array columns indexed by integer handles,
+# which avoids one Python object per node for very large heaps
+# Keys are stored as doubles (integers beyond 2**53 lose precision)
+class CompactBinomialHeap:
+
+    # Constructs an empty compact binomial heap
+    def __init__(self):
+        # One column per node field, the handle is the index into each column
+        self.key = array('d')
+        self.degree = array('B')
+        self.parent = array('i')
+        self.child = array('i')
+        self.sibling = array('i')
+        # Head of the root list and cached minimum root
+        self.head = NIL
+        self.min_node = NIL
+        # Released handles are chained through the sibling column for reuse
+        self.free = NIL
+        self.size = 0
+
+    # Defines the string representation of a compact binomial heap
+    # Uses the same depth first order and format as Node.walk
+    def __str__(self) -> str:
+        parts = []
+        stack = [self.head] if self.head != NIL else []
+        while stack:
+            handle = stack.pop()
+            parent = self.parent[handle]
+            parent_key = None if parent == NIL else self.key[parent]
+            parts.append('(k=' + str(self.key[handle]) + ', p=' + str(parent_key) +
+                         ', d=' + str(self.degree[handle]) + ')')
+            # Push the sibling first so the child subtree is visited before it
+            if self.sibling[handle] != NIL:
+                stack.append(self.sibling[handle])
+            if self.child[handle] != NIL:
+                stack.append(self.child[handle])
+        return "".join(parts)
+
+    # Auxiliary function to insert, please use insert instead!
+    # Function to take a handle from the free list or grow the columns
+    #  key: integer or float, the key of the new node
+    # Returns int, the handle of the new node
+    def allocate(self, key: int or float) -> int:
+        handle = self.free
+        if handle != NIL:
+            self.free = self.sibling[handle]
+            self.key[handle] = key
+            self.degree[handle] = 0
+            self.parent[handle] = NIL
+            self.child[handle] = NIL
+            self.sibling[handle] = NIL
+        else:
+            handle = len(self.key)
+            self.key.append(key)
+            self.degree.append(0)
+            self.parent.append(NIL)
+            self.child.append(NIL)
+            self.sibling.append(NIL)
+        return handle
+
+    # Function to get the min node in O(1) from the cached handle
+    # Returns int, the handle of the min node (NIL when empty)
+    def min(self) -> int:
+        return self.min_node
+
+    # Function to link two binomial trees by manipulating the roots
+    #  new_child: int, handle of the root to link under a different root
+    #  root: int, handle of the root that becomes the parent
+    # Returns nothing
+    def tree_link(self, new_child: int, root: int) -> None:
+        self.parent[new_child] = root
+        self.sibling[new_child] = self.child[root]
+        self.child[root] = new_child
+        self.degree[root] += 1
+
+    # Auxiliary function to insert and extract_min
+    # Function to merge two root lists into one list in degree order
+    #  x_node: int, head of the first root list
+    #  y_node: int, head of the second root list
+    # Returns int, the head of the merged root list
+    def heap_merge(self, x_node: int, y_node: int) -> int:
+        degree = self.degree
+        sibling = self.sibling
+        head_node = NIL
+        prev_node = NIL
+        while x_node != NIL or y_node != NIL:
+            if y_node == NIL or x_node != NIL and degree[x_node] <= degree[y_node]:
+                selected = x_node
+                x_node = sibling[x_node]
+            else:
+                selected = y_node
+                y_node = sibling[y_node]
+            if head_node == NIL:
+                head_node = selected
+            else:
+                sibling[prev_node] = selected
+            prev_node = selected
+        return head_node
+
+    # Auxiliary function to insert and extract_min
+    # Function to link duplicate degree trees in a merged root list
+    # Sets the head of the root list and the cached minimum
+    #  head: int, head of a root list in degree order
+    # Returns nothing
+    def consolidate(self, head: int) -> None:
+        self.head = head
+        if head == NIL:
+            self.min_node = NIL
+            return
+        key = self.key
+        degree = self.degree
+        sibling = self.sibling
+        best = NIL
+        prev = NIL
+        current = head
+        nxt = sibling[current]
+        while nxt != NIL:
+            if (degree[current] != degree[nxt] or
+                    sibling[nxt] != NIL and degree[sibling[nxt]] == degree[current]):
+                if best == NIL or key[current] < key[best]:
+                    best = current
+                prev = current
+                current = nxt
+            elif key[current] <= key[nxt]:
+                sibling[current] = sibling[nxt]
+                self.tree_link(nxt, current)
+            else:
+                if prev == NIL:
+                    self.head = nxt
+                else:
+                    sibling[prev] = nxt
+                self.tree_link(current, nxt)
+                current = nxt
+            nxt = sibling[current]
+        if best == NIL or key[current] < key[best]:
+            best = current
+        self.min_node = best
+
+    # Function to insert a new key into the heap
+    #  key: integer or float, the key of the new node
+    # Returns int, the handle of the new node
+    def insert(self, key: int or float) -> int:
+        handle = self.allocate(key)
+        self.consolidate(self.heap_merge(handle, self.head))
+        self.size += 1
+        return handle
+
+    # Function to remove the node with the minimum key
+    # The handle is released for reuse, so its key is only readable
+    # until the next insert
+    # Returns int, the handle of the removed node
+    def extract_min(self) -> int:
+        min_node = self.min_node
+        if min_node == NIL:
+            raise Exception("Heap is empty.")
+        sibling = self.sibling
+        # Splice the minimum out of the root list
+        prev = NIL
+        current = self.head
+        while current != min_node:
+            prev = current
+            current = sibling[current]
+        if prev == NIL:
+            self.head = sibling[min_node]
+        else:
+            sibling[prev] = sibling[min_node]
+        # Reverse the children into a root list in degree order
+        reverse = NIL
+        node = self.child[min_node]
+        while node != NIL:
+            nxt = sibling[node]
+            self.parent[node] = NIL
+            sibling[node] = reverse
+            reverse = node
+            node = nxt
+        self.consolidate(self.heap_merge(self.head, reverse))
+        # Release the handle onto the free list
+        self.child[min_node] = NIL
+        sibling[min_node] = self.free
+        self.free = min_node
+        self.size -= 1
+        return min_node
+
+    # Auxiliary function to decrease_key, please use decrease_key instead!
+    # Function to exchange a node with its parent by relinking both handles
+    #  node: int, handle of the node to move up one level
+    # Returns nothing
+    def swap_with_parent(self, node: int) -> None:
+        parent_col = self.parent
+        child_col = self.child
+        sibling = self.sibling
+        degree = self.degree
+        parent = parent_col[node]
+        grand = parent_col[parent]
+        parent_prev = NIL
+        scan = self.head if grand == NIL else child_col[grand]
+        while scan != parent:
+            parent_prev = scan
+            scan = sibling[scan]
+        node_prev = NIL
+        scan = child_col[parent]
+        while scan != node:
+            node_prev = scan
+            scan = sibling[scan]
+        node_child = child_col[node]
+        node_sibling = sibling[node]
+        node_degree = degree[node]
+        # Node takes over the position of parent
+        parent_col[node] = grand
+        sibling[node] = sibling[parent]
+        degree[node] = degree[parent]
+        if node_prev == NIL:
+            child_col[node] = parent
+        else:
+            child_col[node] = child_col[parent]
+            sibling[node_prev] = parent
+        # Parent takes over the old position of node
+        parent_col[parent] = node
+        sibling[parent] = node_sibling
+        child_col[parent] = node_child
+        degree[parent] = node_degree
+        # Point both child lists at their new parents
+        child = child_col[node]
+        while child != NIL:
+            parent_col[child] = node
+            child = sibling[child]
+        child = child_col[parent]
+        while child != NIL:
+            parent_col[child] = parent
+            child = sibling[child]
+        # Replace the reference to parent with node
+        if parent_prev != NIL:
+            sibling[parent_prev] = node
+        elif grand == NIL:
+            self.head = node
+        else:
+            child_col[grand] = node
+
+    # Function to decrease the key of a node to a new value
+    #  node: int, handle of the node that will have its key decreased
+    #  new_key: integer or float, the new key for the node (must be smaller)
+    # Returns nothing
+    def decrease_key(self, node: int, new_key: int or float) -> None:
+        key = self.key
+        if new_key > key[node]:
+            raise ValueError("The new key must be less than or equal to the old key.")
+        key[node] = new_key
+        parent = self.parent
+        above = parent[node]
+        while above != NIL and key[node] < key[above]:
+            self.swap_with_parent(node)
+            above = parent[node]
+        if above == NIL and key[node] < key[self.min_node]:
+            self.min_node = node
+
+    # Function to delete a node
+    #  node: int, handle of the node to delete from the heap
+    # Returns nothing
+    def delete(self, node: int) -> None:
+        self.decrease_key(node, -inf)
+        self.extract_min()
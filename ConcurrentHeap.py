@@ -0,0 +1,202 @@
+# George Dunnery - CS 5800
+from BinomialHeap import *
+import queue
+import threading
+import time
+import weakref
+
+
+# Class to hold the inserts of one producer thread until a consumer needs them
+class InsertBuffer:
+
+    __slots__ = ('lock', 'heap', 'closed')
+
+    # Constructs an empty buffer
+    #  key, reverse: ordering options of the owning heap
+    def __init__(self, key=None, reverse: bool = False):
+        self.lock = threading.Lock()
+        # Lazy, so buffering an insert and melding the buffer are both O(1)
+        self.heap = BinomialHeap(lazy=True, key=key, reverse=reverse)
+        # Set once the producer thread has exited, the buffer never grows again
+        self.closed = False
+
+    # Function to mark the buffer as closed when its producer thread exits
+    # Returns nothing
+    def close(self) -> None:
+        self.closed = True
+
+
+# Class of the marker kept in each producer thread's local storage
+# The thread frees it on exit, which runs the finalizer that closes its buffer
+class BufferOwner:
+
+    __slots__ = ('__weakref__',)
+
+
+# Class to represent a binomial heap shared between threads
+# Each producer thread inserts into its own buffer under its own lock, so
+# producers never wait on consumers or on each other. Consumers take the
+# main lock and meld every non-empty buffer in O(1) before reading the heap
+class ConcurrentBinomialHeap:
+
+    # Constructs an empty concurrent heap
+    #  key, reverse: ordering options, as for BinomialHeap
+    def __init__(self, key=None, reverse: bool = False):
+        self.key = key
+        self.reverse = reverse
+        self.heap = BinomialHeap(lazy=True, key=key, reverse=reverse)
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        # Number of threads blocked in get, producers only notify when nonzero
+        self.waiting = 0
+        self.local = threading.local()
+        self.buffers = []
+
+    # Defines the number of nodes in the heap and its buffers, in O(buffers)
+    # No lock is taken, so the count is approximate while other threads
+    # insert or extract (good enough for polling the queue depth)
+    def __len__(self) -> int:
+        return len(self.heap) + sum(len(buffer.heap) for buffer in self.buffers)
+
+    # Auxiliary function to insert, please use insert instead!
+    # Function to find or create the insert buffer of the calling thread
+    # Returns InsertBuffer, the buffer owned by the current thread
+    def buffer(self) -> 'InsertBuffer':
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is None:
+            buffer = InsertBuffer(self.key, self.reverse)
+            with self.lock:
+                self.buffers.append(buffer)
+            self.local.buffer = buffer
+            self.local.owner = BufferOwner()
+            weakref.finalize(self.local.owner, buffer.close)
+        return buffer
+
+    # Auxiliary function, the caller must hold self.lock
+    # Function to meld every buffered insert into the main heap
+    # Buffers of exited threads are dropped once empty, so short-lived
+    # producers do not leave consumers walking a growing list
+    # Returns nothing
+    def flush(self) -> None:
+        closed = False
+        for buffer in self.buffers:
+            if buffer.heap.head is not None:
+                with buffer.lock:
+                    self.heap.meld(buffer.heap)
+            if buffer.closed:
+                closed = True
+        if closed:
+            # closed is read before head, so a buffer is only found empty after
+            # its thread exited, and an insert racing with the loop above is
+            # kept for the next flush
+            self.buffers = [buffer for buffer in self.buffers
+                            if not buffer.closed or buffer.heap.head is not None]
+
+    # Function to insert a node into the heap
+    # Only the lock of the calling thread's buffer is taken
+    #  node: Node, the node to add to the heap
+    # Returns nothing
+    def insert(self, node: 'Node') -> None:
+        buffer = self.buffer()
+        with buffer.lock:
+            buffer.heap.insert(node)
+        # A consumer counts itself as waiting before it flushes, so either it
+        # sees this insert or this thread sees it waiting and wakes it
+        if self.waiting:
+            with self.lock:
+                self.not_empty.notify()
+
+    # Function to insert a new key and value into the heap
+    #  key: any, the key of the new node
+    #  value: any, optional payload for the new node
+    # Returns Node, the handle of the inserted node
+    def put(self, key, value=None) -> 'Node':
+        node = Node(key, value)
+        self.insert(node)
+        return node
+
+    # Function to get the node with the minimum key without removing it
+    # Returns Node, the min node (None when empty)
+    def min(self) -> 'Node' or None:
+        with self.lock:
+            self.flush()
+            return self.heap.min()
+
+    # Function to take a read-only view of the heap as it is now
+    # The lock is only held to meld the buffers, the view is read without it
+    # Returns HeapView, the open view (see BinomialHeap.snapshot)
+    def snapshot(self) -> 'HeapView':
+        with self.lock:
+            self.flush()
+            return self.heap.snapshot()
+
+    # Function to remove and return the node with the minimum key
+    # Returns Node, the node with the minimum key
+    def extract_min(self) -> 'Node':
+        with self.lock:
+            self.flush()
+            return self.heap.extract_min()
+
+    # Function to remove and return the node with the minimum key,
+    # waiting for one to be inserted when the heap is empty
+    #  timeout: float or None, the longest time to wait in seconds
+    # Returns Node, the node with the minimum key
+    # Raises queue.Empty when the timeout expires
+    def get(self, timeout: float = None) -> 'Node':
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.lock:
+            self.waiting += 1
+            try:
+                while True:
+                    self.flush()
+                    if self.heap.head is not None:
+                        return self.heap.extract_min()
+                    if deadline is None:
+                        self.not_empty.wait()
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise queue.Empty
+                        self.not_empty.wait(remaining)
+            finally:
+                self.waiting -= 1
+
+    # Function to decrease the key of a node to a new value
+    #  node: Node, a node in this heap
+    #  new_key: any, the new key for the node (must not come after the old key)
+    # Returns nothing
+    def decrease_key(self, node: 'Node', new_key) -> None:
+        with self.lock:
+            self.flush()
+            self.heap.decrease_key(node, new_key)
+
+    # Function to delete a node
+    #  node: Node, a node in this heap
+    # Returns nothing
+    def delete(self, node: 'Node') -> None:
+        with self.lock:
+            self.flush()
+            self.heap.delete(node)
+
+    # Function to absorb another concurrent heap into this one in place
+    #  other_heap: ConcurrentBinomialHeap, the heap that is emptied
+    # Returns nothing
+    def meld(self, other_heap: 'ConcurrentBinomialHeap') -> None:
+        if other_heap is self:
+            raise ValueError("A heap cannot be melded with itself.")
+        # Take both locks in a fixed order so concurrent melds cannot deadlock
+        first, second = sorted((self, other_heap), key=id)
+        with first.lock, second.lock:
+            self.flush()
+            other_heap.flush()
+            self.heap.meld(other_heap.heap)
+
+    # Function to generate a heap from the union of two concurrent heaps
+    # Both inputs are left empty, their nodes move to the result
+    #  other_heap: ConcurrentBinomialHeap, the heap to combine with this one
+    # Returns ConcurrentBinomialHeap, the result of the union
+    def union(self, other_heap: 'ConcurrentBinomialHeap') -> 'ConcurrentBinomialHeap':
+        unite = ConcurrentBinomialHeap(self.key, self.reverse)
+        unite.meld(self)
+        unite.meld(other_heap)
+        return unite
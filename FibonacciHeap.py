@@ -0,0 +1,381 @@
+# George Dunnery - CS 5800
+from BinomialHeap import *
+
+
+# Function to verify the links of a forest kept in doubly linked sibling lists
+# Checks prev, parent and degree against every list, the heap order, the tail
+# of the root list and the size of the heap
+#  heap: FibonacciHeap or PairingHeap, the heap to check
+# Raises RuntimeError when the structure is corrupted
+# Returns nothing
+def check_links(heap) -> None:
+    total = 0
+    # Each stack entry is (first node of a sibling list, parent of the list)
+    stack = [(heap.head, None)]
+    while stack:
+        node, parent = stack.pop()
+        prev = None
+        degree = 0
+        while node is not None:
+            if node.prev is not prev or node.parent is not parent:
+                raise RuntimeError("Sibling or parent links are inconsistent.")
+            if parent is not None and node.rank < parent.rank:
+                raise RuntimeError("Child keys must be larger than parent keys.")
+            if node.child is not None:
+                stack.append((node.child, node))
+            total += 1
+            degree += 1
+            prev = node
+            node = node.sibling
+        if parent is None and prev is not heap.tail:
+            raise RuntimeError("Root list tail is stale.")
+        if parent is not None and degree != parent.degree:
+            raise RuntimeError("Node degree does not match its children.")
+    if total != heap.count:
+        raise RuntimeError("Root list does not match the heap size.")
+
+
+# Auxiliary function to insert of the Fibonacci and pairing heaps
+# Function to reject a node that cannot be linked into a doubly linked list
+#  node: Node, the node about to be inserted
+# Returns nothing
+# Raises TypeError when the node is not a LinkedNode
+def check_linked(node: 'Node') -> None:
+    if not isinstance(node, LinkedNode):
+        raise TypeError("Fibonacci and pairing heaps need LinkedNode handles.")
+
+
+# Class to represent a Fibonacci heap behind the BinomialHeap interface
+# Roots and children live in doubly linked lists (sibling to the right, prev
+# to the left), so insert, meld and decrease_key are amortized O(1) and
+# trees are only linked by extract_min and delete. Nodes are LinkedNode
+# handles, which carry the prev and mark slots, and never change identity
+class FibonacciHeap:
+
+    # When True, every mutating operation verifies the whole structure
+    # (slow, intended for testing)
+    debug = False
+
+    # Class of the node handles this engine takes
+    node_type = LinkedNode
+
+    # Constructs an empty Fibonacci heap
+    #  key: function of one argument or None, maps a node key to the value compared
+    #  reverse: bool, whether larger keys come first (max-heap mode)
+    def __init__(self, key=None, reverse: bool = False):
+        self.head = None
+        self.tail = None
+        self.min_node = None
+        self.count = 0
+        self.key = key
+        self.reverse = reverse
+        self.ranker = make_ranker(key, reverse)
+        # The item index and snapshots are only supported by BinomialHeap
+        self.index = None
+        self.views = []
+        self.stats = None
+        self.stats_callback = None
+
+    # Shared with BinomialHeap, these only read the root and child lists
+    rank = BinomialHeap.rank
+    __len__ = BinomialHeap.__len__
+    __bool__ = BinomialHeap.__bool__
+    __str__ = BinomialHeap.__str__
+    traverse = BinomialHeap.traverse
+    write = BinomialHeap.write
+    min = BinomialHeap.min
+    find_min = BinomialHeap.find_min
+    check_min = BinomialHeap.check_min
+    check_ordering = BinomialHeap.check_ordering
+    sorted_view = BinomialHeap.sorted_view
+    nsmallest = BinomialHeap.nsmallest
+    drain = BinomialHeap.drain
+    __iter__ = BinomialHeap.__iter__
+    enable_stats = BinomialHeap.enable_stats
+    disable_stats = BinomialHeap.disable_stats
+    stats_snapshot = BinomialHeap.stats_snapshot
+    timed = BinomialHeap.timed
+
+    # Function to build a heap from many keys in linear time
+    #  items: iterable of keys, or of (key, value) pairs when pairs is True
+    #  pairs: bool, whether each item is a (key, value) pair
+    #  key, reverse: ordering options, as for the constructor
+    # Returns tuple (FibonacciHeap, list of Node handles in input order)
+    @classmethod
+    def from_iterable(cls, items, pairs: bool = False, key=None, reverse: bool = False) -> tuple:
+        heap = cls(key=key, reverse=reverse)
+        nodes = []
+        for item in items:
+            node = cls.node_type(*item) if pairs else cls.node_type(item)
+            heap.insert(node)
+            nodes.append(node)
+        return heap, nodes
+
+    # Function to verify the structure, called by check_min
+    # Raises RuntimeError when the structure is corrupted
+    # Returns nothing
+    def check_degrees(self) -> None:
+        check_links(self)
+
+    # Function to verify the whole structure and the cached minimum in linear time
+    # Raises RuntimeError when the structure is corrupted
+    # Returns nothing
+    def validate(self) -> None:
+        self.check_min()
+
+    # Auxiliary function to insert, cut and consolidate
+    # Function to prepend a detached tree to the root list
+    #  node: Node, the root of the tree
+    # Returns nothing
+    def add_root(self, node: 'Node') -> None:
+        node.parent = None
+        node.mark = False
+        node.prev = None
+        node.sibling = self.head
+        if self.head is None:
+            self.tail = node
+        else:
+            self.head.prev = node
+        self.head = node
+
+    # Auxiliary function to cut, delete and extract_min
+    # Function to remove a node (and its subtree) from the list that holds it
+    #  node: Node, a root or a child of another node
+    # Returns nothing
+    def unlink(self, node: 'Node') -> None:
+        parent = node.parent
+        if node.prev is not None:
+            node.prev.sibling = node.sibling
+        elif parent is None:
+            self.head = node.sibling
+        else:
+            parent.child = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        elif parent is None:
+            self.tail = node.prev
+        if parent is not None:
+            parent.degree -= 1
+        node.parent = None
+        node.prev = None
+        node.sibling = None
+
+    # Function to link two detached trees by manipulating the roots
+    #  new_child: Node, the root of the tree to link under a different root
+    #  root: Node, the root to which the new_child will be linked (becomes parent)
+    # Returns nothing
+    def tree_link(self, new_child: 'Node', root: 'Node') -> None:
+        # Prevent property violation (root key < all child keys)
+        if new_child.rank < root.rank:
+            raise ValueError("Child keys must be larger than parent keys.")
+        new_child.parent = root
+        new_child.mark = False
+        new_child.prev = None
+        new_child.sibling = root.child
+        if root.child is not None:
+            root.child.prev = new_child
+        root.child = new_child
+        root.degree += 1
+        if self.stats is not None:
+            self.stats.links += 1
+
+    # Function to link every pair of equal degree trees in the root list
+    # Leaves at most one tree per degree with the cached minimum updated
+    # Returns nothing
+    def consolidate(self) -> None:
+        # trees[d] holds the tree of degree d found so far, if any
+        trees = []
+        if self.stats is not None:
+            self.stats.scan(chain_length(self.head))
+        node = self.head
+        while node is not None:
+            nxt = node.sibling
+            degree = node.degree
+            while degree < len(trees) and trees[degree] is not None:
+                other = trees[degree]
+                trees[degree] = None
+                if other.rank <= node.rank:
+                    self.tree_link(node, other)
+                    node = other
+                else:
+                    self.tree_link(other, node)
+                degree += 1
+            while degree >= len(trees):
+                trees.append(None)
+            trees[degree] = node
+            node = nxt
+        # Rebuild the root list in degree order
+        self.head = None
+        self.tail = None
+        self.min_node = None
+        for tree in reversed(trees):
+            if tree is not None:
+                self.add_root(tree)
+                if self.min_node is None or tree.rank < self.min_node.rank:
+                    self.min_node = tree
+
+    # Function to insert a node into the Fibonacci heap in O(1)
+    #  node: LinkedNode, the node to add to the heap
+    # Returns nothing
+    # Raises TypeError for a plain Node, which has no prev and mark slots
+    def insert(self, node: 'LinkedNode') -> None:
+        check_linked(node)
+        node.child = None
+        node.degree = 0
+        node.rank = node.key if self.ranker is None else self.ranker(node.key)
+        self.add_root(node)
+        self.count += 1
+        if self.min_node is None or node.rank < self.min_node.rank:
+            self.min_node = node
+        if self.debug:
+            self.check_min()
+
+    # Function to absorb another Fibonacci heap into this one in O(1)
+    #  other_heap: FibonacciHeap, the heap whose nodes move into this heap
+    # Returns nothing
+    def meld(self, other_heap: 'FibonacciHeap') -> None:
+        if other_heap is self:
+            raise ValueError("A heap cannot be melded with itself.")
+        self.check_ordering(other_heap)
+        if other_heap.head is not None:
+            if self.head is None:
+                self.head = other_heap.head
+                self.min_node = other_heap.min_node
+            else:
+                self.tail.sibling = other_heap.head
+                other_heap.head.prev = self.tail
+                if other_heap.min_node.rank < self.min_node.rank:
+                    self.min_node = other_heap.min_node
+            self.tail = other_heap.tail
+        self.count += other_heap.count
+        other_heap.head = None
+        other_heap.tail = None
+        other_heap.min_node = None
+        other_heap.count = 0
+        if self.debug:
+            self.check_min()
+
+    # Function to generate a heap from the union of two heaps
+    # The nodes move into the result, so both inputs are left empty
+    #  other_heap: FibonacciHeap, the other heap to combine
+    # Returns FibonacciHeap, the result of the union
+    def union(self, other_heap: 'FibonacciHeap') -> 'FibonacciHeap':
+        self.check_ordering(other_heap)
+        unite = type(self)(key=self.key, reverse=self.reverse)
+        unite.meld(self)
+        if other_heap is not self:
+            unite.meld(other_heap)
+        return unite
+
+    # Function to remove and return the node with the minimum key
+    # Returns Node, the node with the minimum key
+    def extract_min(self) -> 'Node':
+        if self.head is None:
+            raise Exception("Heap is empty.")
+        return self.extract_root(self.min_node)
+
+    # Auxiliary function to extract_min and delete
+    # Function to remove a root, move its children to the root list and link
+    #  root: Node, the root to remove
+    # Returns Node, the removed root
+    def extract_root(self, root: 'Node') -> 'Node':
+        self.unlink(root)
+        child = root.child
+        while child is not None:
+            nxt = child.sibling
+            self.add_root(child)
+            child = nxt
+        root.child = None
+        root.degree = 0
+        self.count -= 1
+        self.consolidate()
+        if self.debug:
+            self.check_min()
+        return root
+
+    # Function to remove and return up to k nodes in ascending key order
+    #  k: int, the number of nodes to remove
+    # Returns list of Node, the detached nodes
+    def extract_many(self, k: int) -> list:
+        taken = []
+        while self.head is not None and len(taken) < k:
+            taken.append(self.extract_root(self.min_node))
+        return taken
+
+    # Auxiliary function to drain
+    # Function to put back subtrees whose ancestors were all removed
+    #  trees: list of Node, the roots of the subtrees
+    # Returns nothing
+    def reattach(self, trees: list) -> None:
+        for tree in trees:
+            self.add_root(tree)
+        self.consolidate()
+
+    # Auxiliary function to decrease_key and delete
+    # Function to move a node and its subtree to the root list
+    # An ancestor that already lost a child is cut as well (cascading cut),
+    # which keeps every tree of degree d at least Fibonacci(d + 2) nodes
+    #  node: Node, a node with a parent
+    # Returns nothing
+    def cut(self, node: 'Node') -> None:
+        parent = node.parent
+        self.unlink(node)
+        self.add_root(node)
+        while parent.parent is not None:
+            if not parent.mark:
+                parent.mark = True
+                return
+            grand = parent.parent
+            self.unlink(parent)
+            self.add_root(parent)
+            parent = grand
+
+    # Function to decrease the key of a node to a new value in amortized O(1)
+    # In max-heap mode the new key must be larger instead
+    #  node: Node, the node that will have its key decreased
+    #  new_key: any, the new key for the node (must not come after the old key)
+    # Returns nothing
+    def decrease_key(self, node: 'Node', new_key) -> None:
+        new_rank = new_key if self.ranker is None else self.ranker(new_key)
+        if node.rank < new_rank:
+            raise ValueError("The new key must be less than or equal to the old key.")
+        node.key = new_key
+        node.rank = new_rank
+        if node.parent is not None and new_rank < node.parent.rank:
+            self.cut(node)
+        if node.parent is None and new_rank < self.min_node.rank:
+            self.min_node = node
+        if self.debug:
+            self.check_min()
+
+    # Function to decrease the keys of many nodes
+    # The whole batch is validated before any key changes
+    #  pairs: iterable of (Node, new key) tuples
+    # Returns nothing
+    def decrease_keys(self, pairs) -> None:
+        pairs = list(pairs)
+        if len(set(node for node, new_key in pairs)) != len(pairs):
+            raise ValueError("A node may only appear once in a batch.")
+        for node, new_key in pairs:
+            if node.rank < self.rank(new_key):
+                raise ValueError("The new key must be less than or equal to the old key.")
+        for node, new_key in pairs:
+            self.decrease_key(node, new_key)
+
+    # Function to delete a node in amortized O(log n)
+    #  node: Node, the node to delete from the heap
+    # Returns nothing
+    def delete(self, node: 'Node') -> None:
+        if node.parent is not None:
+            self.cut(node)
+        self.extract_root(node)
+
+    # Function to delete many nodes
+    #  nodes: iterable of Node, the nodes to delete from the heap
+    # Returns nothing
+    def delete_many(self, nodes) -> None:
+        nodes = list(nodes)
+        if len(set(nodes)) != len(nodes):
+            raise ValueError("A node may only appear once in a batch.")
+        for node in nodes:
+            self.delete(node)
@@ -0,0 +1,209 @@
+# George Dunnery - CS 5800
+from HeapFactory import *
+from array import array
+from math import inf
+
+# Engine used by the graph routines unless the caller picks one
+# (decrease_key heavy, see WORKLOADS in HeapFactory.py)
+GRAPH_ENGINE = WORKLOADS['decrease_key']
+
+
+# Function to convert adjacency lists to compressed sparse row arrays
+# The edges of vertex u are targets[offsets[u]:offsets[u + 1]], with the
+# weights at the same positions
+#  graph: list of lists of (vertex, weight) tuples, vertices are 0 to n - 1
+# Returns tuple (offsets, targets, weights) of arrays
+def to_csr(graph: list) -> tuple:
+    offsets = array('q', [0])
+    targets = array('q')
+    weights = array('d')
+    for edges in graph:
+        for v, weight in edges:
+            targets.append(v)
+            weights.append(weight)
+        offsets.append(len(targets))
+    return offsets, targets, weights
+
+
+# Auxiliary function to the graph routines
+# Function to build the neighbour lookup for any supported graph format
+#  graph: list of lists or dict of lists of (vertex, weight) tuples (adjacency
+#         lists), or tuple (offsets, targets, weights) from to_csr
+# Returns function, maps a vertex to an iterable of (vertex, weight) tuples
+def adjacency(graph):
+    if isinstance(graph, tuple):
+        offsets, targets, weights = graph
+
+        def edges(u):
+            start = offsets[u]
+            end = offsets[u + 1]
+            return zip(targets[start:end], weights[start:end])
+        return edges
+    if isinstance(graph, dict):
+        return lambda u: graph.get(u, ())
+    return graph.__getitem__
+
+
+# Function to find shortest path distances from a source vertex
+# Each reached vertex gets one node handle, relaxed with decrease_key
+#  graph: adjacency lists or CSR arrays, see adjacency (weights must not be negative)
+#  source: any, the start vertex
+#  target: any, stop as soon as this vertex is settled (None explores everything)
+#  engine: str, the heap engine or workload name for make_heap
+# Returns tuple (dict vertex -> distance of settled vertices,
+#                dict vertex -> previous vertex on the best path found)
+def dijkstra(graph, source, target=None, engine: str = GRAPH_ENGINE) -> tuple:
+    edges = adjacency(graph)
+    heap = make_heap(engine)
+    # Bound methods are looked up once, the loop below runs once per edge
+    insert = heap.insert
+    decrease_key = heap.decrease_key
+    extract_min = heap.extract_min
+    # Fibonacci and pairing heaps need their own node class
+    make_node = heap.node_type
+    handles = {source: make_node(0, source)}
+    insert(handles[source])
+    distance = {}
+    previous = {source: None}
+    while heap.head is not None:
+        node = extract_min()
+        u = node.value
+        d = node.key
+        distance[u] = d
+        if u == target:
+            break
+        for v, weight in edges(u):
+            if v in distance:
+                continue
+            if weight < 0:
+                raise ValueError("Edge weights must not be negative.")
+            candidate = d + weight
+            handle = handles.get(v)
+            if handle is None:
+                handle = handles[v] = make_node(candidate, v)
+                insert(handle)
+                previous[v] = u
+            elif candidate < handle.key:
+                decrease_key(handle, candidate)
+                previous[v] = u
+    return distance, previous
+
+
+# Auxiliary function to shortest_path and astar
+# Function to follow previous links back from a target
+#  previous: dict vertex -> previous vertex (None for the source)
+#  target: any, the last vertex of the path
+# Returns list, the vertices from the source to the target
+def build_path(previous: dict, target) -> list:
+    path = [target]
+    while previous[path[-1]] is not None:
+        path.append(previous[path[-1]])
+    path.reverse()
+    return path
+
+
+# Function to find one shortest path between two vertices
+# Stops exploring as soon as the target is settled
+#  graph: adjacency lists or CSR arrays, see adjacency
+#  source: any, the start vertex
+#  target: any, the end vertex
+#  engine: str, the heap engine or workload name for make_heap
+# Returns tuple (distance, list of vertices), or (inf, []) when unreachable
+def shortest_path(graph, source, target, engine: str = GRAPH_ENGINE) -> tuple:
+    distance, previous = dijkstra(graph, source, target, engine)
+    if target not in distance:
+        return inf, []
+    return distance[target], build_path(previous, target)
+
+
+# Function to find a shortest path guided by a heuristic (A* search)
+# Nodes are keyed by distance so far plus the heuristic. With a consistent
+# heuristic every vertex is settled once; otherwise a settled vertex that is
+# reached more cheaply is reinserted with the same handle
+#  graph: adjacency lists or CSR arrays, see adjacency
+#  source: any, the start vertex
+#  target: any, the end vertex
+#  heuristic: function of one vertex, a lower bound of its distance to target
+#  engine: str, the heap engine or workload name for make_heap
+# Returns tuple (distance, list of vertices), or (inf, []) when unreachable
+def astar(graph, source, target, heuristic, engine: str = GRAPH_ENGINE) -> tuple:
+    edges = adjacency(graph)
+    heap = make_heap(engine)
+    insert = heap.insert
+    decrease_key = heap.decrease_key
+    extract_min = heap.extract_min
+    make_node = heap.node_type
+    handles = {source: make_node(heuristic(source), source)}
+    insert(handles[source])
+    # Best distance found so far and whether the vertex left the heap
+    cost = {source: 0}
+    settled = set()
+    previous = {source: None}
+    while heap.head is not None:
+        u = extract_min().value
+        if u == target:
+            return cost[u], build_path(previous, u)
+        settled.add(u)
+        d = cost[u]
+        for v, weight in edges(u):
+            if weight < 0:
+                raise ValueError("Edge weights must not be negative.")
+            candidate = d + weight
+            if v in cost and cost[v] <= candidate:
+                continue
+            cost[v] = candidate
+            previous[v] = u
+            handle = handles.get(v)
+            if handle is None:
+                handle = handles[v] = make_node(candidate + heuristic(v), v)
+                insert(handle)
+            elif v in settled:
+                settled.remove(v)
+                handle.key = candidate + heuristic(v)
+                insert(handle)
+            else:
+                decrease_key(handle, candidate + heuristic(v))
+    return inf, []
+
+
+# Function to find a minimum spanning tree with Prim's algorithm
+# Every vertex outside the tree keeps one node keyed by its cheapest edge
+# into the tree. Only the component of the root vertex is spanned
+#  graph: adjacency lists or CSR arrays of an undirected graph (each edge listed
+#         in both directions), see adjacency
+#  root: any, the vertex the tree grows from
+#  engine: str, the heap engine or workload name for make_heap
+# Returns tuple (total weight, list of (vertex, vertex, weight) tree edges)
+def prim(graph, root=0, engine: str = GRAPH_ENGINE) -> tuple:
+    edges = adjacency(graph)
+    heap = make_heap(engine)
+    insert = heap.insert
+    decrease_key = heap.decrease_key
+    extract_min = heap.extract_min
+    make_node = heap.node_type
+    handles = {root: make_node(0, root)}
+    insert(handles[root])
+    # Tree endpoint of the cheapest edge reaching each vertex
+    link = {root: None}
+    in_tree = set()
+    total = 0
+    tree = []
+    while heap.head is not None:
+        node = extract_min()
+        u = node.value
+        in_tree.add(u)
+        if link[u] is not None:
+            total += node.key
+            tree.append((link[u], u, node.key))
+        for v, weight in edges(u):
+            if v in in_tree:
+                continue
+            handle = handles.get(v)
+            if handle is None:
+                handle = handles[v] = make_node(weight, v)
+                insert(handle)
+                link[v] = u
+            elif weight < handle.key:
+                decrease_key(handle, weight)
+                link[v] = u
+    return total, tree
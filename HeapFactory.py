@@ -0,0 +1,30 @@
+# George Dunnery - CS 5800
+from BinomialHeap import *
+from FibonacciHeap import *
+from PairingHeap import *
+
+# Heap classes by engine name, all share the BinomialHeap interface
+# Handles come from each class's node_type (Node, or LinkedNode for the
+# Fibonacci and pairing heaps)
+ENGINES = {'binomial': BinomialHeap, 'fibonacci': FibonacciHeap, 'pairing': PairingHeap}
+
+# Engine to use for each kind of workload, see python BHBench.py engines
+WORKLOADS = {
+    # Mostly insert and extract_min, or snapshots, split and lazy mode
+    'general': 'binomial',
+    # Many decrease_key calls per extract_min (Dijkstra, Prim, A*)
+    'decrease_key': 'pairing',
+    # Many melds (both Fibonacci and pairing meld in O(1))
+    'meld': 'fibonacci',
+}
+
+
+# Function to create an empty heap of the chosen engine
+#  engine: str, an engine name from ENGINES or a workload name from WORKLOADS
+#  options: keyword arguments for the constructor (key, reverse, and lazy for binomial)
+# Returns BinomialHeap, FibonacciHeap or PairingHeap, the new heap
+def make_heap(engine: str = 'binomial', **options):
+    engine = WORKLOADS.get(engine, engine)
+    if engine not in ENGINES:
+        raise ValueError("Unknown heap engine " + str(engine) + ".")
+    return ENGINES[engine](**options)
@@ -4,14 +4,17 @@
 # Class to represent a node in a binomial heap
 class Node:
 
+    # Fixed attribute layout, no per-instance __dict__
+    __slots__ = ('key', 'value', 'rank', 'degree', 'parent', 'child', 'sibling')
+
     # Constructs a node object
-    #  key: integer or float, the value of the node
-    # Note - float required to store negative infinity during deletion
-    def __init__(self, key: int or float):
-        # Enforce integer keys
-        if type(key) != int and type(key) != float:
-            raise TypeError("Key must be an integer or float.")
+    #  key: any orderable value, the priority of the node
+    #  value: any, optional payload that travels with the key
+    def __init__(self, key, value=None):
         self.key = key
+        self.value = value
+        # The value the heap compares, set by the heap from its key function
+        self.rank = key
         # Degree is the number of child nodes
         self.degree = 0
         # Parent, child and sibling to be set later manually
@@ -28,23 +31,41 @@ class Node:
             parent_key = self.parent.key
         return '(k=' + str(self.key) + ', p=' + str(parent_key) + ', d=' + str(self.degree) + ')'
 
+    # Function to traverse this node, its subtree and its siblings iteratively
+    # Pre-order, depth first from each node in the sibling list
+    # The stack holds one pending sibling per level, so memory stays O(depth)
+    # Yields tuple (Node, depth below this node's level, parent Node or None)
+    def traverse(self):
+        stack = [(self, 0)]
+        while stack:
+            node, depth = stack.pop()
+            yield node, depth, node.parent
+            # Push the sibling first so the child subtree is visited before it
+            if node.sibling is not None:
+                stack.append((node.sibling, depth))
+            if node.child is not None:
+                stack.append((node.child, depth + 1))
+
     # Function to generate a string representation of all the nodes
     # Depth first from each node in the root list
     # Returns string, a list of the node information
     def walk(self) -> str:
-        cat = ""
-        node = self
-        return self.walk_aux(node, cat)
-
-    # Auxiliary function to walk, please use walk instead
-    #  node: Node, the current node in the traversal
-    #  cat: str, the string to concatenate node information to
-    # Returns string containing string representations of all linked nodes
-    def walk_aux(self, node: 'Node', cat: str) -> str:
-        if node is None:
-            return cat
-        else:
-            cat += str(node)
-            cat += self.walk_aux(node.child, "")
-            cat += self.walk_aux(node.sibling, "")
-            return cat
+        return "".join([str(node) for node, depth, parent in self.traverse()])
+
+
+# Class to represent a node in a Fibonacci or pairing heap
+# The extra slots stay off Node, so binomial heap nodes do not pay for them
+class LinkedNode(Node):
+
+    __slots__ = ('prev', 'mark')
+
+    # Constructs a node object
+    #  key: any orderable value, the priority of the node
+    #  value: any, optional payload that travels with the key
+    def __init__(self, key, value=None):
+        Node.__init__(self, key, value)
+        # Points to the sibling node immediately to the left, so a node can
+        # be cut out of its list in O(1)
+        self.prev = None
+        # Whether the node lost a child since it was linked (Fibonacci heap only)
+        self.mark = False
@@ -0,0 +1,236 @@
+# George Dunnery - CS 5800
+from FibonacciHeap import *
+
+
+# Class to represent a pairing heap behind the BinomialHeap interface
+# The heap is a single tree whose root is the minimum. Children live in
+# doubly linked lists like the Fibonacci heap, so insert, meld and
+# decrease_key do O(1) work (one link) and all restructuring is deferred to
+# the two-pass pairing done by extract_min and delete
+class PairingHeap:
+
+    # When True, every mutating operation verifies the whole structure
+    # (slow, intended for testing)
+    debug = False
+
+    # Class of the node handles this engine takes
+    node_type = LinkedNode
+
+    # Constructs an empty pairing heap
+    #  key: function of one argument or None, maps a node key to the value compared
+    #  reverse: bool, whether larger keys come first (max-heap mode)
+    def __init__(self, key=None, reverse: bool = False):
+        # The root list holds at most the one root, which is also the minimum
+        self.head = None
+        self.tail = None
+        self.min_node = None
+        self.count = 0
+        self.key = key
+        self.reverse = reverse
+        self.ranker = make_ranker(key, reverse)
+        # The item index and snapshots are only supported by BinomialHeap
+        self.index = None
+        self.views = []
+        self.stats = None
+        self.stats_callback = None
+
+    # Shared with BinomialHeap, these only read the root and child lists
+    rank = BinomialHeap.rank
+    __len__ = BinomialHeap.__len__
+    __bool__ = BinomialHeap.__bool__
+    __str__ = BinomialHeap.__str__
+    traverse = BinomialHeap.traverse
+    write = BinomialHeap.write
+    min = BinomialHeap.min
+    find_min = BinomialHeap.find_min
+    check_min = BinomialHeap.check_min
+    check_ordering = BinomialHeap.check_ordering
+    sorted_view = BinomialHeap.sorted_view
+    nsmallest = BinomialHeap.nsmallest
+    drain = BinomialHeap.drain
+    __iter__ = BinomialHeap.__iter__
+    enable_stats = BinomialHeap.enable_stats
+    disable_stats = BinomialHeap.disable_stats
+    stats_snapshot = BinomialHeap.stats_snapshot
+    timed = BinomialHeap.timed
+    # Shared with FibonacciHeap, the child lists are linked the same way
+    from_iterable = classmethod(FibonacciHeap.from_iterable.__func__)
+    check_degrees = FibonacciHeap.check_degrees
+    unlink = FibonacciHeap.unlink
+    tree_link = FibonacciHeap.tree_link
+    extract_many = FibonacciHeap.extract_many
+    decrease_keys = FibonacciHeap.decrease_keys
+    delete_many = FibonacciHeap.delete_many
+
+    # Function to verify the whole structure and the single root in linear time
+    # Raises RuntimeError when the structure is corrupted
+    # Returns nothing
+    def validate(self) -> None:
+        if self.head is not self.tail:
+            raise RuntimeError("A pairing heap holds a single root.")
+        self.check_min()
+
+    # Auxiliary function to every mutating operation
+    # Function to make a detached tree the whole heap
+    #  root: Node, the root of the tree (or None for an empty heap)
+    # Returns nothing
+    def set_root(self, root: 'Node') -> None:
+        self.head = root
+        self.tail = root
+        self.min_node = root
+
+    # Auxiliary function to every mutating operation
+    # Function to link two detached trees, the larger root becomes a child
+    #  x_node: Node, the root of the first tree
+    #  y_node: Node, the root of the second tree
+    # Returns Node, the root of the linked tree
+    def link(self, x_node: 'Node', y_node: 'Node') -> 'Node':
+        if y_node.rank < x_node.rank:
+            x_node, y_node = y_node, x_node
+        self.tree_link(y_node, x_node)
+        return x_node
+
+    # Auxiliary function to extract_min and delete
+    # Function to combine a list of sibling trees with two-pass pairing
+    # Pairs are linked left to right, then the pairs right to left
+    #  first: Node, the first tree of the sibling list (or None)
+    # Returns Node, the root of the combined tree (or None)
+    def merge_pairs(self, first: 'Node') -> 'Node' or None:
+        if self.stats is not None:
+            self.stats.scan(chain_length(first))
+        pairs = []
+        node = first
+        while node is not None:
+            nxt = node.sibling
+            node.parent = None
+            node.prev = None
+            node.sibling = None
+            if nxt is not None:
+                after = nxt.sibling
+                nxt.parent = None
+                nxt.prev = None
+                nxt.sibling = None
+                node = self.link(node, nxt)
+                nxt = after
+            pairs.append(node)
+            node = nxt
+        root = None
+        for tree in reversed(pairs):
+            root = tree if root is None else self.link(root, tree)
+        return root
+
+    # Auxiliary function to drain
+    # Function to put back subtrees whose ancestors were all removed
+    #  trees: list of Node, the roots of the subtrees
+    # Returns nothing
+    def reattach(self, trees: list) -> None:
+        for tree in trees:
+            tree.parent = None
+            tree.prev = None
+            tree.sibling = None
+            self.set_root(tree if self.head is None else self.link(self.head, tree))
+
+    # Function to insert a node into the pairing heap in O(1)
+    #  node: LinkedNode, the node to add to the heap
+    # Returns nothing
+    # Raises TypeError for a plain Node, which has no prev slot
+    def insert(self, node: 'LinkedNode') -> None:
+        check_linked(node)
+        node.parent = None
+        node.child = None
+        node.sibling = None
+        node.prev = None
+        node.degree = 0
+        node.rank = node.key if self.ranker is None else self.ranker(node.key)
+        self.count += 1
+        self.set_root(node if self.head is None else self.link(self.head, node))
+        if self.debug:
+            self.check_min()
+
+    # Function to absorb another pairing heap into this one in O(1)
+    #  other_heap: PairingHeap, the heap whose nodes move into this heap
+    # Returns nothing
+    def meld(self, other_heap: 'PairingHeap') -> None:
+        if other_heap is self:
+            raise ValueError("A heap cannot be melded with itself.")
+        self.check_ordering(other_heap)
+        if other_heap.head is not None:
+            if self.head is None:
+                self.set_root(other_heap.head)
+            else:
+                self.set_root(self.link(self.head, other_heap.head))
+        self.count += other_heap.count
+        other_heap.set_root(None)
+        other_heap.count = 0
+        if self.debug:
+            self.check_min()
+
+    # Function to generate a heap from the union of two heaps
+    # The nodes move into the result, so both inputs are left empty
+    #  other_heap: PairingHeap, the other heap to combine
+    # Returns PairingHeap, the result of the union
+    def union(self, other_heap: 'PairingHeap') -> 'PairingHeap':
+        self.check_ordering(other_heap)
+        unite = type(self)(key=self.key, reverse=self.reverse)
+        unite.meld(self)
+        if other_heap is not self:
+            unite.meld(other_heap)
+        return unite
+
+    # Function to remove and return the node with the minimum key
+    # Amortized O(log n), this is where the deferred pairing work is paid
+    # Returns Node, the node with the minimum key
+    def extract_min(self) -> 'Node':
+        if self.head is None:
+            raise Exception("Heap is empty.")
+        return self.extract_root(self.head)
+
+    # Auxiliary function to extract_min, extract_many and delete
+    # Function to remove the root and pair its children into the new root
+    #  root: Node, the root of the heap
+    # Returns Node, the removed root
+    def extract_root(self, root: 'Node') -> 'Node':
+        self.set_root(self.merge_pairs(root.child))
+        root.child = None
+        root.degree = 0
+        self.count -= 1
+        if self.debug:
+            self.check_min()
+        return root
+
+    # Function to decrease the key of a node to a new value
+    # A node that moves above its parent is cut off and linked with the
+    # root, which is one link (the restructuring is left to extract_min)
+    # In max-heap mode the new key must be larger instead
+    #  node: Node, the node that will have its key decreased
+    #  new_key: any, the new key for the node (must not come after the old key)
+    # Returns nothing
+    def decrease_key(self, node: 'Node', new_key) -> None:
+        new_rank = new_key if self.ranker is None else self.ranker(new_key)
+        if node.rank < new_rank:
+            raise ValueError("The new key must be less than or equal to the old key.")
+        node.key = new_key
+        node.rank = new_rank
+        if node.parent is not None and new_rank < node.parent.rank:
+            self.unlink(node)
+            self.set_root(self.link(self.head, node))
+        if self.debug:
+            self.check_min()
+
+    # Function to delete a node
+    # The node is cut off, its children are paired and linked with the root
+    #  node: Node, the node to delete from the heap
+    # Returns nothing
+    def delete(self, node: 'Node') -> None:
+        if node.parent is None:
+            self.extract_root(node)
+            return
+        self.unlink(node)
+        rest = self.merge_pairs(node.child)
+        node.child = None
+        node.degree = 0
+        self.count -= 1
+        if rest is not None:
+            self.set_root(self.link(self.head, rest))
+        if self.debug:
+            self.check_min()
@@ -0,0 +1,138 @@
+# George Dunnery - CS 5800
+from BinomialHeap import *
+
+
+# Class to represent a job held by a Scheduler
+# Callers keep this handle, the heap node behind it may be replaced
+class ScheduledJob:
+
+    __slots__ = ('at', 'job', 'node')
+
+    # Constructs a handle for a job
+    #  at: number, the deadline of the job
+    #  job: any, the payload returned by pop_due
+    def __init__(self, at, job):
+        self.at = at
+        self.job = job
+        # The live node in the heap, None once cancelled or popped
+        self.node = None
+
+    # Defines the string representation of a scheduled job
+    def __str__(self) -> str:
+        return '(at=' + str(self.at) + ', job=' + str(self.job) + ')'
+
+
+# Class to represent a deadline queue of delayed jobs
+# Cancelling, and postponing a deadline, leave the old node in the heap as a
+# tombstone (a node whose value is None) in O(1). Tombstones are dropped when
+# they reach the front, and all of them are deleted in one batch once they
+# make up too large a share of the heap
+class Scheduler:
+
+    # Constructs an empty scheduler
+    #  lazy: bool, whether the heap defers linking (cheaper schedule calls)
+    #  compact_ratio: float, compact once tombstones exceed this share of the heap
+    #  min_compact: int, never compact fewer tombstones than this
+    def __init__(self, lazy: bool = True, compact_ratio: float = 0.5, min_compact: int = 64):
+        self.heap = BinomialHeap(lazy=lazy)
+        self.compact_ratio = compact_ratio
+        self.min_compact = min_compact
+        # Tombstone nodes still in the heap
+        self.dead = set()
+
+    # Defines the number of live jobs
+    def __len__(self) -> int:
+        return len(self.heap) - len(self.dead)
+
+    # Function to add a job
+    #  at: number, the deadline of the job
+    #  job: any, the payload returned by pop_due
+    # Returns ScheduledJob, the handle for cancel and reschedule
+    def schedule(self, at, job) -> 'ScheduledJob':
+        handle = ScheduledJob(at, job)
+        handle.node = Node(at, handle)
+        self.heap.insert(handle.node)
+        return handle
+
+    # Auxiliary function to cancel and reschedule
+    # Function to turn the live node of a job into a tombstone
+    #  handle: ScheduledJob, a scheduled job
+    # Returns nothing
+    def bury(self, handle: 'ScheduledJob') -> None:
+        node = handle.node
+        node.value = None
+        self.dead.add(node)
+        handle.node = None
+        if len(self.dead) >= self.min_compact and len(self.dead) > self.compact_ratio * len(self.heap):
+            self.compact()
+
+    # Function to cancel a job in O(1), leaving a tombstone
+    #  handle: ScheduledJob, the job to cancel
+    # Returns bool, False when the job was already cancelled or popped
+    def cancel(self, handle: 'ScheduledJob') -> bool:
+        if handle.node is None:
+            return False
+        self.bury(handle)
+        return True
+
+    # Function to move the deadline of a job
+    # An earlier deadline moves the node with decrease_key; a later one buries
+    # the node and inserts a new one, so no node is ever moved down
+    #  handle: ScheduledJob, a scheduled job
+    #  at: number, the new deadline
+    # Returns nothing
+    def reschedule(self, handle: 'ScheduledJob', at) -> None:
+        if handle.node is None:
+            raise ValueError("The job is not scheduled.")
+        if at <= handle.node.key:
+            self.heap.decrease_key(handle.node, at)
+        else:
+            self.bury(handle)
+            handle.node = Node(at, handle)
+            self.heap.insert(handle.node)
+        handle.at = at
+
+    # Function to remove every job whose deadline has passed
+    # The due nodes are found with one ordered walk and removed with a single
+    # consolidation, tombstones among them are discarded
+    #  now: number, the current time
+    # Returns list of ScheduledJob, the due jobs in deadline order
+    def pop_due(self, now) -> list:
+        taken = []
+        for node in self.heap.sorted_view():
+            if node.key > now:
+                break
+            taken.append(node)
+        if not taken:
+            return []
+        # A prefix of the ordered walk holds every ancestor of its nodes
+        self.heap.delete_many(taken)
+        due = []
+        for node in taken:
+            handle = node.value
+            if handle is None:
+                self.dead.discard(node)
+            else:
+                handle.node = None
+                due.append(handle)
+        return due
+
+    # Function to get the earliest live deadline
+    # Tombstones found at the front are removed on the way
+    # Returns number, the earliest deadline, or None when no job is scheduled
+    def next_deadline(self):
+        node = self.heap.min()
+        while node is not None and node.value is None:
+            self.heap.extract_min()
+            self.dead.discard(node)
+            node = self.heap.min()
+        return None if node is None else node.key
+
+    # Function to delete every tombstone in one batch
+    # Returns int, the number of tombstones removed
+    def compact(self) -> int:
+        removed = len(self.dead)
+        if removed:
+            self.heap.delete_many(self.dead)
+            self.dead = set()
+        return removed
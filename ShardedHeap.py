@@ -0,0 +1,246 @@
+# George Dunnery - CS 5800
+from BinomialHeap import *
+from array import array
+from collections import deque
+from multiprocessing import shared_memory
+import heapq
+import io
+import multiprocessing
+
+
+# Function run by each shard process, owns one BinomialHeap of float keys
+# Keys move through the shard's shared memory block, the pipe only carries
+# short commands and replies of (result, shard min key or None, shard size)
+#  conn: Connection, the shard's end of the command pipe
+#  name: str, the name of the shard's shared memory block
+# Returns nothing
+def shard_worker(conn, name: str) -> None:
+    memory = shared_memory.SharedMemory(name=name)
+    keys = memory.buf.cast('d')
+    heap = BinomialHeap(lazy=True)
+    try:
+        while True:
+            command, argument = conn.recv()
+            result = None
+            if command == 'insert':
+                # argument: int, the number of keys written to shared memory
+                for key in keys[:argument]:
+                    heap.insert(Node(key))
+            elif command == 'pop':
+                # argument: int, the most keys to return in shared memory
+                batch = heap.extract_many(argument)
+                result = len(batch)
+                keys[:result] = array('d', [node.key for node in batch])
+            elif command == 'donate':
+                # argument: int, the most nodes to hand to another shard
+                part = heap.split(argument)
+                out = io.BytesIO()
+                part.save(out)
+                data = out.getbuffer()
+                memory.buf[:len(data)] = data
+                result = len(data)
+            elif command == 'adopt':
+                # argument: tuple (donor memory name, snapshot length in bytes)
+                donor = shared_memory.SharedMemory(name=argument[0])
+                part = BinomialHeap.load_view(donor.buf[:argument[1]])
+                donor.close()
+                heap.meld(part)
+            elif command == 'stop':
+                break
+            low = heap.min()
+            conn.send((result, None if low is None else low.key, len(heap)))
+    finally:
+        keys.release()
+        memory.close()
+        conn.close()
+
+
+# Class to hold the client side state of one shard process
+class Shard:
+
+    # Constructs the client side of a shard
+    #  process: Process, the shard process
+    #  conn: Connection, the client's end of the command pipe
+    #  memory: SharedMemory, the block used to move keys
+    def __init__(self, process, conn, memory):
+        self.process = process
+        self.conn = conn
+        self.memory = memory
+        self.keys = memory.buf.cast('d')
+        # Inserts not yet sent to the shard
+        self.pending = []
+        # Sorted keys already popped from the shard but not yet returned
+        self.prefetch = deque()
+        # Minimum key and size of what the shard process holds
+        self.min = None
+        self.size = 0
+
+    # Function to get the smallest key owned by this shard (sent or prefetched)
+    # Returns float or None, the smallest key
+    def candidate(self) -> float or None:
+        if not self.prefetch:
+            return self.min
+        if self.min is not None and self.min < self.prefetch[0]:
+            return self.min
+        return self.prefetch[0]
+
+
+# Class to represent a priority queue of float keys spread across processes
+# Each shard process owns a BinomialHeap. The client batches inserts, keeps a
+# sorted prefetch of each shard's smallest keys, and answers extract_min by
+# merging the shard minima. Commands go to every shard before any reply is
+# read, so the shards work in parallel. A shard that drains adopts whole
+# trees from the largest shard, which are combined there with meld
+class ShardedHeap:
+
+    # Constructs the shards and starts their processes
+    #  shards: int, the number of shard processes
+    #  batch: int, inserts buffered per shard and keys prefetched per pop
+    #  capacity: int, the number of keys that fit in each shared memory block
+    #  context: str or None, the multiprocessing start method
+    def __init__(self, shards: int = 2, batch: int = 1024, capacity: int = 65536,
+                 context: str = None):
+        if batch > capacity:
+            raise ValueError("The batch must fit in the shared memory capacity.")
+        context = multiprocessing.get_context(context)
+        self.batch = batch
+        self.capacity = capacity
+        self.shards = []
+        self.next_shard = 0
+        for _ in range(shards):
+            memory = shared_memory.SharedMemory(create=True, size=capacity * 8)
+            conn, child_conn = context.Pipe()
+            process = context.Process(target=shard_worker, args=(child_conn, memory.name),
+                                      daemon=True)
+            process.start()
+            child_conn.close()
+            self.shards.append(Shard(process, conn, memory))
+
+    def __enter__(self) -> 'ShardedHeap':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Defines the number of keys in the sharded heap
+    def __len__(self) -> int:
+        return sum(shard.size + len(shard.prefetch) + len(shard.pending)
+                   for shard in self.shards)
+
+    # Auxiliary function to send a command to many shards, then read every reply
+    #  commands: list of tuples (Shard, command, argument)
+    # Returns list, the result of each command in order
+    def scatter(self, commands: list) -> list:
+        for shard, command, argument in commands:
+            shard.conn.send((command, argument))
+        results = []
+        for shard, command, argument in commands:
+            result, shard.min, shard.size = shard.conn.recv()
+            results.append(result)
+        return results
+
+    # Function to insert a key, shards are filled in turn
+    #  key: float, the key to insert
+    # Returns nothing
+    def insert(self, key: float) -> None:
+        shard = self.shards[self.next_shard]
+        self.next_shard = (self.next_shard + 1) % len(self.shards)
+        shard.pending.append(key)
+        if len(shard.pending) >= self.batch:
+            self.flush()
+
+    # Function to send every buffered insert to its shard
+    # Returns nothing
+    def flush(self) -> None:
+        while True:
+            commands = []
+            for shard in self.shards:
+                if shard.pending:
+                    chunk = shard.pending[:self.capacity]
+                    del shard.pending[:self.capacity]
+                    shard.keys[:len(chunk)] = array('d', chunk)
+                    commands.append((shard, 'insert', len(chunk)))
+            if not commands:
+                return
+            self.scatter(commands)
+
+    # Auxiliary function to pop a batch from shards into their prefetch
+    #  shards: list of Shard, the shards to pop from
+    # Returns nothing
+    def refill(self, shards: list) -> None:
+        counts = self.scatter([(shard, 'pop', self.batch) for shard in shards])
+        for shard, count in zip(shards, counts):
+            popped = shard.keys[:count].tolist()
+            # Keys inserted after the last pop may interleave with the prefetch
+            if shard.prefetch and popped[0] < shard.prefetch[-1]:
+                shard.prefetch = deque(heapq.merge(shard.prefetch, popped))
+            else:
+                shard.prefetch.extend(popped)
+        self.rebalance()
+
+    # Function to move trees from the largest shard into any drained shard
+    # Returns nothing
+    def rebalance(self) -> None:
+        # Each snapshot node takes 9 bytes (degree and key) after the header
+        limit = (self.capacity * 8 - SNAPSHOT_HEADER.size) // 9
+        for shard in self.shards:
+            if shard.size == 0:
+                donor = max(self.shards, key=lambda other: other.size)
+                if donor.size < 2 * self.batch:
+                    return
+                length = self.scatter([(donor, 'donate', min(donor.size // 2, limit))])[0]
+                self.scatter([(shard, 'adopt', (donor.memory.name, length))])
+
+    # Function to get the minimum key without removing it
+    # Returns float or None, the minimum key
+    def min(self) -> float or None:
+        self.flush()
+        best = None
+        for shard in self.shards:
+            candidate = shard.candidate()
+            if candidate is not None and (best is None or candidate < best):
+                best = candidate
+        return best
+
+    # Function to remove and return the minimum key
+    # Returns float, the minimum key
+    def extract_min(self) -> float:
+        return self.extract_many(1)[0]
+
+    # Function to remove and return the k smallest keys in ascending order
+    # Shards whose prefetch may hold the next keys are refilled in parallel
+    #  k: int, the number of keys to remove
+    # Returns list of float, the removed keys
+    def extract_many(self, k: int) -> list:
+        self.flush()
+        result = []
+        while len(result) < k:
+            stale = [shard for shard in self.shards
+                     if shard.min is not None and
+                     (not shard.prefetch or shard.min < shard.prefetch[0])]
+            if stale:
+                self.refill(stale)
+            best = None
+            for shard in self.shards:
+                if shard.prefetch and (best is None or shard.prefetch[0] < best.prefetch[0]):
+                    best = shard
+            if best is None:
+                if not result:
+                    raise Exception("Heap is empty.")
+                break
+            result.append(best.prefetch.popleft())
+        return result
+
+    # Function to stop the shard processes and free their shared memory
+    # Returns nothing
+    def close(self) -> None:
+        for shard in self.shards:
+            if shard.process.is_alive():
+                shard.conn.send(('stop', None))
+        for shard in self.shards:
+            shard.process.join()
+            shard.conn.close()
+            shard.keys.release()
+            shard.memory.close()
+            shard.memory.unlink()
+        self.shards = []